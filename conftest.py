@@ -11,6 +11,12 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches out of the user's home directory during tests."""
+    monkeypatch.setenv("T4H_CACHE_DIR", str(tmp_path / "t4h-cache"))
+
+
 def pytest_configure(config):
     """Configure pytest with custom settings."""
     config.addinivalue_line(
@@ -0,0 +1,160 @@
+"""Checkpoint journal for long batch evaluations.
+
+The journal is an append-only NDJSON file. Its first line,
+``{"input": <identity>}``, names the input it belongs to (see
+`input_identity`). After that comes one
+``{"key": <row key>, "links": [...], "record": <NDJSON record>}`` line per
+finished row, flushed as each row completes (and fsynced every env
+CHECKPOINT_FSYNC_EVERY records, default 50). A run killed part-way can be
+restarted with the same journal: rows whose key and links are already
+present are not evaluated again. A journal written for a different input
+is refused, and a torn last line from a crash is ignored on load.
+
+Only the key, links and file offset of each loaded row are kept in
+memory; a row's record is read back from the journal when it is replayed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import IO, Any, Dict, List, Optional
+
+from src.logger import get_logger
+
+logger = get_logger("cli.checkpoint")
+
+
+def input_identity(source: str) -> Dict[str, Any]:
+    """Path, size and sha256 of an input file; stdin (``-``) is just its name."""
+    if source == "-":
+        return {"path": "-"}
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"path": os.path.abspath(source),
+            "size": os.path.getsize(source),
+            "sha256": digest.hexdigest()}
+
+
+class CheckpointMismatch(ValueError):
+    """The journal was written for a different input than this run's."""
+
+
+class CheckpointJournal:
+    """Append-only record of completed rows; use as a context manager."""
+
+    def __init__(self, path: str, resume: bool = False,
+                 fsync_every: Optional[int] = None,
+                 source: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.resume = resume
+        self.source = source
+        self.input: Optional[Dict[str, Any]] = None
+        self._links: Dict[Any, Optional[List[Any]]] = {}
+        self._reader: Optional[IO[bytes]] = None
+        if fsync_every is None:
+            try:
+                fsync_every = int(os.getenv("CHECKPOINT_FSYNC_EVERY", "50"))
+            except ValueError:
+                fsync_every = 50
+        self.fsync_every = max(1, fsync_every)
+        # rows finished by an earlier run: key -> offset of its journal line
+        self.done: Dict[Any, int] = self.load() if resume else {}
+        if resume and source is not None and self.done and self.input != source:
+            raise CheckpointMismatch(
+                f"checkpoint {path} was written for input "
+                f"{(self.input or {}).get('path', 'unknown')}, not {source.get('path')}; "
+                "remove it or run without --resume")
+        self._f: Optional[IO[str]] = None
+        self._unsynced = 0
+
+    def load(self) -> Dict[Any, int]:
+        """Offsets of the completed rows recorded in the journal, in completion order."""
+        done: Dict[Any, int] = {}
+        try:
+            with open(self.path, "rb") as f:
+                end = 0
+                for n, line in enumerate(f, 1):
+                    offset, end = end, end + len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        if "input" in entry:
+                            self.input = entry["input"]
+                            continue
+                        key, _ = entry["key"], entry["record"]
+                        done[key] = offset
+                        self._links[key] = entry.get("links")
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning("Ignoring unreadable checkpoint line %d in %s",
+                                       n, self.path)
+        except FileNotFoundError:
+            pass
+        return done
+
+    def __enter__(self) -> "CheckpointJournal":
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # resuming appends to the journal; a fresh run starts a new one
+        self._f = open(self.path, "a" if self.resume else "w", encoding="utf-8")
+        if self.resume and self._f.tell() > 0:
+            # terminate a line torn by a crash so the next entry parses
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._f.write("\n")
+        if self._f.tell() == 0 and self.source is not None:
+            self._f.write(json.dumps({"input": self.source},
+                                     separators=(",", ":")) + "\n")
+            self._f.flush()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._f is not None:
+            self._sync()
+            self._f.close()
+            self._f = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def is_done(self, key: Any, links: Optional[List[Any]] = None) -> bool:
+        """True if `key` was finished (with the same `links`, when both are known)."""
+        if key not in self.done:
+            return False
+        recorded = self._links.get(key)
+        return links is None or recorded is None or list(links) == recorded
+
+    def replay(self, key: Any) -> Dict[str, Any]:
+        """The record an earlier run journaled for `key`."""
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        self._reader.seek(self.done[key])
+        return json.loads(self._reader.readline())["record"]
+
+    def record(self, key: Any, record: Dict[str, Any],
+               links: Optional[List[Any]] = None) -> None:
+        """Append one finished row and flush it to the OS."""
+        if self._f is None:
+            raise RuntimeError("checkpoint journal is not open")
+        entry: Dict[str, Any] = {"key": key}
+        if links is not None:
+            entry["links"] = list(links)
+        entry["record"] = record
+        self._f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._f.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._f is None or not self._unsynced:
+            return
+        try:
+            os.fsync(self._f.fileno())
+        except OSError as e:
+            logger.debug(f"fsync of checkpoint failed: {e}")
+        self._unsynced = 0
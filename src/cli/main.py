@@ -1,12 +1,35 @@
 import argparse
+import collections
+import contextlib
 import json
 import os
 import sys
-from typing import Any, Dict
-from src.url_parsers import handle_url, get_url_category
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from src.cli.schema import default_ndjson
+from src.cli.checkpoint import CheckpointJournal, input_identity
+from src.cli.reader import iter_rows, prefetch
 import logging
 
+# The evaluation stack (url_parsers -> metrics -> data_fetcher -> requests,
+# huggingface_hub) and the score store are imported on first use, so that
+# install, test and argument errors never pay for it; see
+# tools/import_profile.py and tests/test_cli_startup.py for the budget.
+
+
+def handle_url(*args: Any, **kwargs: Any) -> Any:
+    from src.url_parsers import handle_url as _handle_url
+    return _handle_url(*args, **kwargs)
+
+
+def iter_handle_url(*args: Any, **kwargs: Any) -> Any:
+    from src.url_parsers import iter_handle_url as _iter_handle_url
+    return _iter_handle_url(*args, **kwargs)
+
+
+def get_url_category(*args: Any, **kwargs: Any) -> Any:
+    from src.url_parsers import get_url_category as _get_url_category
+    return _get_url_category(*args, **kwargs)
+
 
 def _check_env_variables() -> None:
     tok = os.getenv("GITHUB_TOKEN")
@@ -36,7 +59,8 @@ def parse_args() -> argparse.Namespace:
     p.add_argument(
         "args",
         nargs="*",
-        help="Commands(install, test) or URLs to evaluate (HF model/dataset or GitHub repo)")
+        help="Commands(install, test, query [NAME|URL]) or a URL file to evaluate "
+             "('-' for stdin, .gz accepted)")
     p.add_argument("--ndjson", action="store_true",
                    help="Emit NDJSON records to stdout")
     p.add_argument(
@@ -48,11 +72,67 @@ def parse_args() -> argparse.Namespace:
                 "LOG_VERBOSITY",
                 "0")),
         help="Log verbosity (default from env LOG_VERBOSITY, default 0)")
+    p.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Rows evaluated concurrently (default from env EVAL_WORKERS, default 1)")
+    p.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Upper bound on rows submitted at once (default from env EVAL_MAX_IN_FLIGHT)")
+    p.add_argument(
+        "--engine",
+        choices=["thread", "async", "process"],
+        default=None,
+        help="Fetch engine (default from env EVAL_ENGINE, default thread)")
+    p.add_argument(
+        "--order",
+        choices=["input", "completed"],
+        default="input",
+        help="Emit records in input order or as soon as each row finishes")
+    p.add_argument(
+        "--checkpoint",
+        default=None,
+        metavar="PATH",
+        help="Journal each finished row to PATH so the run can be resumed")
+    p.add_argument("--resume", action="store_true",
+                   help="Skip rows already recorded in the --checkpoint journal")
+    p.add_argument(
+        "--metrics",
+        default=None,
+        metavar="IDS",
+        help="Comma-separated metric ids to score (default: all); only the "
+             "data those metrics need is fetched")
+    p.add_argument("--incremental", action="store_true",
+                   help="Reuse stored scores for rows whose sources are unchanged")
+    p.add_argument(
+        "--store",
+        default=None,
+        metavar="PATH",
+        help="Record results in the score store at PATH, also used by "
+             "--incremental and query (default: <cache dir>/scores.sqlite)")
+    p.add_argument("--top", type=int, default=None, metavar="K",
+                   help="query: the K stored models with the best net_score")
+    p.add_argument("--history", action="store_true",
+                   help="query: every stored result for NAME|URL, oldest first")
+    p.add_argument("--category", default=None,
+                   help="query --top: only records of this category")
+    p.add_argument("--github-graphql", action="store_true",
+                   help="Prefetch GitHub repos in batched GraphQL queries")
+    p.add_argument("--llm-batch", action="store_true",
+                   help="Score LLM-backed metrics with batched multi-URL prompts")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Bypass the on-disk GitHub, LLM and artifact caches")
+    p.add_argument("--clear-cache", action="store_true",
+                   help="Delete the on-disk GitHub, LLM and artifact caches first")
 
     return p.parse_args()
 
 
-def evaluate_url(models: dict) -> Dict[str, Any]:
+def evaluate_url(models: dict, **kwargs: Any) -> Dict[str, Any]:
     # TODO: dispatch to url_parsers and metrics, check URL type
     # For now, return a dummy record
     # Return the required fields incl. overall score and subscores
@@ -60,11 +140,143 @@ def evaluate_url(models: dict) -> Dict[str, Any]:
     # for model in models:
     #     empty_metrics.append(default_ndjson(model=model))
 
-    return handle_url(models)
+    return handle_url(models, **kwargs)
     # if not None in get_url_category(models):
     #     return handle_url(models)
 
 
+def _reader_queue_size(args: argparse.Namespace) -> int:
+    """Rows buffered ahead of evaluation: a small multiple of concurrency."""
+    if args.max_in_flight:
+        return args.max_in_flight * 2
+    try:
+        workers = args.workers or int(os.getenv("EVAL_WORKERS", "1"))
+    except ValueError:
+        workers = 1
+    return max(8, workers * 4)
+
+
+def _selected_ops(metrics: Optional[str]) -> Optional[list]:
+    """Operationalizations of the --metrics ids, None for the full plan."""
+    if not metrics:
+        return None
+    from src.metrics.ops_plan import default_ops
+    by_id = {op.metric_id: op for op in default_ops}
+    ids = [m.strip() for m in metrics.split(",") if m.strip()]
+    unknown = [m for m in ids if m not in by_id]
+    if unknown or not ids:
+        raise ValueError(f"unknown metric id(s): {', '.join(unknown) or metrics}; "
+                         f"choose from {', '.join(by_id)}")
+    return [by_id[m] for m in ids]
+
+
+def _evaluate_file(source: str, args: argparse.Namespace) -> int:
+    """Stream records for every row of `source`, with optional checkpointing."""
+    if args.resume and not args.checkpoint:
+        print("ERROR: --resume requires --checkpoint PATH", file=sys.stderr)
+        return 1
+    ops = _selected_ops(args.metrics)
+
+    # Each row is a list of links in order {code, dataset, model};
+    # rows are read lazily and each record is written as it finishes
+    if source == "-" or os.path.isfile(source):
+        rows = prefetch(iter_rows(source), _reader_queue_size(args))
+    else:
+        rows = iter(())
+
+    journal = None
+    if args.checkpoint:
+        identity = (input_identity(source)
+                    if source == "-" or os.path.isfile(source) else None)
+        journal = CheckpointJournal(args.checkpoint, resume=args.resume,
+                                    source=identity)
+    if args.incremental or args.store:
+        from src.score_store import ScoreStore
+    store = (ScoreStore(args.store, reuse=args.incremental)
+             if args.incremental or args.store else None)
+    # rows finished by an earlier run are replayed, not re-scored; only
+    # those still in this input, and (with --order input) in input order
+    replayed: "collections.deque[Any]" = collections.deque()
+    links_of: Dict[Any, Any] = {}
+
+    def pending_rows(rows: Iterable[Tuple[Any, Any]]) -> Iterator[Tuple[Any, Any]]:
+        for key, links in rows:
+            if journal.is_done(key, links):
+                replayed.append(key)
+            else:
+                links_of[key] = links
+                yield key, links
+
+    def flush_replayed(before: Any = None) -> None:
+        while replayed and (before is None or replayed[0] < before):
+            write_record(journal.replay(replayed.popleft()))
+
+    ordered = args.order == "input"
+    with journal or contextlib.nullcontext(), store or contextlib.nullcontext():
+        if journal is not None:
+            rows = pending_rows(rows)
+        for key, ndjson in stream_url(
+                rows,
+                max_workers=args.workers,
+                max_in_flight=args.max_in_flight,
+                engine=args.engine,
+                ordered=ordered,
+                store=store,
+                ops=ops):
+            if journal is not None:
+                flush_replayed(key if ordered else None)
+                journal.record(key, ndjson, links_of.pop(key, None))
+            write_record(ndjson)
+        flush_replayed()
+    return 0
+
+
+def _query_store(target: Optional[str], args: argparse.Namespace) -> int:
+    """Print stored results as NDJSON: top-k, history or latest for a target."""
+    from src.score_store import ScoreStore, default_store_path
+
+    store_path = args.store or default_store_path()
+    if not os.path.isfile(store_path):
+        print(f"ERROR: no score store at {store_path}", file=sys.stderr)
+        return 1
+    by = {"url": target} if target and "://" in target else {"name": target}
+    with ScoreStore(store_path) as store:
+        if args.top is not None:
+            results = store.top_k(args.top, category=args.category)
+        elif not target:
+            print("ERROR: query needs a model NAME or URL, or --top K",
+                  file=sys.stderr)
+            return 1
+        elif args.history:
+            results = store.history(**by)
+        else:
+            latest = store.latest(**by)
+            results = [latest] if latest else []
+    for result in results:
+        sys.stdout.write(json.dumps({"run_at": result["run_at"],
+                                     **result["record"]},
+                                    separators=(",", ":")) + "\n")
+    return 0 if results else 1
+
+
+def stream_url(rows: Iterable[Tuple[Any, List[Optional[str]]]],
+               **kwargs: Any) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """Streaming counterpart of evaluate_url: yield (key, record) per row."""
+    return iter_handle_url(rows, **kwargs)
+
+
+def write_record(record: Dict[str, Any], out=None) -> None:
+    """Validate one record and write it as an NDJSON line, flushed at once."""
+    out = out or sys.stdout
+    if validate_ndjson(record):
+        line = json.dumps(record, separators=(",", ":"))
+    else:
+        name = record.get("name", "unknown") if isinstance(record, dict) else "unknown"
+        line = json.dumps({"name": name, "error": "Invalid record"})
+    out.write(line + "\n")
+    out.flush()
+
+
 def validate_ndjson(record: Dict[str, Any]) -> bool:
     string_fields = {"name", "category"}
     score_fields = {
@@ -135,6 +347,25 @@ def main() -> int:
     args = parse_args()
     try:
         _check_env_variables()
+        if args.clear_cache or args.no_cache:
+            from src.metrics.data_fetcher.http_cache import github_cache
+            from src.metrics.data_fetcher.llm_cache import llm_cache
+            from src.metrics.data_fetcher.artifacts import artifact_cache
+            for cache in (github_cache, llm_cache, artifact_cache):
+                if args.clear_cache:
+                    cache.clear()
+                if args.no_cache:
+                    cache.enabled = False
+        if args.no_cache:
+            # read when the caches are built, so process-pool workers see it too
+            for name in ("GITHUB_CACHE", "LLM_CACHE", "ARTIFACT_CACHE"):
+                os.environ[name] = "off"
+        if args.github_graphql:
+            os.environ["GITHUB_FETCHER"] = "graphql"
+        if args.llm_batch:
+            os.environ["LLM_BATCH"] = "on"
+        if not args.args and args.clear_cache:
+            return 0
         if not args.args:
             print("No command or URLs provided", file=sys.stderr)
             return 1
@@ -195,6 +426,10 @@ def main() -> int:
                     file=sys.stderr)
                 return 1
 
+        elif command == "query":
+            return _query_store(args.args[1] if len(args.args) > 1 else None,
+                                args)
+
         elif command == "test":
             import subprocess
             import re
@@ -226,29 +461,7 @@ def main() -> int:
             return result.returncode
         else:
 
-            # Each model has a dictionary of links in order {code, dataset,
-            # model}
-            models = {}
-
-            if os.path.isfile(command):
-                with open(command, 'r') as f:
-                    lines = f.readlines()
-                    for i, line in enumerate(lines):
-                        links = [link.strip()
-                                 for link in line.strip().split(',')]
-                        models[i] = links
-
-            ndjsons = evaluate_url(models)
-
-            for ndjson in ndjsons.values():
-                if validate_ndjson(ndjson):
-                    print(json.dumps(ndjson, separators=(",", ":")))
-                else:
-                    name = ndjson.get("name", "unknown")
-                    print(json.dumps(
-                        {"name": name, "error": "Invalid record"}))
-
-            return 0
+            return _evaluate_file(command, args)
 
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
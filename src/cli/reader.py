@@ -0,0 +1,87 @@
+"""Incremental reader for CLI URL files.
+
+Each non-blank, non-comment line is ``code_url,dataset_url,model_url``.
+Rows are yielded as ``(line_index, [code, dataset, model])`` where
+``line_index`` is the 0-based position of the line in the input, so keys
+stay stable when lines are skipped. ``-`` reads stdin; files ending in
+``.gz`` (or starting with the gzip magic bytes) are decompressed on the
+fly.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import queue
+import sys
+import threading
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple
+
+Row = Tuple[int, List[str]]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def parse_line(line: str) -> Optional[List[str]]:
+    """Links of one input line, or None for blank and ``#`` comment lines."""
+    text = line.strip()
+    if not text or text.startswith("#"):
+        return None
+    links = [link.strip() for link in text.split(",")]
+    return links + [""] * (3 - len(links)) if len(links) < 3 else links
+
+
+def _open_text(source: str) -> IO[str]:
+    if source == "-":
+        raw = sys.stdin.buffer if hasattr(sys.stdin, "buffer") else None
+        if raw is None:
+            return sys.stdin
+        peek = raw.peek(2)[:2] if hasattr(raw, "peek") else b""
+        if peek == _GZIP_MAGIC:
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=raw), encoding="utf-8")
+        return sys.stdin
+    with open(source, "rb") as f:
+        magic = f.read(2)
+    if source.endswith(".gz") or magic == _GZIP_MAGIC:
+        return gzip.open(source, "rt", encoding="utf-8")
+    return open(source, "r", encoding="utf-8")
+
+
+def iter_rows(source: str) -> Iterator[Row]:
+    """Lazily yield rows from a path, ``-`` (stdin) or a gzip file."""
+    f = _open_text(source)
+    try:
+        for index, line in enumerate(f):
+            links = parse_line(line)
+            if links is not None:
+                yield index, links
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def prefetch(rows: Iterable[Any], maxsize: int) -> Iterator[Any]:
+    """
+    Read `rows` on a helper thread into a queue of at most `maxsize` items,
+    so parsing/decompression overlaps with evaluation while memory stays
+    proportional to `maxsize` rather than to the input size.
+    """
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, maxsize))
+    done = object()
+
+    def fill() -> None:
+        try:
+            for row in rows:
+                q.put(row)
+        except BaseException as e:  # re-raised in the consuming thread
+            q.put(e)
+        finally:
+            q.put(done)
+
+    threading.Thread(target=fill, name="row-reader", daemon=True).start()
+    while True:
+        item = q.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
@@ -25,12 +25,15 @@ from . import github as _github
 from . import heuristics as _heuristics
 from . import llm as _llm
 safe_request = _utils.safe_request
+get_session = _utils.get_session
+send_request = _utils.send_request
 extract_repo_info = _utils.extract_repo_info
 extract_hf_model_id = _utils.extract_hf_model_id
 check_availability = _utils.check_availability
 
 get_huggingface_model_data = _huggingface.get_huggingface_model_data
 get_huggingface_dataset_data = _huggingface.get_huggingface_dataset_data
+get_model_card = _huggingface.get_model_card
 
 get_github_repo_data = _github.get_github_repo_data
 
@@ -46,11 +49,14 @@ get_genai_metric_data = _llm.get_genai_metric_data
 
 __all__ = [
     "safe_request",
+    "get_session",
+    "send_request",
     "extract_repo_info",
     "extract_hf_model_id",
     "check_availability",
     "get_huggingface_model_data",
     "get_huggingface_dataset_data",
+    "get_model_card",
     "get_github_repo_data",
     "analyze_code_quality",
     "normalize_downloads",
@@ -0,0 +1,325 @@
+"""Content-addressed cache of files downloaded from Hugging Face repos.
+
+Files (model cards, configs, ...) are stored once per content under
+``<dir>/blobs/<sha256>`` and found through small JSON refs under
+``<dir>/refs/`` keyed by repo type, repo id, revision and filename. A ref
+remembers the commit (``X-Repo-Commit``) and ETag the file was fetched at:
+
+- within env ARTIFACT_REVISION_TTL seconds (default 1 hour) of the last
+  check the cached file is used as is;
+- after that a HEAD request compares the upstream commit/ETag, and only a
+  changed file is downloaded again;
+- if the check fails (offline, rate limited) the cached file is served.
+
+Set env ARTIFACT_CACHE=off or `artifact_cache.enabled = False` to bypass.
+The directory is env ARTIFACT_CACHE_DIR (default ``<cache root>/artifacts``)
+and is capped at env ARTIFACT_CACHE_MAX_BYTES (default 512 MiB) with LRU
+eviction of blobs. Writes go through a temp file and ``os.replace``, so
+concurrent rows and processes sharing the directory never see partial
+files; within a run each file is checked once (see `memo`).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .disk_cache import cache_root
+from .env import env_float
+from .memo import memoized
+from .utils import extract_hf_model_id, hf_headers, send_request
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.artifacts")
+
+HF_BASE = "https://huggingface.co"
+
+
+def resolve_url(repo_id: str, filename: str, revision: str = "main",
+                repo_type: str = "model") -> str:
+    prefix = "" if repo_type == "model" else f"{repo_type}s/"
+    return f"{HF_BASE}/{prefix}{repo_id}/resolve/{revision}/{filename}"
+
+
+class ArtifactCache:
+    """Blob store plus revision refs; every method is best-effort."""
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_bytes: Optional[int] = None) -> None:
+        self._directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = os.getenv("ARTIFACT_CACHE", "on").lower() not in (
+            "0", "off", "false", "no")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return (self._directory or os.getenv("ARTIFACT_CACHE_DIR")
+                or os.path.join(cache_root(), "artifacts"))
+
+    @property
+    def quota(self) -> int:
+        if self.max_bytes is not None:
+            return self.max_bytes
+        return int(env_float("ARTIFACT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+    def _ref_path(self, repo_type: str, repo_id: str, revision: str,
+                  filename: str) -> str:
+        key = "\n".join((repo_type, repo_id, revision, filename))
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "refs", f"{digest}.json")
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "blobs", digest)
+
+    # ---------- refs ----------
+
+    def get_ref(self, repo_type: str, repo_id: str, revision: str,
+                filename: str) -> Optional[Dict[str, Any]]:
+        """The ref if its blob is still present (the blob is marked used)."""
+        try:
+            with open(self._ref_path(repo_type, repo_id, revision, filename),
+                      "r", encoding="utf-8") as f:
+                ref = json.load(f)
+            blob = self.blob_path(ref["blob"])
+            os.utime(blob, None)
+            return ref
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set_ref(self, repo_type: str, repo_id: str, revision: str,
+                filename: str, ref: Dict[str, Any]) -> None:
+        self._write(self._ref_path(repo_type, repo_id, revision, filename),
+                    json.dumps(ref).encode("utf-8"))
+
+    # ---------- blobs ----------
+
+    def put_blob(self, content: bytes) -> Optional[str]:
+        """Store `content` under its sha256; returns the digest."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            os.utime(path, None)
+            return digest
+        if not self._write(path, content):
+            return None
+        self.evict()
+        return digest
+
+    def _write(self, path: str, data: bytes) -> bool:
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            return True
+        except OSError as e:
+            logger.debug(f"Failed to write artifact cache file {path}: {e}")
+            return False
+
+    def evict(self) -> None:
+        """Drop least recently used blobs until under 90% of the quota."""
+        quota = self.quota
+        blobs = os.path.join(self.directory, "blobs")
+        with self._lock:
+            entries = []
+            try:
+                with os.scandir(blobs) as it:
+                    for de in it:
+                        if de.is_file() and not de.name.endswith(".tmp"):
+                            st = de.stat()
+                            entries.append((st.st_mtime, st.st_size, de.path))
+            except OSError:
+                return
+            total = sum(size for _, size, _ in entries)
+            if total <= quota:
+                return
+            target = int(quota * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        for sub in ("refs", "blobs"):
+            directory = os.path.join(self.directory, sub)
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+artifact_cache = ArtifactCache()
+
+
+def version_of(headers: Any) -> Dict[str, Optional[str]]:
+    """Commit and ETag a Hugging Face file response was served at."""
+    return {"commit": headers.get("X-Repo-Commit"),
+            "etag": headers.get("X-Linked-Etag") or headers.get("ETag")}
+
+
+def _upstream_version(url: str) -> Optional[Dict[str, Optional[str]]]:
+    """Commit and ETag of the file at `url`, from a HEAD request."""
+    try:
+        resp = send_request("head", url, headers=hf_headers(),
+                            allow_redirects=False, timeout=10)
+    except Exception as e:
+        logger.debug(f"Revision check failed for {url}: {e}")
+        return None
+    if resp.status_code >= 400:
+        return None
+    return version_of(resp.headers)
+
+
+def _same_version(ref: Dict[str, Any], upstream: Dict[str, Optional[str]]) -> bool:
+    if upstream.get("commit") and ref.get("commit"):
+        return upstream["commit"] == ref["commit"]
+    return bool(upstream.get("etag")) and upstream.get("etag") == ref.get("etag")
+
+
+def prepare_artifact(repo_id: str, filename: str, revision: str = "main",
+                     repo_type: str = "model"
+                     ) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+    """
+    (download URL, cached ref, whether the ref can be served without a
+    revision check). The ref is None when nothing is cached or the cache
+    is disabled.
+    """
+    cache = artifact_cache
+    ref = cache.get_ref(repo_type, repo_id, revision, filename) if cache.enabled else None
+    ttl = env_float("ARTIFACT_REVISION_TTL", 3600)
+    fresh = bool(ref) and time.time() - float(ref.get("checked_at", 0)) < ttl
+    return resolve_url(repo_id, filename, revision, repo_type), ref, fresh
+
+
+def revalidate_artifact(repo_id: str, filename: str, revision: str,
+                        repo_type: str, ref: Dict[str, Any],
+                        upstream: Optional[Dict[str, Optional[str]]]) -> bool:
+    """True if the cached `ref` is still served given the HEAD result `upstream`.
+
+    An unchanged upstream restarts the revision TTL; an unreachable one
+    (None) keeps serving the cached copy.
+    """
+    if upstream is not None and not _same_version(ref, upstream):
+        return False
+    if upstream is not None:
+        artifact_cache.set_ref(repo_type, repo_id, revision, filename,
+                               {**ref, "checked_at": time.time()})
+    return True
+
+
+def store_artifact(repo_id: str, filename: str, revision: str, repo_type: str,
+                   content: bytes, headers: Any) -> Optional[str]:
+    """Cache downloaded `content` and point the ref at it; returns the blob path."""
+    cache = artifact_cache
+    digest = cache.put_blob(content)
+    if digest is None:
+        return None
+    cache.set_ref(repo_type, repo_id, revision, filename,
+                  {"blob": digest, **version_of(headers), "checked_at": time.time()})
+    return cache.blob_path(digest)
+
+
+def _download(url: str) -> Any:
+    try:
+        resp = send_request("get", url, headers=hf_headers(), timeout=30)
+        resp.raise_for_status()
+        return resp
+    except Exception as e:
+        logger.debug(f"Failed to download {url}: {e}")
+        return None
+
+
+def _fetch_artifact(repo_id: str, filename: str, revision: str,
+                    repo_type: str) -> Optional[str]:
+    cache = artifact_cache
+    url, ref, fresh = prepare_artifact(repo_id, filename, revision, repo_type)
+    if ref and (fresh or revalidate_artifact(repo_id, filename, revision, repo_type,
+                                             ref, _upstream_version(url))):
+        cache._count(True)
+        return cache.blob_path(ref["blob"])
+
+    cache._count(False)
+    resp = _download(url)
+    if resp is None:
+        return cache.blob_path(ref["blob"]) if ref else None
+
+    if not cache.enabled:
+        # the caller owns this copy; read_artifact avoids it altogether
+        fd, tmp = tempfile.mkstemp(suffix=f"-{os.path.basename(filename)}")
+        with os.fdopen(fd, "wb") as f:
+            f.write(resp.content)
+        return tmp
+    return store_artifact(repo_id, filename, revision, repo_type,
+                          resp.content, resp.headers)
+
+
+def fetch_artifact(repo_id: str, filename: str, revision: str = "main",
+                   repo_type: str = "model") -> Optional[str]:
+    """Local path of `filename` in the repo at `revision`, or None.
+
+    With the cache disabled the path is a temporary file that the caller
+    must delete; use `read_artifact` when only the content is needed.
+    """
+    prefix = "" if repo_type == "model" else f"{repo_type}s/"
+    return memoized(f"artifact:{revision}:{filename}",
+                    f"{HF_BASE}/{prefix}{repo_id}", _fetch_artifact,
+                    repo_id, filename, revision, repo_type)
+
+
+def model_file(model_url: str, filename: str = "README.md") -> Optional[str]:
+    """`fetch_artifact` for a model given by its Hugging Face URL."""
+    repo_id = extract_hf_model_id(model_url)
+    return fetch_artifact(repo_id, filename) if repo_id else None
+
+
+def read_artifact(repo_id: str, filename: str, revision: str = "main",
+                  repo_type: str = "model") -> Optional[bytes]:
+    """Content of `filename` in the repo at `revision`, or None.
+
+    Served from the cache when it is enabled; otherwise downloaded into
+    memory, so nothing is left behind on disk.
+    """
+    if not artifact_cache.enabled:
+        resp = _download(resolve_url(repo_id, filename, revision, repo_type))
+        return resp.content if resp is not None else None
+    path = fetch_artifact(repo_id, filename, revision, repo_type)
+    return read_file(path) if path else None
+
+
+def read_file(path: str) -> Optional[bytes]:
+    """Content of a cached artifact file, or None if it is gone."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        logger.debug(f"Unreadable cached artifact {path}: {e}")
+        return None
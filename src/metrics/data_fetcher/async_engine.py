@@ -0,0 +1,395 @@
+"""Asyncio fetch engine, an alternative to the blocking requests path.
+
+`AsyncFetchEngine` owns one aiohttp client session (connection pool sized
+by env ASYNC_POOL_LIMIT / ASYNC_POOL_LIMIT_PER_HOST) and exposes async
+counterparts of the data_fetcher helpers. Their results have the same
+shape as the blocking versions, and `fetch_comprehensive_metrics_data`
+merges them with the same code as the threaded aggregator. Within one
+engine, fetches of the same source + URL are single-flight, kept on the
+same terms as the threaded `FetchMemo`: bounded, least recently used out
+first, and failures (an exception, None or {}) dropped so later rows retry.
+
+Only the ``dataset_infos.json`` fallback of the HF dataset lookup runs in
+the default executor; everything else, including model cards (through the
+same artifact cache as `get_model_card`), stays on the event loop.
+
+aiohttp is an optional dependency, imported when the engine is entered.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from itertools import islice
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from requests.structures import CaseInsensitiveDict
+
+from src.error_handling import DependencyError
+from src.logger import get_logger
+from . import artifacts, http_cache, llm, llm_cache
+from .aggregator import (_fallback_data, _merge_sources, default_requires,
+                         plan_sources)
+from .env import env_int
+from .github import (contributor_stats, empty_repo_data, github_headers,
+                     repo_fields, tree_budget, tree_entries, tree_files,
+                     tree_plan, tree_signals_complete)
+from .huggingface import dataset_data_from_api, dataset_infos_fallback
+from .memo import is_failure, max_entries as memo_max_entries, normalize_url
+from .rate_limit import scheduler
+from .utils import extract_hf_model_id, extract_repo_info, hf_headers
+
+logger = get_logger("data_fetcher.async_engine")
+
+
+def model_data_from_api(js: Dict[str, Any], model_id: str) -> Dict[str, Any]:
+    """Map a /api/models/{id}?blobs=true response to get_huggingface_model_data's shape."""
+    card_data = js.get("cardData") or {}
+    siblings = js.get("siblings") or []
+    return {
+        "license": card_data.get("license", "") if card_data else None,
+        "tags": js.get("tags") or [],
+        "downloads": js.get("downloads") or 0,
+        "pipeline_tag": js.get("pipeline_tag"),
+        "model_id": js.get("modelId") or js.get("id") or model_id,
+        "sha": js.get("sha"),
+        "card_data": card_data,
+        "total_size_bytes": sum(int(s.get("size") or 0) for s in siblings),
+    }
+
+
+class AsyncFetchEngine:
+    """Async data fetcher bound to one aiohttp session; use as `async with`."""
+
+    HF_API = "https://huggingface.co/api"
+
+    def __init__(self, limit: Optional[int] = None,
+                 limit_per_host: Optional[int] = None,
+                 timeout: float = 20.0) -> None:
+        self.limit = limit or env_int("ASYNC_POOL_LIMIT", 200)
+        self.limit_per_host = limit_per_host or env_int(
+            "ASYNC_POOL_LIMIT_PER_HOST", 32)
+        self.timeout = timeout
+        self._client: Any = None
+        self._inflight: "OrderedDict[Tuple[str, str], asyncio.Future[Any]]" = OrderedDict()
+
+    async def __aenter__(self) -> "AsyncFetchEngine":
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise DependencyError(
+                "the async engine requires aiohttp (pip install aiohttp)") from e
+        self._client = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    # ---------- low level ----------
+
+    async def _send(self, method: str, url: str, raw: bool = False,
+                    **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+        async with self._client.request(method, url, **kwargs) as resp:
+            body = None
+            if method != "HEAD" and resp.status < 300:
+                body = await (resp.read() if raw else resp.json(content_type=None))
+            return resp.status, body, CaseInsensitiveDict(resp.headers)
+
+    async def _request(self, method: str, url: str, raw: bool = False,
+                       **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Return (status, parsed JSON body or None, headers), paced and
+        retried by the shared rate-limit scheduler. With `raw` the body is
+        the response bytes instead.
+        """
+        attempt = 0
+        while True:
+            delay = scheduler.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            status, body, headers = await self._send(method, url, raw=raw, **kwargs)
+            wait = scheduler.observe(
+                url, SimpleNamespace(status_code=status, headers=headers), attempt)
+            if wait is None:
+                return status, body, headers
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def get_json(self, url: str,
+                       headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """GET JSON, None on any failure (mirrors safe_request)."""
+        try:
+            status, body, _ = await self._request("GET", url, headers=headers or {})
+            return body if status < 400 else None
+        except Exception as e:
+            logger.debug(f"Async request failed for {url}: {e}")
+            return None
+
+    async def cached_get_json(self, url: str,
+                              headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """Async counterpart of http_cache.cached_get_json."""
+        if not http_cache.github_cache.enabled:
+            return await self.get_json(url, headers)
+        key, entry, fresh, req_headers = http_cache.prepare_request(url, headers)
+        if fresh:
+            return entry.get("body")
+        try:
+            status, body, resp_headers = await self._request(
+                "GET", url, headers=req_headers)
+        except Exception as e:
+            logger.debug(f"Async request failed for {url}: {e}")
+            return entry.get("body") if entry is not None else None
+        if status == 304 and entry is not None:
+            return http_cache.mark_revalidated(key, entry)
+        if status >= 400:
+            return None
+        http_cache.store(key, url, body, resp_headers.get("ETag"),
+                         resp_headers.get("Last-Modified"))
+        return body
+
+    async def _single_flight(self, source: str, url: str,
+                             fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        key = (source, normalize_url(url))
+        task = self._inflight.get(key)
+        if task is not None:
+            self._inflight.move_to_end(key)
+        else:
+            task = asyncio.ensure_future(fn(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_failure(key, t))
+            excess = len(self._inflight) - memo_max_entries()
+            if excess > 0:
+                # same bound as the threaded FetchMemo: oldest finished first
+                done = (k for k, t in self._inflight.items() if t.done())
+                for old in list(islice(done, excess)):
+                    del self._inflight[old]
+        return await asyncio.shield(task)
+
+    def _forget_failure(self, key: Tuple[str, str], task: "asyncio.Future[Any]") -> None:
+        failed = (task.cancelled() or task.exception() is not None
+                  or is_failure(task.result()))
+        if failed and self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    # ---------- async counterparts ----------
+
+    async def _url_ok(self, url: str) -> bool:
+        try:
+            status, _, _ = await self._request(
+                "HEAD", url, allow_redirects=True)
+            return status in (200, 301, 302)
+        except Exception as e:
+            logger.debug(f"Failed to check URL {url}: {e}")
+            return False
+
+    async def check_availability(self, code_url: str, dataset_url: str,
+                                 model_url: str) -> Dict[str, Any]:
+        """HEAD the URLs concurrently; same result shape as check_availability."""
+        results: Dict[str, Any] = {}
+        names = ("code", "dataset", "model")
+        urls = (code_url, dataset_url, model_url)
+        checks = [self._single_flight("head", u, self._url_ok, u)
+                  if u and u.strip() else asyncio.sleep(0, result=False)
+                  for u in urls]
+        oks = await asyncio.gather(*checks)
+        for name, ok in zip(names, oks):
+            results[f"has_{name}"] = bool(ok)
+        results["links_ok"] = sum(bool(ok) for ok in oks) >= 2
+        return results
+
+    async def get_github_repo_data(self, code_url: str) -> Dict[str, Any]:
+        owner, repo = extract_repo_info(code_url)
+        if not owner or not repo:
+            return {}
+        headers = github_headers()
+        base = f"https://api.github.com/repos/{owner}/{repo}"
+        data = empty_repo_data()
+        try:
+            rd, lst = await asyncio.gather(
+                self.cached_get_json(base, headers),
+                self.cached_get_json(f"{base}/contributors", headers))
+            if rd:
+                data.update(repo_fields(rd))
+            if isinstance(lst, list) and lst:
+                data["contributors"] = contributor_stats(lst)
+            branches, paged = tree_plan(rd if isinstance(rd, dict) else None)
+            for branch in branches:
+                if paged:
+                    files = await self._paged_tree_files(base, branch, headers)
+                else:
+                    tree_body = await self.cached_get_json(
+                        f"{base}/git/trees/{branch}?recursive=1", headers)
+                    files = (tree_files(tree_body)
+                             if isinstance(tree_body, dict) else None)
+                if files is not None:
+                    data["files"] = files
+                    break
+        except Exception as e:
+            logger.debug(f"Failed to fetch GitHub data: {e}")
+        return data
+
+    async def _paged_tree_files(self, base: str, branch: str,
+                                headers: Dict[str, str]) -> Optional[list]:
+        """Async counterpart of github._paged_tree_files (one level per request)."""
+        max_requests, max_files = tree_budget()
+        files: list = []
+        level = [("", branch)]
+        requests_made = 0
+        while level and requests_made < max_requests and len(files) < max_files:
+            level = level[:max_requests - requests_made]
+            bodies = await asyncio.gather(*(
+                self.cached_get_json(f"{base}/git/trees/{ref}", headers)
+                for _, ref in level))
+            requests_made += len(level)
+            next_level = []
+            for (prefix, _), body in zip(level, bodies):
+                if not isinstance(body, dict):
+                    if not prefix:
+                        return None
+                    continue
+                level_files, dirs = tree_entries(body, prefix)
+                files.extend(level_files)
+                next_level.extend(dirs)
+            if tree_signals_complete(files):
+                break
+            level = next_level
+        return files[:max_files]
+
+    async def get_huggingface_model_data(self, model_url: str) -> Dict[str, Any]:
+        model_id = extract_hf_model_id(model_url)
+        if not model_id:
+            return {}
+        headers = hf_headers()
+        js = await self.get_json(
+            f"{self.HF_API}/models/{model_id}?blobs=true", headers)
+        if not isinstance(js, dict):
+            return {}
+        return model_data_from_api(js, model_id)
+
+    async def get_huggingface_dataset_data(self, dataset_url: str) -> Dict[str, Any]:
+        dataset_id = extract_hf_model_id(dataset_url)
+        if not dataset_id:
+            return {}
+        headers = hf_headers()
+        js = await self.get_json(f"{self.HF_API}/datasets/{dataset_id}", headers)
+        if not isinstance(js, dict):
+            return {}
+        data = dataset_data_from_api(js, dataset_id)
+        if data["features"] and data["splits"]:
+            return data
+        return await asyncio.get_running_loop().run_in_executor(
+            None, dataset_infos_fallback, data, dataset_id)
+
+    async def get_genai_metric_data(self, model_url: str,
+                                    prompt: str) -> Dict[str, Any]:
+        if not llm.PURDUE_GENAI_API_KEY:
+            logger.debug("GEN AI API key not set; skipping GenAI call")
+            return {}
+        headers, body = llm.genai_request(model_url, prompt)
+        cached = llm_cache.lookup(llm.PURDUE_GENAI_URL, body)
+        if cached is not None:
+            return {"metric": llm.parse_metric(cached)}
+        try:
+            status, data, _ = await self._request(
+                "POST", llm.PURDUE_GENAI_URL, headers=headers, json=body)
+            if status >= 400 or not isinstance(data, dict):
+                return {}
+            llm_cache.remember(llm.PURDUE_GENAI_URL, body, data)
+            return {"metric": llm.parse_metric(data)}
+        except Exception as e:
+            logger.debug(f"GenAI call failed: {e}")
+            return {}
+
+    # ---------- aggregation ----------
+
+    async def _timed(self, source: str, url: str,
+                     fn: Callable[..., Awaitable[Any]],
+                     *args: Any) -> Tuple[Any, float]:
+        start = time.time()
+        if url:
+            out = await self._single_flight(source, url, fn, *args)
+        else:
+            out = await fn(*args)
+        return out, time.time() - start
+
+    async def read_artifact(self, repo_id: str, filename: str,
+                            revision: str = "main",
+                            repo_type: str = "model") -> Optional[bytes]:
+        """Async counterpart of artifacts.read_artifact (same cache and checks)."""
+        cache = artifacts.artifact_cache
+        headers = hf_headers()
+        url, ref, fresh = artifacts.prepare_artifact(
+            repo_id, filename, revision, repo_type)
+        if ref and not fresh:
+            try:
+                status, _, resp_headers = await self._request(
+                    "HEAD", url, headers=headers, allow_redirects=False)
+                upstream = artifacts.version_of(resp_headers) if status < 400 else None
+            except Exception as e:
+                logger.debug(f"Revision check failed for {url}: {e}")
+                upstream = None
+            fresh = artifacts.revalidate_artifact(
+                repo_id, filename, revision, repo_type, ref, upstream)
+        if ref and fresh:
+            cache._count(True)
+            return artifacts.read_file(cache.blob_path(ref["blob"]))
+
+        if cache.enabled:
+            cache._count(False)
+        try:
+            status, content, resp_headers = await self._request(
+                "GET", url, raw=True, headers=headers)
+        except Exception as e:
+            logger.debug(f"Failed to download {url}: {e}")
+            status, content = 599, None
+        if status >= 400 or content is None:
+            return artifacts.read_file(cache.blob_path(ref["blob"])) if ref else None
+        if cache.enabled:
+            artifacts.store_artifact(repo_id, filename, revision, repo_type,
+                                     content, resp_headers)
+        return content
+
+    async def get_model_card(self, model_url: str) -> str:
+        """Async counterpart of get_model_card."""
+        repo_id = extract_hf_model_id(model_url)
+        content = await self.read_artifact(repo_id, "README.md") if repo_id else None
+        return content.decode("utf-8", errors="replace") if content else ""
+
+    async def fetch_comprehensive_metrics_data(
+            self, code_url: str, dataset_url: str, model_url: str,
+            requires: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Async counterpart of the aggregator; same keys and latencies."""
+        sources = plan_sources(default_requires() if requires is None else requires)
+        coros: Dict[str, Awaitable[Tuple[Any, float]]] = {}
+        if "availability" in sources:
+            coros["availability"] = self._timed(
+                "availability", "", self.check_availability,
+                code_url, dataset_url, model_url)
+        if model_url and "huggingface.co" in model_url and "/datasets/" not in model_url:
+            if "hf_model" in sources:
+                coros["hf_model"] = self._timed(
+                    "hf_model", model_url, self.get_huggingface_model_data, model_url)
+            if "model_card" in sources:
+                coros["model_card"] = self._timed(
+                    "model_card", model_url, self.get_model_card, model_url)
+        if dataset_url and "huggingface.co/datasets" in dataset_url \
+                and "hf_dataset" in sources:
+            coros["hf_dataset"] = self._timed(
+                "hf_dataset", dataset_url, self.get_huggingface_dataset_data,
+                dataset_url)
+        if code_url and "github.com" in code_url and "github" in sources:
+            coros["github"] = self._timed(
+                "github", code_url, self.get_github_repo_data, code_url)
+        try:
+            results = await asyncio.gather(*coros.values())
+            return _merge_sources(dict(zip(coros.keys(), results)))
+        except Exception as exc:
+            logger.error("Error fetching comprehensive metrics data: %s", exc)
+            return _fallback_data()
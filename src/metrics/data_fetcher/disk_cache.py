@@ -0,0 +1,186 @@
+"""Small persistent key/value cache stored as JSON files on disk.
+
+Entries live under ``<cache root>/<namespace>/`` where the cache root comes
+from env T4H_CACHE_DIR (default ``$XDG_CACHE_HOME/team4hope`` or
+``~/.cache/team4hope``). Each entry is one JSON file named after the sha256
+of its key. File mtimes double as last-access times, which gives a cheap
+LRU eviction once the namespace grows past its size cap.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .env import env_int
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.disk_cache")
+
+
+def cache_root() -> str:
+    """Base directory shared by all on-disk caches."""
+    root = os.getenv("T4H_CACHE_DIR")
+    if root:
+        return root
+    xdg = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg, "team4hope")
+
+
+def is_fresh(entry: Optional[Dict[str, Any]], ttl: float) -> bool:
+    """True if `entry` was stored less than `ttl` seconds ago."""
+    if not entry:
+        return False
+    return time.time() - float(entry.get("stored_at", 0)) < ttl
+
+
+class DiskCache:
+    """
+    JSON entry cache for one namespace with a size cap and LRU eviction.
+
+    `max_bytes` defaults to env `<NAMESPACE>_CACHE_MAX_BYTES`. All methods
+    are best-effort: I/O errors are logged and treated as cache misses.
+    """
+
+    def __init__(self, namespace: str,
+                 max_bytes: Optional[int] = None,
+                 default_max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.namespace = namespace
+        self.enabled = True
+        env_name = f"{namespace.upper()}_CACHE_MAX_BYTES"
+        if max_bytes is None:
+            max_bytes = env_int(env_name, default_max_bytes)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # bytes written since the last full scan (None = not scanned yet)
+        self._approx_bytes: Optional[int] = None
+        self._approx_dir: Optional[str] = None
+
+    # ---------- paths ----------
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(cache_root(), self.namespace)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    # ---------- API ----------
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for `key` (and mark it recently used).
+
+        With `ttl`, an entry older than `ttl` seconds is still returned (it
+        may be revalidated) but is counted as a miss, not a hit.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            logger.debug(f"Unreadable {self.namespace} cache entry: {e}")
+            entry = None
+        hit = entry is not None and (ttl is None or is_fresh(entry, ttl))
+        with self._lock:
+            if not hit:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store `entry` (a JSON-serialisable dict) under `key`."""
+        if not self.enabled:
+            return
+        entry = dict(entry)
+        entry.setdefault("stored_at", time.time())
+        try:
+            payload = json.dumps(entry)
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self._path(key))
+        except Exception as e:
+            logger.debug(f"Failed to write {self.namespace} cache entry: {e}")
+            return
+        self._account(len(payload))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace."""
+        directory = self.directory
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            names = []
+        for name in names:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+        with self._lock:
+            self._approx_bytes = 0
+            self._approx_dir = directory
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    # ---------- eviction ----------
+
+    def _account(self, written: int) -> None:
+        directory = self.directory
+        with self._lock:
+            if self._approx_bytes is None or self._approx_dir != directory:
+                self._approx_bytes = None
+            else:
+                self._approx_bytes += written
+            over = self._approx_bytes is None or self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until under 90% of the cap."""
+        directory = self.directory
+        with self._lock:
+            entries = []
+            try:
+                with os.scandir(directory) as it:
+                    for de in it:
+                        if de.is_file() and de.name.endswith(".json"):
+                            st = de.stat()
+                            entries.append((st.st_mtime, st.st_size, de.path))
+            except OSError:
+                pass
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                target = int(self.max_bytes * 0.9)
+                for _, size, path in sorted(entries):
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                        total -= size
+                    except OSError:
+                        pass
+            self._approx_bytes = total
+            self._approx_dir = directory
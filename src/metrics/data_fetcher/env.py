@@ -0,0 +1,21 @@
+"""Environment-variable settings shared by the data fetcher and its callers.
+
+A setting that is unset or does not parse falls back to its default.
+"""
+from __future__ import annotations
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
@@ -0,0 +1,77 @@
+"""Cheap upstream change detection for incremental re-scoring.
+
+A row's fingerprint is the current revision of each of its sources:
+
+- HF model / dataset: the commit ``sha`` of the ``main`` revision;
+- GitHub: ``pushed_at`` (falling back to ``updated_at``) from the repo
+  metadata, which goes through the ETag cache, so an unchanged repo costs
+  a 304 that does not count against the rate limit.
+
+Each lookup is memoized per run like the full fetches. A source whose
+revision cannot be read maps to None, which never matches a stored value.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from .http_cache import cached_get_json
+from .memo import memoized
+from .utils import (extract_hf_model_id, extract_repo_info, github_headers,
+                    hf_headers, safe_request)
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.fingerprint")
+
+HF_API = "https://huggingface.co/api"
+
+
+def _hf_revision(kind: str, url: str) -> Optional[str]:
+    repo_id = extract_hf_model_id(url)
+    if not repo_id:
+        return None
+    resp = safe_request(f"{HF_API}/{kind}/{repo_id}/revision/main",
+                        headers=hf_headers())
+    if resp is None:
+        return None
+    try:
+        return resp.json().get("sha")
+    except Exception as e:
+        logger.debug(f"Unreadable HF revision for {url}: {e}")
+        return None
+
+
+def hf_model_revision(model_url: str) -> Optional[str]:
+    return memoized("fp_hf_model", model_url, _hf_revision, "models", model_url)
+
+
+def hf_dataset_revision(dataset_url: str) -> Optional[str]:
+    return memoized("fp_hf_dataset", dataset_url, _hf_revision,
+                    "datasets", dataset_url)
+
+
+def _github_revision(code_url: str) -> Optional[str]:
+    owner, repo = extract_repo_info(code_url)
+    if not owner or not repo:
+        return None
+    rd = cached_get_json(f"https://api.github.com/repos/{owner}/{repo}",
+                         headers=github_headers())
+    if not isinstance(rd, dict):
+        return None
+    return rd.get("pushed_at") or rd.get("updated_at")
+
+
+def github_revision(code_url: str) -> Optional[str]:
+    return memoized("fp_github", code_url, _github_revision, code_url)
+
+
+def row_fingerprints(code_url: str, dataset_url: str,
+                     model_url: str) -> Dict[str, Optional[str]]:
+    """Revision of every source the row has; sources it lacks are omitted."""
+    fp: Dict[str, Optional[str]] = {}
+    if model_url and "huggingface.co" in model_url and "/datasets/" not in model_url:
+        fp["hf_model"] = hf_model_revision(model_url)
+    if dataset_url and "huggingface.co/datasets" in dataset_url:
+        fp["hf_dataset"] = hf_dataset_revision(dataset_url)
+    if code_url and "github.com" in code_url:
+        fp["github"] = github_revision(code_url)
+    return fp
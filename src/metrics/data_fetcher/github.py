@@ -1,26 +1,30 @@
-"""GitHub helpers for repository metadata."""
+"""GitHub helpers for repository metadata.
+
+The git tree is fetched for the repository's `default_branch` (taken from
+the metadata response; main/master are only probed when it is missing).
+Repositories larger than env GITHUB_TREE_PAGED_KB (metadata `size`, in KB)
+skip the recursive tree and are walked breadth-first one directory per
+request instead, stopping once the file-list signals used by
+`analyze_code_quality` / `analyze_performance_claims` are all present or
+the GITHUB_TREE_MAX_REQUESTS / GITHUB_TREE_MAX_FILES budget is spent.
+"""
 from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
 
-from .utils import safe_request, extract_repo_info
+from .env import env_int
+from .http_cache import cached_get_json
+from .utils import extract_repo_info, github_headers
 from src.logger import get_logger
 
 logger = get_logger("data_fetcher.github")
 
 
-def get_github_repo_data(code_url: str) -> Dict[str, Any]:
-    """Fetch GitHub repository metadata used by metrics (bus factor, etc.)."""
-    owner, repo = extract_repo_info(code_url)
-    if not owner or not repo:
-        return {}
-
-    token = os.getenv("GITHUB_TOKEN")
-    headers = {"Authorization": f"token {token}"} if token else {}
-
-    data: Dict[str, Any] = {
+def empty_repo_data() -> Dict[str, Any]:
+    return {
         "contributors": {},
         "files": [],
         "license": None,
@@ -30,44 +34,143 @@ def get_github_repo_data(code_url: str) -> Dict[str, Any]:
         "updated_at": None,
     }
 
+
+def repo_fields(rd: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields taken from the /repos/{owner}/{repo} response."""
+    return {
+        "stars": rd.get("stargazers_count", 0) or 0,
+        "forks": rd.get("forks_count", 0) or 0,
+        "created_at": rd.get("created_at"),
+        "updated_at": rd.get("updated_at"),
+        "license": (rd.get("license") or {}).get("spdx_id") if rd.get("license") else None,
+    }
+
+
+def contributor_stats(lst: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bus-factor inputs from the /contributors response."""
+    total = sum(c.get("contributions", 0) for c in lst)
+    top = lst[0].get("contributions", 0) if total else 0
+    return {
+        "contributors_count": len(lst),
+        "top_contributor_pct": (top / total) if total else 1.0,
+        "total_contributions": total,
+    }
+
+
+def get_contributor_stats(base: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    """contributor_stats for the repo at `base`, or {} if unavailable."""
+    lst = cached_get_json(f"{base}/contributors", headers=headers)
+    return contributor_stats(lst) if isinstance(lst, list) and lst else {}
+
+
+def tree_files(tree_body: Dict[str, Any]) -> List[str]:
+    """Blob paths from a git/trees response."""
+    tree = tree_body.get("tree", [])
+    return [it["path"] for it in tree if it.get("type") == "blob"]
+
+
+def tree_plan(rd: Optional[Dict[str, Any]]) -> Tuple[List[str], bool]:
+    """(branches to try in order, whether to walk the tree in pages)."""
+    rd = rd or {}
+    branch = rd.get("default_branch")
+    branches = [branch] if branch else ["main", "master"]
+    paged = (rd.get("size") or 0) > env_int("GITHUB_TREE_PAGED_KB", 500_000)
+    return branches, paged
+
+
+def tree_budget() -> Tuple[int, int]:
+    """(max tree requests, max files) for a paged walk."""
+    return (env_int("GITHUB_TREE_MAX_REQUESTS", 30),
+            env_int("GITHUB_TREE_MAX_FILES", 5000))
+
+
+def tree_entries(tree_body: Dict[str, Any],
+                 prefix: str = "") -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Blob paths and (path, sha) subtrees of one non-recursive tree level."""
+    files: List[str] = []
+    dirs: List[Tuple[str, str]] = []
+    for it in tree_body.get("tree", []):
+        path = prefix + it.get("path", "")
+        if it.get("type") == "blob":
+            files.append(path)
+        elif it.get("type") == "tree" and it.get("sha"):
+            dirs.append((path + "/", it["sha"]))
+    return files, dirs
+
+
+def tree_signals_complete(files: List[str]) -> bool:
+    """True once every file-list signal the heuristics look for is present."""
+    lower = [f.lower() for f in files]
+    return (any(os.path.basename(f).startswith("readme") for f in lower)
+            and any(f in {"setup.py", "pyproject.toml", "setup.cfg"}
+                    for f in lower)
+            and any("requirements" in f for f in lower)
+            and any(f.endswith(".py") and "test" in f for f in lower)
+            and any(k in f for f in lower
+                    for k in ("benchmark", "eval", "metric", "result")))
+
+
+def _paged_tree_files(base: str, branch: str,
+                      headers: Dict[str, str]) -> Optional[List[str]]:
+    """Breadth-first walk of the tree within the request/file budget."""
+    max_requests, max_files = tree_budget()
+    files: List[str] = []
+    queue = deque([("", branch)])
+    requests_made = 0
+    while queue and requests_made < max_requests and len(files) < max_files:
+        prefix, ref = queue.popleft()
+        body = cached_get_json(f"{base}/git/trees/{ref}", headers=headers)
+        requests_made += 1
+        if not isinstance(body, dict):
+            if not prefix:
+                return None
+            continue
+        level_files, dirs = tree_entries(body, prefix)
+        files.extend(level_files)
+        queue.extend(dirs)
+        if tree_signals_complete(files):
+            break
+    return files[:max_files]
+
+
+def get_repo_files(base: str, rd: Optional[Dict[str, Any]],
+                   headers: Dict[str, str]) -> Optional[List[str]]:
+    """File list of the repo at `base`, planned from its metadata `rd`."""
+    branches, paged = tree_plan(rd)
+    for branch in branches:
+        if paged:
+            files = _paged_tree_files(base, branch, headers)
+        else:
+            tree_body = cached_get_json(
+                f"{base}/git/trees/{branch}?recursive=1", headers=headers)
+            files = (tree_files(tree_body)
+                     if isinstance(tree_body, dict) else None)
+        if files is not None:
+            return files
+    return None
+
+
+def get_github_repo_data(code_url: str) -> Dict[str, Any]:
+    """Fetch GitHub repository metadata used by metrics (bus factor, etc.)."""
+    owner, repo = extract_repo_info(code_url)
+    if not owner or not repo:
+        return {}
+
+    headers = github_headers()
+    data = empty_repo_data()
+
     try:
-        repo_resp = safe_request(
-            f"https://api.github.com/repos/{owner}/{repo}", headers=headers)
-        if repo_resp:
-            rd = repo_resp.json()
-            data.update({
-                "stars": rd.get("stargazers_count", 0) or 0,
-                "forks": rd.get("forks_count", 0) or 0,
-                "created_at": rd.get("created_at"),
-                "updated_at": rd.get("updated_at"),
-                "license": (rd.get("license") or {}).get("spdx_id") if rd.get("license") else None,
-            })
-
-        contrib_resp = safe_request(
-            f"https://api.github.com/repos/{owner}/{repo}/contributors",
-            headers=headers)
-        if contrib_resp:
-            lst = contrib_resp.json()
-            if isinstance(lst, list) and lst:
-                total = sum(c.get("contributions", 0) for c in lst)
-                top = lst[0].get("contributions", 0) if total else 0
-                data["contributors"] = {
-                    "contributors_count": len(lst),
-                    "top_contributor_pct": (top / total) if total else 1.0,
-                    "total_contributions": total,
-                }
-
-        # try main then master
-        for branch in ("main", "master"):
-            tree_resp = safe_request(
-                f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1",
-                headers=headers,
-            )
-            if tree_resp and tree_resp.ok:
-                tree = tree_resp.json().get("tree", [])
-                data["files"] = [it["path"]
-                                 for it in tree if it.get("type") == "blob"]
-                break
+        base = f"https://api.github.com/repos/{owner}/{repo}"
+        rd = cached_get_json(base, headers=headers)
+        if rd:
+            data.update(repo_fields(rd))
+
+        data["contributors"] = get_contributor_stats(base, headers)
+
+        files = get_repo_files(base, rd if isinstance(rd, dict) else None,
+                               headers)
+        if files is not None:
+            data["files"] = files
     except Exception as e:
         logger.debug(f"Failed to fetch GitHub data: {e}")
 
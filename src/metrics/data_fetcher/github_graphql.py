@@ -0,0 +1,199 @@
+"""GitHub GraphQL batch fetcher.
+
+Collapses the repo and tree REST calls of many repositories into one
+aliased GraphQL query per batch. Each result has the same shape and
+contents as `get_github_repo_data`, so the aggregator and metrics are
+unchanged:
+- GraphQL has no contributors endpoint, so contributor stats still come
+  from REST /contributors (one cached request per repo);
+- the query expands the first `TREE_DEPTH` directory levels only; for
+  repos with deeper directories the file list is fetched via the REST
+  tree (`get_repo_files`), keeping the GraphQL metadata.
+
+GraphQL requires a token (env GITHUB_TOKEN); without one nothing is
+fetched and callers fall back to REST. Enable for batch runs with env
+GITHUB_FETCHER=graphql (or the CLI's --github-graphql).
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .env import env_int
+from .github import (empty_repo_data, get_contributor_stats, get_repo_files,
+                     github_headers)
+from .memo import FetchMemo, normalize_url
+from .utils import extract_repo_info, send_request
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.github_graphql")
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+TREE_DEPTH = 3
+
+
+def _tree_selection(depth: int) -> str:
+    inner = "path type"
+    for _ in range(depth - 1):
+        inner = f"path type object {{ ... on Tree {{ entries {{ {inner} }} }} }}"
+    return f"... on Tree {{ entries {{ {inner} }} }}"
+
+
+REPO_FRAGMENT = f"""
+fragment RepoFields on Repository {{
+  stargazerCount
+  forkCount
+  createdAt
+  updatedAt
+  licenseInfo {{ spdxId }}
+  diskUsage
+  defaultBranchRef {{ name }}
+  object(expression: "HEAD:") {{ {_tree_selection(TREE_DEPTH)} }}
+}}
+"""
+
+
+def graphql_enabled() -> bool:
+    return os.getenv("GITHUB_FETCHER", "rest").lower() == "graphql"
+
+
+def graphql_batch_size() -> int:
+    """Repos per GraphQL query (env GITHUB_GRAPHQL_BATCH, default 25)."""
+    return max(1, env_int("GITHUB_GRAPHQL_BATCH", 25))
+
+
+def build_query(repos: List[Tuple[str, str]]) -> Tuple[str, Dict[str, str]]:
+    """Aliased query `r0..rN` for (owner, name) pairs, plus its variables."""
+    params, fields, variables = [], [], {}
+    for i, (owner, name) in enumerate(repos):
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        fields.append(
+            f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+    query = (f"query({', '.join(params)}) {{\n  " + "\n  ".join(fields)
+             + "\n}\n" + REPO_FRAGMENT)
+    return query, variables
+
+
+def _flatten_tree(entries: Optional[List[Dict[str, Any]]]) -> List[str]:
+    files: List[str] = []
+    for entry in entries or []:
+        if entry.get("type") == "blob":
+            files.append(entry.get("path", ""))
+        sub = (entry.get("object") or {}).get("entries")
+        if sub:
+            files.extend(_flatten_tree(sub))
+    return files
+
+
+def tree_truncated(entries: Optional[List[Dict[str, Any]]]) -> bool:
+    """True if the tree has directories below the expanded `TREE_DEPTH` levels."""
+    for entry in entries or []:
+        if entry.get("type") != "tree":
+            continue
+        if "object" not in entry:
+            return True
+        if tree_truncated((entry.get("object") or {}).get("entries")):
+            return True
+    return False
+
+
+def repo_data_from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one `RepoFields` node to get_github_repo_data's shape.
+
+    Contributors are not part of the node and are left empty.
+    """
+    data = empty_repo_data()
+    data.update({
+        "stars": node.get("stargazerCount") or 0,
+        "forks": node.get("forkCount") or 0,
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "license": (node.get("licenseInfo") or {}).get("spdxId"),
+    })
+    data["files"] = _flatten_tree((node.get("object") or {}).get("entries"))
+    return data
+
+
+def _rest_fields(repo: Tuple[str, str], node: Dict[str, Any],
+                 headers: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Fields the query cannot supply, from REST as in get_github_repo_data:
+    contributor stats, and the file list when the tree is truncated.
+    """
+    owner, name = repo
+    base = f"https://api.github.com/repos/{owner}/{name}"
+    fields: Dict[str, Any] = {"contributors": {}}
+    try:
+        fields["contributors"] = get_contributor_stats(base, headers)
+        if tree_truncated((node.get("object") or {}).get("entries")):
+            rd = {"default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+                  "size": node.get("diskUsage")}
+            files = get_repo_files(base, rd, headers)
+            if files is not None:
+                fields["files"] = files
+    except Exception as e:
+        logger.debug(f"Failed to fetch REST fields for {owner}/{name}: {e}")
+    return fields
+
+
+def get_github_repos_data(code_urls: Iterable[str],
+                          batch_size: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch many repositories with `batch_size` repos per GraphQL request.
+
+    Returns {code_url: repo data} for the repos that resolved; missing or
+    failed repos are left out so callers can fall back to REST.
+    """
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        logger.debug("GITHUB_TOKEN not set; skipping GraphQL fetch")
+        return {}
+    if batch_size is None:
+        batch_size = graphql_batch_size()
+
+    by_repo: Dict[Tuple[str, str], List[str]] = {}
+    for url in code_urls:
+        owner, repo = extract_repo_info(url or "")
+        if owner and repo:
+            by_repo.setdefault((owner, repo), []).append(url)
+
+    repos = list(by_repo)
+    results: Dict[str, Dict[str, Any]] = {}
+    headers = {"Authorization": f"bearer {token}"}
+    rest_headers = github_headers()
+    for start in range(0, len(repos), max(1, batch_size)):
+        batch = repos[start:start + batch_size]
+        query, variables = build_query(batch)
+        try:
+            resp = send_request(
+                "post", GRAPHQL_URL, json={"query": query, "variables": variables},
+                headers=headers, timeout=30)
+            resp.raise_for_status()
+            payload = resp.json().get("data") or {}
+        except Exception as e:
+            logger.debug(f"GraphQL batch failed: {e}")
+            continue
+        nodes = {key: payload[f"r{i}"] for i, key in enumerate(batch)
+                 if payload.get(f"r{i}")}
+        if not nodes:
+            continue
+        with ThreadPoolExecutor(max_workers=min(8, len(nodes))) as pool:
+            rest = pool.map(lambda key: _rest_fields(key, nodes[key], rest_headers),
+                            list(nodes))
+            for (key, node), fields in zip(nodes.items(), rest):
+                data = repo_data_from_graphql(node)
+                data.update(fields)
+                for url in by_repo[key]:
+                    results[url] = data
+    return results
+
+
+def prime_memo(memo: FetchMemo, code_urls: Iterable[str]) -> int:
+    """Fetch `code_urls` via GraphQL and seed the run's GitHub memo."""
+    fetched = get_github_repos_data(code_urls)
+    for url, data in fetched.items():
+        memo.prime(("github", normalize_url(url)), data)
+    return len(fetched)
@@ -0,0 +1,128 @@
+"""Persistent response cache for GitHub REST calls.
+
+Bodies are stored with their ETag / Last-Modified headers and keyed by URL
+plus a hash of the Authorization header, so different tokens never share
+entries. Fresh entries (per-endpoint TTL) are served without any request;
+stale ones are revalidated with a conditional GET, and a 304 reply (which
+GitHub does not count against the rate limit) just refreshes the entry.
+
+Set env GITHUB_CACHE=off or call `github_cache.enabled = False` to bypass.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .disk_cache import DiskCache, is_fresh
+from .utils import safe_request
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.http_cache")
+
+# Seconds an entry is served without revalidation, per endpoint class
+GITHUB_TTLS: Dict[str, float] = {
+    "repo": 60 * 60,
+    "contributors": 6 * 60 * 60,
+    "tree": 24 * 60 * 60,
+    "default": 60 * 60,
+}
+
+github_cache = DiskCache("github")
+github_cache.enabled = os.getenv("GITHUB_CACHE", "on").lower() not in (
+    "0", "off", "false", "no")
+
+
+def endpoint_class(url: str) -> str:
+    """Map a GitHub API URL to a TTL class."""
+    if "/git/trees/" in url:
+        return "tree"
+    if url.rstrip("/").endswith("/contributors") or "/contributors?" in url:
+        return "contributors"
+    if "/repos/" in url:
+        return "repo"
+    return "default"
+
+
+def _auth_identity(headers: Optional[Dict[str, str]]) -> str:
+    auth = (headers or {}).get("Authorization", "")
+    if not auth:
+        return "anonymous"
+    return hashlib.sha256(auth.encode("utf-8")).hexdigest()[:16]
+
+
+def _header(resp: Any, name: str) -> Optional[str]:
+    try:
+        value = resp.headers.get(name)
+    except Exception:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def prepare_request(url: str, headers: Optional[Dict[str, str]] = None
+                    ) -> Tuple[str, Optional[Dict[str, Any]], bool, Dict[str, str]]:
+    """
+    Look `url` up in the cache.
+
+    Returns (key, entry, fresh, request_headers); `request_headers` carries
+    the conditional validators when a stale entry exists.
+    """
+    key = f"{url}\n{_auth_identity(headers)}"
+    ttl = GITHUB_TTLS.get(endpoint_class(url), GITHUB_TTLS["default"])
+    entry = github_cache.get(key, ttl)
+    fresh = entry is not None and is_fresh(entry, ttl)
+
+    req_headers = dict(headers or {})
+    if entry is not None and not fresh:
+        if entry.get("etag"):
+            req_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            req_headers["If-Modified-Since"] = entry["last_modified"]
+    return key, entry, fresh, req_headers
+
+
+def mark_revalidated(key: str, entry: Dict[str, Any]) -> Any:
+    """Refresh a stale entry after a 304 and return its body."""
+    entry["stored_at"] = time.time()
+    github_cache.set(key, entry)
+    return entry.get("body")
+
+
+def store(key: str, url: str, body: Any, etag: Optional[str],
+          last_modified: Optional[str]) -> None:
+    github_cache.set(key, {
+        "url": url,
+        "body": body,
+        "etag": etag if isinstance(etag, str) else None,
+        "last_modified": last_modified if isinstance(last_modified, str) else None,
+        "stored_at": time.time(),
+    })
+
+
+def cached_get_json(url: str, headers: Optional[Dict[str, str]] = None,
+                    timeout: int = 10) -> Optional[Any]:
+    """
+    GET `url` and return its parsed JSON body, using the on-disk cache.
+
+    Returns None on failure (like safe_request). A stale cached body is
+    returned when revalidation fails with a network error.
+    """
+    if not github_cache.enabled:
+        resp = safe_request(url, timeout=timeout, headers=headers or {})
+        return resp.json() if resp is not None else None
+
+    key, entry, fresh, req_headers = prepare_request(url, headers)
+    if fresh:
+        return entry.get("body")
+
+    resp = safe_request(url, timeout=timeout, headers=req_headers)
+    if resp is None:
+        return entry.get("body") if entry is not None else None
+
+    if resp.status_code == 304 and entry is not None:
+        return mark_revalidated(key, entry)
+
+    body = resp.json()
+    store(key, url, body, _header(resp, "ETag"), _header(resp, "Last-Modified"))
+    return body
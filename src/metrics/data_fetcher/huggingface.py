@@ -7,6 +7,42 @@ from src.logger import get_logger
 
 logger = get_logger("data_fetcher.huggingface")
 
+# Paths per get_paths_info request when sizes are looked up in batches
+PATHS_INFO_CHUNK_SIZE = 500
+
+
+def _total_size_from_siblings(info: Any) -> Optional[int]:
+    """Sum file sizes from `model_info(..., files_metadata=True)` siblings.
+
+    Returns None when the listing is missing or any size is unknown, so the
+    caller can fall back to a batched paths lookup.
+    """
+    siblings = getattr(info, "siblings", None)
+    if not isinstance(siblings, list) or not siblings:
+        return None
+    sizes = [getattr(s, "size", None) for s in siblings]
+    if any(size is None for size in sizes):
+        return None
+    return sum(int(size) for size in sizes)
+
+
+def _total_size_from_paths_info(api: Any, model_id: str) -> int:
+    """Sum file sizes with `get_paths_info` over chunks of repo paths."""
+    files = list(api.list_repo_files(model_id, repo_type="model"))
+    total_size = 0
+    for i in range(0, len(files), PATHS_INFO_CHUNK_SIZE):
+        chunk = files[i:i + PATHS_INFO_CHUNK_SIZE]
+        try:
+            infos = api.get_paths_info(model_id, chunk, repo_type="model")
+        except Exception as e:
+            logger.debug(f"get_paths_info failed for {model_id}: {e}")
+            continue
+        for fi in infos or []:
+            size = getattr(fi, "size", None)
+            if size:
+                total_size += int(size)
+    return total_size
+
 
 def get_huggingface_model_data(model_url: str) -> Dict[str, Any]:
     """Fetch HF model metadata via the Hub API."""
@@ -19,7 +55,7 @@ def get_huggingface_model_data(model_url: str) -> Dict[str, Any]:
         if not model_id:
             return {}
 
-        info = model_info(model_id)
+        info = model_info(model_id, files_metadata=True)
         api = HfApi()
 
         data: Dict[str, Any] = {
@@ -34,23 +70,13 @@ def get_huggingface_model_data(model_url: str) -> Dict[str, Any]:
         if data["card_data"]:
             data["license"] = data["card_data"].get("license", "")
 
-        # total size (best-effort)
-        total_size = 0
-        try:
-            files = api.list_repo_files(model_id, repo_type="model")
-            for fp in files:
-                try:
-                    fi = api.get_paths_info(model_id, fp, repo_type="model")
-                    if fi and len(fi) > 0:  # fi is a list
-                        # Get size from the first (and typically only) RepoFile
-                        # object
-                        size = fi[0].size
-                        if size:
-                            total_size += int(size)
-                except Exception:
-                    continue
-        except Exception:
-            pass
+        # total size (best-effort): one metadata call, batched fallback
+        total_size = _total_size_from_siblings(info)
+        if total_size is None:
+            try:
+                total_size = _total_size_from_paths_info(api, model_id)
+            except Exception:
+                total_size = 0
         data["total_size_bytes"] = total_size
         return data
     except Exception as e:
@@ -58,65 +84,158 @@ def get_huggingface_model_data(model_url: str) -> Dict[str, Any]:
         return {}
 
 
-def get_huggingface_dataset_data(dataset_url: str) -> Dict[str, Any]:
-    """Fetch HF dataset metadata via the Hub + datasets library (best-effort)."""
+def _features_text(features: Any) -> str:
+    """`name: dtype` pairs from card (list) or dataset_infos.json (dict) features."""
+    if isinstance(features, dict):
+        features = [{"name": name, **(spec if isinstance(spec, dict) else {})}
+                    for name, spec in features.items()]
+    if not isinstance(features, list):
+        return ""
+    parts = []
+    for feature in features:
+        if not isinstance(feature, dict) or not feature.get("name"):
+            continue
+        dtype = feature.get("dtype") or feature.get("_type")
+        if isinstance(dtype, dict):  # e.g. {"class_label": {"names": ...}}
+            dtype = next(iter(dtype), "struct")
+        if not dtype:
+            dtype = next((k for k in ("class_label", "sequence", "list")
+                          if k in feature), "struct")
+        parts.append(f"{feature['name']}: {dtype}")
+    return ", ".join(dict.fromkeys(parts))
+
+
+def _split_names(splits: Any) -> list:
+    if isinstance(splits, dict):
+        return list(splits)
+    if isinstance(splits, list):
+        return [s["name"] for s in splits if isinstance(s, dict) and s.get("name")]
+    return []
+
+
+def dataset_metadata(dataset_info: Any) -> Dict[str, Any]:
+    """Features, splits and description from `dataset_info` metadata.
+
+    Accepts the card YAML ``dataset_info`` (one config dict or a list of
+    them) and the ``dataset_infos.json`` layout (config name -> info).
+    Configs are merged; split names keep their first-seen order.
+    """
+    if isinstance(dataset_info, dict) and not any(
+            k in dataset_info for k in ("features", "splits", "config_name")):
+        configs = list(dataset_info.values())
+    elif isinstance(dataset_info, dict):
+        configs = [dataset_info]
+    else:
+        configs = dataset_info if isinstance(dataset_info, list) else []
+
+    features, splits, description = [], [], ""
+    for config in configs:
+        if not isinstance(config, dict):
+            continue
+        text = _features_text(config.get("features"))
+        if text:
+            features.append(text)
+        splits.extend(_split_names(config.get("splits")))
+        description = description or (config.get("description") or "").strip()
+    return {
+        "features": "; ".join(dict.fromkeys(features)),
+        "splits": list(dict.fromkeys(splits)),
+        "description": description,
+    }
+
+
+def dataset_data_from_api(js: Dict[str, Any], dataset_id: str) -> Dict[str, Any]:
+    """Map a /api/datasets/{id} response to get_huggingface_dataset_data's shape."""
+    card_data = js.get("cardData") or {}
+    data: Dict[str, Any] = {
+        "license": card_data.get("license", "") if card_data else None,
+        "card_data": card_data,
+        "tags": js.get("tags") or [],
+        "downloads": js.get("downloads") or 0,
+        "dataset_id": js.get("id") or dataset_id,
+        "sha": js.get("sha"),
+    }
+    data.update(dataset_metadata(card_data.get("dataset_info")))
+    if not data["description"]:
+        data["description"] = (js.get("description") or "").strip()
+    return data
+
+
+def dataset_infos_fallback(data: Dict[str, Any], dataset_id: str) -> Dict[str, Any]:
+    """Fill missing features/splits from the repo's ``dataset_infos.json``.
+
+    Only older script-based datasets ship the file; it goes through the
+    artifact cache, so repeated runs read it from disk.
+    """
+    if data.get("features") and data.get("splits"):
+        return data
+    import json
+
+    from .artifacts import read_artifact
+
     try:
-        from huggingface_hub import dataset_info
-        from datasets import load_dataset_builder
+        content = read_artifact(dataset_id, "dataset_infos.json",
+                                revision=data.get("sha") or "main",
+                                repo_type="dataset")
+        if not content:
+            return data
+        meta = dataset_metadata(json.loads(content.decode("utf-8")))
+    except Exception as e:
+        logger.debug(f"No dataset_infos.json metadata for {dataset_id}: {e}")
+        return data
+    for key in ("features", "splits", "description"):
+        if not data.get(key):
+            data[key] = meta[key]
+    return data
 
-        from .utils import extract_hf_model_id
+
+def get_huggingface_dataset_data(dataset_url: str) -> Dict[str, Any]:
+    """Fetch HF dataset metadata from the Hub API (best-effort).
+
+    Features, splits and description come from the card's ``dataset_info``
+    block, falling back to ``dataset_infos.json``; no dataset builder is
+    loaded, so nothing is imported or executed from the dataset repo.
+    """
+    try:
+        from .utils import extract_hf_model_id, hf_headers, safe_request
 
         dataset_id = extract_hf_model_id(dataset_url)
         if not dataset_id:
             return {}
 
-        info = dataset_info(dataset_id)
-        data: Dict[str, Any] = {
-            "license": None,
-            "card_data": getattr(info, "cardData", {}) or {},
-            "tags": getattr(info, "tags", []) or [],
-            "downloads": getattr(info, "downloads", 0) or 0,
-        }
-        if data["card_data"]:
-            data["license"] = data["card_data"].get("license", "")
-
-        try:
-            builder = load_dataset_builder(dataset_id)
-            data["features"] = str(getattr(builder.info, "features", "") or "")
-            data["splits"] = list(
-                getattr(
-                    builder.info,
-                    "splits",
-                    {}).keys()) if getattr(
-                builder.info,
-                "splits",
-                None) else []
-            data["description"] = getattr(
-                builder.info, "description", "") or ""
-        except Exception as e:
-            logger.debug(f"Could not load dataset builder: {e}")
-            data["features"], data["splits"], data["description"] = "", [], ""
-        return data
+        headers = hf_headers()
+        resp = safe_request(f"https://huggingface.co/api/datasets/{dataset_id}",
+                            timeout=15, headers=headers)
+        js = resp.json() if resp is not None else None
+        if not isinstance(js, dict):
+            return {}
+        return dataset_infos_fallback(dataset_data_from_api(js, dataset_id),
+                                      dataset_id)
     except Exception as e:
         logger.debug(f"Failed to fetch HF dataset data: {e}")
         return {}
 
 
-def get_huggingface_file(model_url: str):
-    from src.metrics.data_fetcher import extract_hf_model_id
+def get_huggingface_file(model_url: str, file_name: str = "README.md"):
+    """Local path of a model repo file, via the shared artifact cache."""
+    from .artifacts import model_file
 
-    repo_id = extract_hf_model_id(model_url)
-    file_name = "README.md"  # or "config.json", etc.
-    if not repo_id:
-        return None
     try:
-        from huggingface_hub import hf_hub_download
-        local_file_path = hf_hub_download(
-            repo_id=repo_id,
-            filename=file_name,
-            cache_dir="./hf_cache")
+        return model_file(model_url, file_name)
     except Exception as e:
-        logger.debug(f"Failed to download {file_name} from {repo_id}: {e}")
+        logger.debug(f"Failed to fetch {file_name} for {model_url}: {e}")
         return None
 
-    return local_file_path
+
+def get_model_card(model_url: str) -> str:
+    """README / model card text of a HF model, or "" if unavailable."""
+    from .artifacts import read_artifact
+    from .utils import extract_hf_model_id
+
+    try:
+        repo_id = extract_hf_model_id(model_url)
+        content = read_artifact(repo_id, "README.md") if repo_id else None
+        return content.decode("utf-8", errors="replace") if content else ""
+    except Exception as e:
+        logger.debug(f"Unreadable model card for {model_url}: {e}")
+        return ""
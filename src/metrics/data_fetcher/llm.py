@@ -6,11 +6,11 @@ endpoint (used by a teammate prototype) and return a metric string.
 from __future__ import annotations
 
 import os
-import requests
 import logging
 import sys
-from typing import Dict, Any
+from typing import Any, Dict, Tuple
 from src.logger import get_logger
+from .llm_cache import cached_post_json
 
 logger = get_logger("data_fetcher.llm")
 
@@ -20,16 +20,9 @@ PURDUE_GENAI_URL = os.getenv(
     "GEN_AI_STUDIO_URL", "https://genai.rcac.purdue.edu/api/chat/completions")
 
 
-def get_genai_metric_data(model_url: str, prompt: str) -> Dict[str, Any]:
-    """Call a GenAI endpoint with a prompt + model_url and return the parsed metric.
-
-    Returns a dict with at least 'metric' (string) on success, otherwise an empty dict.
-    This keeps the shape similar to other data_fetcher helpers.
-    """
-    if not PURDUE_GENAI_API_KEY:
-        logger.debug("GEN AI API key not set; skipping GenAI call")
-        return {}
-
+def genai_request(model_url: str,
+                  prompt: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Headers and JSON body of the chat completion for `prompt`."""
     headers = {
         "Authorization": f"Bearer {PURDUE_GENAI_API_KEY}",
         "Content-Type": "application/json",
@@ -40,15 +33,39 @@ def get_genai_metric_data(model_url: str, prompt: str) -> Dict[str, Any]:
             {"role": "user", "content": prompt + " " + model_url}
         ],
     }
+    return headers, body
+
+
+def parse_metric(data: Dict[str, Any]) -> str:
+    """Message text of a chat completion response."""
+    return data.get("choices", [{}])[0].get(
+        "message", {}).get("content", "").strip()
+
+
+def get_genai_metric_data(model_url: str, prompt: str) -> Dict[str, Any]:
+    """Call a GenAI endpoint with a prompt + model_url and return the parsed metric.
+
+    Returns a dict with at least 'metric' (string) on success, otherwise an empty dict.
+    This keeps the shape similar to other data_fetcher helpers. With env
+    LLM_BATCH=on the request is answered through a batched multi-URL prompt.
+    """
+    if not PURDUE_GENAI_API_KEY:
+        logger.debug("GEN AI API key not set; skipping GenAI call")
+        return {}
+
+    from . import llm_batch
+    if llm_batch.batching_enabled():
+        return llm_batch.get_metric(model_url, prompt)
+    return single_genai_metric_data(model_url, prompt)
+
+
+def single_genai_metric_data(model_url: str, prompt: str) -> Dict[str, Any]:
+    """One chat completion for one URL (the unbatched path)."""
+    headers, body = genai_request(model_url, prompt)
 
     try:
-        resp = requests.post(
-            PURDUE_GENAI_URL, headers=headers, json=body, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-        metric = data.get("choices", [{}])[0].get(
-            "message", {}).get("content", "").strip()
-        return {"metric": metric}
+        data = cached_post_json(PURDUE_GENAI_URL, headers, body, timeout=20)
+        return {"metric": parse_metric(data)}
     except Exception as e:
         logger.debug(f"GenAI call failed: {e}")
         return {}
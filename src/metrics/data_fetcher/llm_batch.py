@@ -0,0 +1,242 @@
+"""Batched multi-URL GenAI scoring.
+
+With env LLM_BATCH=on (or the CLI's --llm-batch), `get_genai_metric_data`
+no longer sends one chat completion per URL. Requests that share a prompt
+are queued in an `LLMBatcher`, and one structured prompt asks for a JSON
+array of per-URL scores. A batch is flushed when it reaches env
+LLM_BATCH_SIZE URLs (default 20) or LLM_BATCH_WINDOW seconds (default
+0.2) after its first URL arrives. Batches are sent on a small pool of
+sender threads (env LLM_BATCH_SENDERS, default 4), so queueing a URL never
+waits for a GenAI round-trip.
+
+URLs that are missing from the parsed reply (or every URL, if the reply
+does not parse) fall back to the single-URL call. Per-URL answers are
+written to the LLM response cache under the single-URL key, so a later
+run (batched or not) reuses them.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import llm, llm_cache
+from .env import env_float
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.llm_batch")
+
+BATCH_INSTRUCTIONS = (
+    "\n\nScore each of the URLs below independently, ignoring the "
+    "single-number reply format requested above. Reply with only a JSON "
+    "array containing one object per URL, in the same order, of the form "
+    '{"url": "<url>", "score": <number between 0.0 and 1.0>}.\nURLs:'
+)
+
+_JSON_ARRAY = re.compile(r"\[.*\]", re.DOTALL)
+
+
+_sender: Optional[ThreadPoolExecutor] = None
+_sender_lock = threading.Lock()
+
+
+def _sender_pool() -> ThreadPoolExecutor:
+    """Threads that send full batches off the submitting thread."""
+    global _sender
+    with _sender_lock:
+        if _sender is None:
+            _sender = ThreadPoolExecutor(
+                max_workers=max(1, int(env_float("LLM_BATCH_SENDERS", 4))),
+                thread_name_prefix="llm-batch")
+        return _sender
+
+
+def batching_enabled() -> bool:
+    return os.getenv("LLM_BATCH", "off").lower() in ("1", "on", "true", "yes")
+
+
+def batch_size() -> int:
+    """URLs per batched request (env LLM_BATCH_SIZE, default 20)."""
+    return max(1, int(env_float("LLM_BATCH_SIZE", 20)))
+
+
+def build_batch_request(prompt: str, urls: List[str]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Headers and body of one chat completion scoring all of `urls`."""
+    return llm.genai_request("\n".join(urls), prompt + BATCH_INSTRUCTIONS)
+
+
+def parse_batch_scores(text: str, urls: List[str]) -> Dict[str, str]:
+    """
+    Map each URL to its score string from a JSON-array reply.
+
+    Objects are matched by their "url" field; a bare list of numbers is
+    matched by position when its length equals len(urls).
+    """
+    m = _JSON_ARRAY.search(text or "")
+    if not m:
+        return {}
+    try:
+        items = json.loads(m.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+    wanted = set(urls)
+    scores: Dict[str, str] = {}
+    positional = len(items) == len(urls)
+    for i, item in enumerate(items):
+        if isinstance(item, dict):
+            url, score = item.get("url"), item.get("score")
+            if url not in wanted and positional:
+                url = urls[i]
+        elif positional:
+            url, score = urls[i], item
+        else:
+            continue
+        if url in wanted and isinstance(score, (int, float)) and not isinstance(score, bool):
+            scores[url] = str(score)
+    return scores
+
+
+def _single_response(content: str) -> Dict[str, Any]:
+    return {"choices": [{"message": {"content": content}}]}
+
+
+class LLMBatcher:
+    """Queues URLs for one prompt and scores them in batched requests."""
+
+    def __init__(self, prompt: str, max_batch: Optional[int] = None,
+                 window: Optional[float] = None) -> None:
+        self.prompt = prompt
+        self.max_batch = max(1, int(max_batch or batch_size()))
+        self.window = window if window is not None else env_float(
+            "LLM_BATCH_WINDOW", 0.2)
+        self._pending: List[Tuple[str, "Future[Dict[str, Any]]"]] = []
+        self._futures: Dict[str, "Future[Dict[str, Any]]"] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def submit(self, url: str) -> "Future[Dict[str, Any]]":
+        """Future for `url`'s {"metric": ...} result (shared per URL).
+
+        Never blocks on the GenAI call: a full batch is handed to the
+        sender threads.
+        """
+        full: List[Tuple[str, "Future[Dict[str, Any]]"]] = []
+        with self._lock:
+            fut = self._futures.get(url)
+            if fut is not None:
+                return fut
+            fut = Future()
+            self._futures[url] = fut
+            _, body = llm.genai_request(url, self.prompt)
+            cached = llm_cache.lookup(llm.PURDUE_GENAI_URL, body)
+            if cached is not None:
+                fut.set_result({"metric": llm.parse_metric(cached)})
+                return fut
+            self._pending.append((url, fut))
+            if len(self._pending) >= self.max_batch:
+                full = self._take_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            _sender_pool().submit(self._send_all, full)
+        return fut
+
+    def _take_pending(self) -> List[Tuple[str, "Future[Dict[str, Any]]"]]:
+        """Detach the queue and cancel its timer; the caller holds the lock."""
+        pending, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return pending
+
+    def flush(self) -> None:
+        """Send every queued URL now (in batches of max_batch)."""
+        with self._lock:
+            pending = self._take_pending()
+        self._send_all(pending)
+
+    def _send_all(self, pending: List[Tuple[str, "Future[Dict[str, Any]]"]]) -> None:
+        for start in range(0, len(pending), self.max_batch):
+            self._send(pending[start:start + self.max_batch])
+
+    def _send(self, batch: List[Tuple[str, "Future[Dict[str, Any]]"]]) -> None:
+        urls = [url for url, _ in batch]
+        scores: Dict[str, str] = {}
+        try:
+            headers, body = build_batch_request(self.prompt, urls)
+            data = llm_cache.cached_post_json(
+                llm.PURDUE_GENAI_URL, headers, body, timeout=60)
+            scores = parse_batch_scores(llm.parse_metric(data), urls)
+        except Exception as e:
+            logger.debug(f"Batched GenAI call failed: {e}")
+        if len(scores) < len(urls):
+            logger.debug("Batch reply covered %d of %d URLs; falling back",
+                         len(scores), len(urls))
+        for url, fut in batch:
+            try:
+                if url in scores:
+                    _, single = llm.genai_request(url, self.prompt)
+                    llm_cache.remember(llm.PURDUE_GENAI_URL, single,
+                                       _single_response(scores[url]))
+                    fut.set_result({"metric": scores[url]})
+                else:
+                    fut.set_result(llm.single_genai_metric_data(url, self.prompt))
+            except Exception as e:
+                logger.debug(f"GenAI fallback failed for {url}: {e}")
+                fut.set_result({})
+
+
+_batchers: Dict[str, LLMBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def batcher_for(prompt: str) -> LLMBatcher:
+    with _batchers_lock:
+        b = _batchers.get(prompt)
+        if b is None:
+            b = _batchers[prompt] = LLMBatcher(prompt)
+        return b
+
+
+def submit(url: str, prompt: str) -> "Future[Dict[str, Any]]":
+    """Queue `url` for `prompt` without waiting (used to pre-fill batches)."""
+    return batcher_for(prompt).submit(url)
+
+
+def get_metric(url: str, prompt: str, timeout: float = 120.0) -> Dict[str, Any]:
+    """Batched counterpart of get_genai_metric_data.
+
+    If the batch does not answer within `timeout` seconds, the URL is
+    scored with the single-URL call instead of being left without a score.
+    """
+    try:
+        return submit(url, prompt).result(timeout=timeout)
+    except FutureTimeout:
+        logger.warning("Batched GenAI request for %s timed out after %.0fs; "
+                       "falling back to a single call", url, timeout)
+    except Exception as e:
+        logger.warning("Batched GenAI request for %s failed (%s); "
+                       "falling back to a single call", url, e)
+    return llm.single_genai_metric_data(url, prompt)
+
+
+def flush_all() -> None:
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+    for b in batchers:
+        b.flush()
+
+
+def reset() -> None:
+    """Flush outstanding work and forget per-URL futures (end of a run)."""
+    flush_all()
+    with _batchers_lock:
+        _batchers.clear()
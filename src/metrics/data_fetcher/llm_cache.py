@@ -0,0 +1,86 @@
+"""Persistent cache for GenAI chat completion responses.
+
+Entries are keyed by endpoint, model, temperature and the full message
+list, so changing any of them (or the prompt text) never reuses an old
+answer. Entries expire after env LLM_CACHE_TTL seconds (default 7 days)
+and the namespace is size-capped by env LLM_CACHE_MAX_BYTES with LRU
+eviction. Only successful responses with non-empty message content are
+stored, so a malformed or blank answer is asked again next time.
+
+Set env LLM_CACHE=off or call `llm_cache.enabled = False` to bypass.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from .disk_cache import DiskCache, is_fresh
+from .env import env_float
+from .utils import send_request
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.llm_cache")
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+llm_cache = DiskCache("llm", default_max_bytes=64 * 1024 * 1024)
+llm_cache.enabled = os.getenv("LLM_CACHE", "on").lower() not in (
+    "0", "off", "false", "no")
+
+
+def cache_ttl() -> float:
+    return env_float("LLM_CACHE_TTL", DEFAULT_TTL)
+
+
+def cache_key(url: str, body: Dict[str, Any]) -> str:
+    """Key for a chat completion request; headers (the API key) are excluded."""
+    return json.dumps({
+        "url": url,
+        "model": body.get("model"),
+        "temperature": body.get("temperature"),
+        "messages": body.get("messages"),
+    }, sort_keys=True)
+
+
+def lookup(url: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Cached response JSON for this request, if present and within TTL."""
+    ttl = cache_ttl()
+    entry = llm_cache.get(cache_key(url, body), ttl)
+    if entry is not None and is_fresh(entry, ttl):
+        return entry.get("response")
+    return None
+
+
+def _has_content(response: Dict[str, Any]) -> bool:
+    try:
+        return bool(response["choices"][0]["message"]["content"].strip())
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return False
+
+
+def remember(url: str, body: Dict[str, Any], response: Dict[str, Any]) -> None:
+    if not _has_content(response):
+        return
+    llm_cache.set(cache_key(url, body), {
+        "response": response,
+        "stored_at": time.time(),
+    })
+
+
+def cached_post_json(url: str, headers: Dict[str, str], body: Dict[str, Any],
+                     timeout: int = 20) -> Dict[str, Any]:
+    """
+    POST a chat completion and return its JSON, answering from the cache
+    when possible. Request errors propagate to the caller.
+    """
+    cached = lookup(url, body)
+    if cached is not None:
+        return cached
+    resp = send_request("post", url, headers=headers, json=body, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json()
+    if isinstance(data, dict):
+        remember(url, body, data)
+    return data
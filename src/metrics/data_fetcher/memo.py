@@ -0,0 +1,181 @@
+"""Per-run memoization of source fetches shared across input rows.
+
+Inside a `batch_scope()` every `memoized(source, url, fn, ...)` call is
+keyed on (source, normalized URL): the first caller runs `fn`, concurrent
+callers for the same key wait for that result instead of issuing their own
+request (single-flight), and later rows reuse it. Outside a batch scope
+`memoized` simply calls `fn`, so one-off calls always hit the network.
+
+A scope can span a whole streamed run, so the memo is bounded: at most env
+FETCH_MEMO_MAX_ENTRIES (default 2048) finished results are kept, least
+recently used first out; fetches still in flight are never evicted.
+Failures are not kept either, whether the fetcher raised or returned its
+empty "nothing fetched" result (None or {}), so a later row retries them.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from .env import env_int
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.memo")
+
+
+def max_entries() -> int:
+    return max(1, env_int("FETCH_MEMO_MAX_ENTRIES", 2048))
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as memo key (host + repo path, no query/slash).
+
+    Only GitHub and Hugging Face URLs are normalized; any other URL is
+    returned as given, since its path and query may both matter.
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except Exception:
+        return url
+    host = (parsed.netloc or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host not in ("github.com", "huggingface.co"):
+        return url.strip()
+    parts = [p for p in parsed.path.split("/") if p]
+    if parts and parts[-1].endswith(".git"):
+        parts[-1] = parts[-1][:-4]
+    if host == "github.com":
+        parts = parts[:2]
+    elif host == "huggingface.co":
+        parts = parts[:3] if parts and parts[0] in ("datasets", "spaces") \
+            else parts[:2]
+    parts = [p.lower() for p in parts]
+    return f"{host}/{'/'.join(parts)}"
+
+
+def is_failure(value: Any) -> bool:
+    """True for a fetcher's empty "nothing fetched" result (None or {})."""
+    return value is None or (isinstance(value, dict) and not value)
+
+
+class FetchMemo:
+    """Thread-safe, size-bounded single-flight result store for one run."""
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[Tuple[str, str], Future]" = OrderedDict()
+        self.max_size = max_size or max_entries()
+        self.hits = 0
+        self.misses = 0
+
+    def call(self, key: Tuple[str, str], fn: Callable[..., Any],
+             *args: Any) -> Any:
+        with self._lock:
+            fut = self._results.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._results[key] = fut
+                self.misses += 1
+            else:
+                self._results.move_to_end(key)
+                self.hits += 1
+        if owner:
+            try:
+                value = fn(*args)
+            except BaseException as e:
+                # concurrent waiters see the error; later rows retry
+                self._forget(key, fut)
+                fut.set_exception(e)
+            else:
+                if is_failure(value):
+                    self._forget(key, fut)
+                fut.set_result(value)
+                self._evict()
+        return fut.result()
+
+    def _forget(self, key: Tuple[str, str], fut: Future) -> None:
+        with self._lock:
+            if self._results.get(key) is fut:
+                del self._results[key]
+
+    def _evict(self) -> None:
+        """Drop least recently used finished results beyond max_size."""
+        with self._lock:
+            excess = len(self._results) - self.max_size
+            if excess <= 0:
+                return
+            done = (k for k, f in self._results.items() if f.done())
+            for key in list(islice(done, excess)):
+                del self._results[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def prime(self, key: Tuple[str, str], value: Any) -> None:
+        """Seed a result fetched elsewhere (e.g. a batched query)."""
+        fut: Future = Future()
+        fut.set_result(value)
+        with self._lock:
+            self._results.setdefault(key, fut)
+        self._evict()
+
+
+_active: Optional[FetchMemo] = None
+_depth = 0
+_scope_lock = threading.Lock()
+
+
+def active_memo() -> Optional[FetchMemo]:
+    return _active
+
+
+@contextmanager
+def batch_scope() -> Iterator[FetchMemo]:
+    """Share fetch results across all rows evaluated inside the block."""
+    global _active, _depth
+    with _scope_lock:
+        if _active is None:
+            _active = FetchMemo()
+        _depth += 1
+        memo = _active
+    try:
+        yield memo
+    finally:
+        with _scope_lock:
+            _depth -= 1
+            if _depth == 0:
+                logger.info("Fetch memo: %d hits, %d misses",
+                            memo.hits, memo.misses)
+                _active = None
+
+
+def install_process_memo() -> FetchMemo:
+    """Keep a memo active for the rest of this process (pool workers).
+
+    Process-pool workers evaluate rows one call at a time, outside any
+    scope the parent opened; this gives each worker one memo shared by
+    every row it evaluates.
+    """
+    global _active, _depth
+    with _scope_lock:
+        if _active is None:
+            _active = FetchMemo()
+        _depth += 1
+        return _active
+
+
+def memoized(source: str, url: str, fn: Callable[..., Any],
+             *args: Any) -> Any:
+    """Call `fn(*args)` once per (source, url) within the active batch."""
+    memo = _active
+    if memo is None or not url:
+        return fn(*args)
+    return memo.call((source, normalize_url(url)), fn, *args)
@@ -0,0 +1,189 @@
+"""Rate-limit-aware request scheduling shared by all outgoing HTTP calls.
+
+Each host gets a token bucket (env HTTP_RATE_PER_HOST requests/second,
+HTTP_BURST_PER_HOST burst). Responses feed quota headers back in:
+
+- ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` (GitHub) and the
+  ``RateLimit: "api";r=<remaining>;t=<seconds>`` header (Hugging Face):
+  once fewer than RATE_LIMIT_LOW_WATER (a fraction, default 0.1) of the
+  quota (``X-RateLimit-Limit`` / ``RateLimit-Policy`` ``q=``) is left, the
+  host's bucket slows down so the rest lasts until reset, and it pauses
+  once exhausted. Without a known quota size the mark is an absolute
+  RATE_LIMIT_LOW_WATER_REQUESTS (default 20) remaining requests;
+- ``Retry-After`` pauses the host for the given number of seconds.
+
+`observe` tells the caller how long to wait before retrying a rejected
+(429, or 403 with an exhausted quota) request; waits are jittered and
+capped by env RATE_LIMIT_MAX_WAIT seconds.
+"""
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from .env import env_float
+from src.logger import get_logger
+
+logger = get_logger("data_fetcher.rate_limit")
+
+_HF_RATELIMIT = re.compile(r"r=(\d+).*?t=(\d+)")
+_HF_POLICY = re.compile(r"q=(\d+)")
+
+
+class TokenBucket:
+    """Per-host pacing (GCRA) with an optional pause window."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.default_rate = rate
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tat = 0.0           # theoretical arrival time
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next slot; returns seconds the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            interval = 1.0 / self.rate
+            tolerance = (self.burst - 1) * interval
+            tat = max(self._tat, start)
+            delay = max(0.0, tat - start - tolerance) + (start - now)
+            self._tat = tat + interval
+            return delay
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: Optional[float]) -> None:
+        with self._lock:
+            self.rate = self.default_rate if rate is None else max(
+                0.01, min(rate, self.default_rate))
+
+
+def _header(resp: Any, name: str) -> Optional[str]:
+    try:
+        value = resp.headers.get(name)
+    except Exception:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def _quota_limit(resp: Any) -> Optional[int]:
+    """Size of the quota window, if the response announces it."""
+    limit = _header(resp, "X-RateLimit-Limit")
+    if limit is None:
+        policy = _header(resp, "RateLimit-Policy")
+        m = _HF_POLICY.search(policy) if policy else None
+        limit = m.group(1) if m else None
+    try:
+        return int(limit) if limit is not None else None
+    except ValueError:
+        return None
+
+
+def _quota(resp: Any) -> Tuple[Optional[int], Optional[float]]:
+    """(remaining requests, seconds until reset) from the response headers."""
+    remaining = _header(resp, "X-RateLimit-Remaining")
+    reset = _header(resp, "X-RateLimit-Reset")
+    if remaining is not None:
+        try:
+            left = int(remaining)
+            secs = float(reset) - time.time() if reset is not None else None
+            return left, secs
+        except ValueError:
+            return None, None
+    draft = _header(resp, "RateLimit")
+    if draft:
+        m = _HF_RATELIMIT.search(draft)
+        if m:
+            return int(m.group(1)), float(m.group(2))
+    return None, None
+
+
+class RateLimitScheduler:
+    """Holds one TokenBucket per host and interprets quota headers."""
+
+    def __init__(self) -> None:
+        self.rate = env_float("HTTP_RATE_PER_HOST", 20.0)
+        self.burst = env_float("HTTP_BURST_PER_HOST", 20.0)
+        self.max_wait = env_float("RATE_LIMIT_MAX_WAIT", 900.0)
+        self.max_retries = int(env_float("RATE_LIMIT_RETRIES", 5))
+        self.low_water = env_float("RATE_LIMIT_LOW_WATER", 0.1)
+        self.low_water_requests = env_float("RATE_LIMIT_LOW_WATER_REQUESTS", 20)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = (urlparse(url).netloc or "").lower()
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return b
+
+    def reserve(self, url: str) -> float:
+        """Seconds to wait before sending a request to `url`'s host."""
+        return self.bucket(url).reserve()
+
+    def low_water_mark(self, limit: Optional[int]) -> float:
+        """Remaining requests below which a host's quota is stretched."""
+        if limit is None or limit <= 0:
+            return self.low_water_requests
+        return max(1.0, self.low_water * limit)
+
+    def backoff(self, attempt: int, hint: Optional[float] = None) -> float:
+        """Jittered wait for retry number `attempt` (0-based)."""
+        base = hint if hint is not None else min(60.0, 2.0 ** attempt)
+        return min(self.max_wait, base + random.uniform(0, 0.25 * base + 0.1))
+
+    def observe(self, url: str, resp: Any, attempt: int = 0) -> Optional[float]:
+        """
+        Update pacing from `resp`; if it was rate-limited, return the wait
+        before a retry (None means do not retry).
+        """
+        b = self.bucket(url)
+        remaining, reset_in = _quota(resp)
+        if remaining is not None:
+            if remaining <= 0 and reset_in is not None:
+                b.pause(max(0.0, reset_in))
+            elif (remaining < self.low_water_mark(_quota_limit(resp))
+                  and reset_in is not None and reset_in > 0):
+                # stretch what is left of the quota until it resets
+                b.set_rate(remaining / reset_in)
+            else:
+                b.set_rate(None)
+
+        status = getattr(resp, "status_code", None)
+        retry_after = _header(resp, "Retry-After")
+        limited = status == 429 or (status == 403 and (
+            remaining == 0 or retry_after is not None))
+        if not limited or attempt >= self.max_retries:
+            return None
+
+        hint: Optional[float] = None
+        if retry_after is not None:
+            try:
+                hint = float(retry_after)
+            except ValueError:
+                hint = None
+        elif remaining == 0 and reset_in is not None:
+            hint = max(0.0, reset_in)
+        if hint is not None and hint > self.max_wait:
+            logger.warning("Rate limit on %s resets in %.0fs; giving up",
+                           url, hint)
+            return None
+        wait = self.backoff(attempt, hint)
+        b.pause(wait)
+        logger.info("Rate limited on %s; retrying in %.1fs", url, wait)
+        return wait
+
+
+scheduler = RateLimitScheduler()
@@ -2,20 +2,91 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
+import time
 from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 from src.logger import get_logger
+from .env import env_int
+from .memo import memoized
+from .rate_limit import scheduler
 
 logger = get_logger("data_fetcher.utils")
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def github_headers() -> Dict[str, str]:
+    token = os.getenv("GITHUB_TOKEN")
+    return {"Authorization": f"token {token}"} if token else {}
+
+
+def hf_headers() -> Dict[str, str]:
+    token = os.getenv("HF_TOKEN")
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide pooled HTTP session.
+
+    Connections are kept alive and reused across calls. Pool sizing comes
+    from env HTTP_POOL_CONNECTIONS (hosts kept, default 10) and
+    HTTP_POOL_MAXSIZE (connections per host, default 32).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            adapter = HTTPAdapter(
+                pool_connections=env_int("HTTP_POOL_CONNECTIONS", 10),
+                pool_maxsize=env_int("HTTP_POOL_MAXSIZE", 32),
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def reset_session() -> None:
+    """Close the pooled session; the next get_session() builds a new one."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def send_request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """
+    Send `method` ("get", "head", "post") through the pooled session.
+
+    Requests are paced per host by the rate-limit scheduler, and responses
+    rejected for rate limiting are retried after a jittered backoff.
+    """
+    attempt = 0
+    while True:
+        delay = scheduler.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        resp = getattr(get_session(), method)(url, **kwargs)
+        wait = scheduler.observe(url, resp, attempt)
+        if wait is None:
+            return resp
+        time.sleep(wait)
+        attempt += 1
+
 
 def safe_request(url: str, timeout: int = 10, **
                  kwargs) -> Optional[requests.Response]:
     """Make a safe HTTP GET request with error handling."""
     try:
-        resp = requests.get(url, timeout=timeout, **kwargs)
+        resp = send_request("get", url, timeout=timeout, **kwargs)
         resp.raise_for_status()
         return resp
     except Exception as e:
@@ -69,6 +140,11 @@ def extract_hf_model_id(hf_url: str) -> Optional[str]:
     return None
 
 
+def _url_ok(url: str) -> bool:
+    r = send_request("head", url, timeout=10, allow_redirects=True)
+    return r.status_code in (200, 301, 302)
+
+
 def check_availability(code_url: str, dataset_url: str,
                        model_url: str) -> Dict[str, Any]:
     """HEAD the URLs and report availability of each and overall links_ok."""
@@ -79,8 +155,7 @@ def check_availability(code_url: str, dataset_url: str,
     for name, url in urls:
         if url and url.strip():
             try:
-                r = requests.head(url, timeout=10, allow_redirects=True)
-                good = r.status_code in (200, 301, 302)
+                good = memoized("head", url, _url_ok, url)
                 results[f"has_{name}"] = good
                 ok += int(good)
             except Exception as e:
@@ -10,6 +10,7 @@ class AvailabilityMetric:
     Expect booleans in context['availability']: {"has_code": bool, "has_dataset": bool, "links_ok": bool}
     """
     id = "availability"
+    requires = ("availability",)
 
     def compute(self, context: Dict[str, Any]) -> MetricResult:
         """Compute availability metric based on link availability data."""
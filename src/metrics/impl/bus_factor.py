@@ -5,6 +5,23 @@ from ..types import MetricResult
 from ..data_fetcher import get_genai_metric_data
 
 
+PROMPT = """Analyze the bus factor for this model/repository by examining READMEs, documentation, and contributor distribution.
+
+Bus factor measures how well knowledge and contributions are distributed:
+- High bus factor (closer to 1.0) = Knowledge is well-distributed, good documentation, builds on established research
+- Low bus factor (closer to 0.0) = Knowledge is concentrated, poor documentation, requires specialized knowledge
+
+Consider:
+1. How well the README/documentation references existing research
+2. Whether the approach builds on established methods
+3. How accessible the knowledge is to new contributors
+4. Documentation quality and completeness
+5. Overlap with well-known techniques and papers
+
+Return only a decimal number between 0.0 and 1.0 representing bus factor score.
+URL:"""
+
+
 class BusFactorMetric:
     """
     Evaluate bus factor (contribution distribution) using GenAI LLM analysis.
@@ -16,6 +33,12 @@ class BusFactorMetric:
     traditional bus factor interpretation.
     """
     id = "bus_factor"
+    requires = ("repo_meta",)
+    llm_prompt = PROMPT
+
+    def llm_target(self, context: Dict[str, Any]) -> str:
+        """URL sent to the LLM: the model URL, else the code URL."""
+        return context.get("model_url", "") or context.get("code_url", "")
 
     def compute(self, context: Dict[str, Any]) -> MetricResult:
         """Compute bus factor metric using GenAI analysis with fallback to heuristics."""
@@ -23,12 +46,8 @@ class BusFactorMetric:
         import re
         start = time.time()
 
-        # Get model URL from context for GenAI analysis
-        model_url = context.get("model_url", "")
-        code_url = context.get("code_url", "")
-
         # Use model_url first, fallback to code_url
-        target_url = model_url or code_url
+        target_url = self.llm_target(context)
 
         if not target_url:
             # Fallback to original heuristic method
@@ -46,26 +65,9 @@ class BusFactorMetric:
                 "method": "heuristic"
             }, binary=0, seconds=seconds)
 
-        # Create prompt for bus factor evaluation
-        prompt = """Analyze the bus factor for this model/repository by examining READMEs, documentation, and contributor distribution.
-
-Bus factor measures how well knowledge and contributions are distributed:
-- High bus factor (closer to 1.0) = Knowledge is well-distributed, good documentation, builds on established research
-- Low bus factor (closer to 0.0) = Knowledge is concentrated, poor documentation, requires specialized knowledge
-
-Consider:
-1. How well the README/documentation references existing research
-2. Whether the approach builds on established methods
-3. How accessible the knowledge is to new contributors
-4. Documentation quality and completeness
-5. Overlap with well-known techniques and papers
-
-Return only a decimal number between 0.0 and 1.0 representing bus factor score.
-URL:"""
-
         try:
             # Get GenAI evaluation
-            genai_response = get_genai_metric_data(target_url, prompt)
+            genai_response = get_genai_metric_data(target_url, PROMPT)
             value = None
 
             # Extract numerical score from response
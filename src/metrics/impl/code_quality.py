@@ -9,6 +9,7 @@ class CodeQualityMetric:
     Combine test_coverage_norm, style_norm, comment_ratio_norm, maintainability_norm (0..1 each).
     """
     id = "code_quality"
+    requires = ("code_quality",)
 
     def compute(self, context: Dict[str, Any]) -> MetricResult:
         """Compute code quality metric using traditional metrics."""
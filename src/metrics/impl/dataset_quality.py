@@ -5,12 +5,32 @@ from ..types import MetricResult
 from ..data_fetcher import get_genai_metric_data
 
 
+PROMPT = """Evaluate the quality of this dataset based on the following criteria:
+1. Data cleanliness and consistency
+2. Documentation quality and completeness
+3. Dataset structure and organization
+4. Metadata and descriptions
+5. Overall usability for machine learning tasks
+
+Please provide a quality score from 0.0 to 1.0 where:
+- 0.0 = Very bad dataset (poor quality, missing documentation, inconsistent data)
+- 1.0 = Excellent dataset (high quality, well-documented, clean and consistent)
+
+Respond with only the numerical score (e.g., 0.75). Dataset URL:"""
+
+
 class DatasetQualityMetric:
     """
     Evaluate dataset quality using GenAI LLM analysis.
     Returns a score in [0, 1] range where 0 represents a very bad dataset and 1 represents a great dataset.
     """
     id = "dataset_quality"
+    requires = ("dataset_quality",)
+    llm_prompt = PROMPT
+
+    def llm_target(self, context: Dict[str, Any]) -> str:
+        """URL sent to the LLM: the dataset URL."""
+        return context.get("dataset_url", "")
 
     def compute(self, context: Dict[str, Any]) -> MetricResult:
         """Compute dataset quality metric using GenAI analysis with fallback to heuristics."""
@@ -19,7 +39,7 @@ class DatasetQualityMetric:
         start = time.time()
 
         # Get the dataset URL from context
-        dataset_url = context.get("dataset_url", "")
+        dataset_url = self.llm_target(context)
 
         if not dataset_url:
             # Fallback to original implementation if no dataset URL
@@ -37,23 +57,9 @@ class DatasetQualityMetric:
                 "components": vals
             }, binary=0, seconds=seconds)
 
-        # Create a prompt for dataset quality evaluation
-        prompt = """Evaluate the quality of this dataset based on the following criteria:
-1. Data cleanliness and consistency
-2. Documentation quality and completeness
-3. Dataset structure and organization
-4. Metadata and descriptions
-5. Overall usability for machine learning tasks
-
-Please provide a quality score from 0.0 to 1.0 where:
-- 0.0 = Very bad dataset (poor quality, missing documentation, inconsistent data)
-- 1.0 = Excellent dataset (high quality, well-documented, clean and consistent)
-
-Respond with only the numerical score (e.g., 0.75). Dataset URL:"""
-
         try:
             # Get GenAI evaluation
-            genai_response = get_genai_metric_data(dataset_url, prompt)
+            genai_response = get_genai_metric_data(dataset_url, PROMPT)
 
             # Extract numerical score from response - improved regex
             score_match = re.search(r'(\d+(?:\.\d+)?)', str(genai_response))
@@ -1,14 +1,40 @@
 from __future__ import annotations
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Pattern, Tuple
 from ..types import MetricResult
-from src.metrics.data_fetcher.huggingface import get_huggingface_file
 import re
 
+
+@lru_cache(maxsize=32)
+def _compile_matcher(licenses: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    if not licenses:
+        return None
+    # Longest first, so at any position the most specific id wins
+    # ("cc-by-4.0" over "cc")
+    alternatives = sorted(licenses, key=lambda lic: (-len(lic), lic))
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, alternatives)) + r")\b")
+
+
+def license_matcher(licenses: Iterable[str]) -> Optional[Pattern[str]]:
+    """One precompiled alternation over `licenses`, built once per allow-list."""
+    return _compile_matcher(tuple(sorted(set(licenses))))
+
+
+def find_licenses(text: str, licenses: Iterable[str]) -> List[Tuple[str, int]]:
+    """Every (license id, offset) in `text`, in order, from a single scan."""
+    matcher = license_matcher(licenses)
+    if matcher is None:
+        return []
+    return [(m.group(0), m.start()) for m in matcher.finditer(text)]
+
+
 class LicenseComplianceMetric:
     """
     1 if a compatible license string is detected, else 0. 'compatible_licenses' may be provided in context.
+    The model card text comes from context["model_card"] (see `requires`).
     """
     id = "license_compliance"
+    requires = ("license", "model_card")
 
     DEFAULT_COMPATIBLE_LICENSES = [
         "apache-2.0", "mit", "openrail", "bigscience-openrail-m", "creativeml-openrail-m",
@@ -37,35 +63,23 @@ class LicenseComplianceMetric:
         detected_license = ""
         value = 0.0
 
-        # First, try to get license from local artifact (HuggingFace file)
-        if model_url:
-            readme_path = None
-            try:
-                readme_path = get_huggingface_file(model_url)
-            except Exception:
-                readme_path = None
-
-            if readme_path:
-                try:
-                    with open(readme_path, "r", encoding="utf-8") as f:
-                        readme_text = f.read().lower()
-                        # Search for license keywords in the README
-                        for lic in allow:
-                            if re.search(rf"\b{re.escape(lic)}\b", readme_text):
-                                detected_license = lic
-                                value = 1.0
-                                break
-                except Exception:
-                    pass
+        # First, try the model card text fetched once per row by the aggregator
+        model_card = context.get("model_card") or ""
+        if model_card:
+            # Search for license keywords in the README
+            hits = find_licenses(model_card.lower(), allow)
+            if hits:
+                detected_license = hits[0][0]
+                value = 1.0
 
         # If no license found in local artifact, try context as fallback
         if not detected_license and license_from_context:
             license_lower = license_from_context.lower().strip()
-            for lic in allow:
-                if lic.lower() == license_lower or re.search(rf"\b{re.escape(lic)}\b", license_lower):
-                    detected_license = lic
-                    value = 1.0
-                    break
+            exact = [lic for lic in allow if lic.lower() == license_lower]
+            hits = exact or [lic for lic, _ in find_licenses(license_lower, allow)]
+            if hits:
+                detected_license = hits[0]
+                value = 1.0
             # If no match found, store the original license for details
             if not detected_license:
                 detected_license = license_from_context
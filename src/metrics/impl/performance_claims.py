@@ -8,6 +8,7 @@ class PerformanceClaimsMetric:
     You can also pass a weighted fraction via context['requirements_score'] in 0..1.
     """
     id = "performance_claims"
+    requires = ("ramp", "availability")
 
     def compute(self, context: Dict[str, Any]) -> MetricResult:
         import time
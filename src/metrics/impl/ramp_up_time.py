@@ -10,6 +10,7 @@ class RampUpTimeMetric:
     Expect fields in context['ramp'] as already-normalized 0..1: likes_norm, downloads_norm, recency_norm.
     """
     id = "ramp_up_time"
+    requires = ("ramp",)
 
     def compute(self, context: Dict[str, Any]) -> MetricResult:
         """Compute ramp-up time metric."""
@@ -19,6 +19,7 @@ class SizeMetric:
     Computes the size metric based on normalized size scores across hardware.
     """
     id = "size"
+    requires = ("size_components",)
 
     def compute(self, context: Dict[str, Any]) -> MetricResult:
         """Compute size metric based on normalized size scores across different hardware targets."""
@@ -0,0 +1,98 @@
+"""Shared process pool for CPU-bound metric work.
+
+`run_metrics(backend="process")` and the row-level ``EVAL_ENGINE=process``
+mode hand work to a process pool so that CPU-bound parts (license scans of
+large READMEs, heuristics over huge file lists) are not serialized by the
+GIL. Pools are created lazily, one per worker count (env EVAL_PROCESSES,
+default: all cores), and reused for the rest of the run.
+
+Workers are started with env EVAL_MP_START (default "spawn": the parent
+runs reader and batching threads, which fork does not copy safely) and
+warmed up once: the metric modules are imported, any inherited HTTP
+session is dropped so each child opens its own connection pool, and a
+fetch memo is installed for the child's lifetime so rows it evaluates
+share fetches of the same repo or dataset.
+
+Contexts cross the process boundary by pickling; `context_snapshot` keeps
+only the entries that pickle.
+"""
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from src.logger import get_logger
+
+logger = get_logger("metrics.process_pool")
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _warm_up() -> None:
+    """Per-child initializer: import the metrics, fresh session, own fetch memo."""
+    from src.metrics.data_fetcher.memo import install_process_memo
+    from src.metrics.data_fetcher.utils import reset_session
+    from .runner import build_registry_from_plan
+
+    reset_session()
+    install_process_memo()
+    build_registry_from_plan()
+
+
+def default_processes() -> int:
+    try:
+        return max(1, int(os.getenv("EVAL_PROCESSES", str(os.cpu_count() or 1))))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """The shared pool with `max_workers` processes, created on first use."""
+    max_workers = max(1, max_workers or default_processes())
+    with _pools_lock:
+        pool = _pools.get(max_workers)
+        if pool is None or getattr(pool, "_broken", False):
+            start = os.getenv("EVAL_MP_START", "spawn")
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context(start),
+                initializer=_warm_up)
+            _pools[max_workers] = pool
+            logger.debug(f"Started process pool ({max_workers} x {start})")
+        return pool
+
+
+def shutdown_process_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_process_pools)
+
+
+def picklable(obj: Any) -> bool:
+    try:
+        pickle.dumps(obj)
+        return True
+    except Exception:
+        return False
+
+
+def context_snapshot(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of `context` without the entries that cannot be sent to a worker."""
+    snapshot: Dict[str, Any] = {}
+    for key, value in context.items():
+        if picklable(value):
+            snapshot[key] = value
+        else:
+            logger.debug(f"Context entry {key!r} is not picklable; not sent")
+    return snapshot
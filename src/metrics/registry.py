@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, Iterable, Optional, Set
 from .types import Metric
 
 
@@ -19,3 +19,19 @@ class MetricRegistry:
 
     def list_ids(self):
         return list(self._by_id.keys())
+
+    def required_keys(self, metric_ids: Optional[Iterable[str]] = None
+                      ) -> Optional[Set[str]]:
+        """
+        Context keys the given metrics (default: all registered) declare in
+        `requires`, e.g. {"license", "model_card"}. None if any of them does
+        not declare its needs, meaning everything must be fetched.
+        """
+        ids = self.list_ids() if metric_ids is None else metric_ids
+        keys: Set[str] = set()
+        for metric_id in ids:
+            requires = getattr(self.get(metric_id), "requires", None)
+            if requires is None:
+                return None
+            keys.update(requires)
+        return keys
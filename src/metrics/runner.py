@@ -54,19 +54,63 @@ def _compute_one(op: Operationalization, metric,
     return op.metric_id, res
 
 
+def _default_metric_result(metric_id: str) -> MetricResult:
+    # You may want to customize this per metric type
+    return MetricResult(
+        id=metric_id,
+        value=0.0,
+        binary=0,
+        details={},
+        seconds=0
+    )
+
+
+def _compute_metric(op: Operationalization, metric,
+                    ctx: Dict[str, Any]) -> Tuple[str, MetricResult]:
+    """Compute one metric, or its default when a URL it needs is blank."""
+    metric_id = op.metric_id
+    # Decide which URL(s) to use
+    code_url = ctx.get("code_url", "")
+    dataset_url = ctx.get("dataset_url", "")
+
+    # If metric needs code_url and it's blank, return default
+    if metric_id.startswith("code_") and not code_url:
+        return metric_id, _default_metric_result(metric_id)
+    # If metric needs dataset_url and it's blank, return default
+    if metric_id.startswith("dataset_") and not dataset_url:
+        return metric_id, _default_metric_result(metric_id)
+    # If metric needs both and either is blank, return default
+    if (metric_id.startswith("code_dataset_") or metric_id.startswith("dataset_code_")) \
+            and (not code_url or not dataset_url):
+        return metric_id, _default_metric_result(metric_id)
+
+    # Otherwise, compute as normal
+    return _compute_one(op, metric, ctx)
+
+
 def run_metrics(
     ops: List[Operationalization],
     context: Dict[str, Any],
     registry: MetricRegistry | None = None,
     *,
     parallel: bool = False,
-    max_workers: int | None = None
+    max_workers: int | None = None,
+    backend: str | None = None
 ) -> Tuple[Dict[str, MetricResult], Dict[str, Any]]:
     """
     Execute all metrics and return (results_by_id, netscore_summary).
     Now supports code_url, dataset_url, and model_url in context.
+
+    `backend` picks how metrics run: "serial", "thread" (a thread pool;
+    what `parallel=True` selects) or "process" (the shared process pool in
+    `process_pool`, for CPU-bound metrics). Env METRICS_BACKEND sets the
+    default. In process mode the context is sent as a pickled snapshot;
+    metrics that cannot be pickled, and LLM-backed ones (which wait on the
+    parent's batcher rather than the CPU), still run in this process.
     """
     reg = registry or build_registry_from_plan()
+    backend = backend or os.getenv("METRICS_BACKEND") or (
+        "thread" if parallel else "serial")
 
     # Per-metric params (optional)
     ctx = dict(context)
@@ -74,62 +118,41 @@ def run_metrics(
 
     results: Dict[str, MetricResult] = {}
 
-    def get_default_metric_result(metric_id: str) -> MetricResult:
-        # You may want to customize this per metric type
-        return MetricResult(
-            id=metric_id,
-            value=0.0,
-            binary=0,
-            details={},
-            seconds=0
-        )
-
-    def should_use_code_url(metric_id: str) -> bool:
-        return metric_id.startswith("code_")
-
-    def should_use_dataset_url(metric_id: str) -> bool:
-        return metric_id.startswith("dataset_")
-
-    def should_use_both(metric_id: str) -> bool:
-        return metric_id.startswith(
-            "code_dataset_") or metric_id.startswith("dataset_code_")
-
-    def compute_metric(op, metric, ctx):
-        metric_id = op.metric_id
-        # Decide which URL(s) to use
-        code_url = ctx.get("code_url", "")
-        dataset_url = ctx.get("dataset_url", "")
-        model_url = ctx.get("model_url", "")
-
-        # If metric needs code_url and it's blank, return default
-        if should_use_code_url(metric_id) and not code_url:
-            return metric_id, get_default_metric_result(metric_id)
-        # If metric needs dataset_url and it's blank, return default
-        if should_use_dataset_url(metric_id) and not dataset_url:
-            return metric_id, get_default_metric_result(metric_id)
-        # If metric needs both and either is blank, return default
-        if should_use_both(metric_id) and (not code_url or not dataset_url):
-            return metric_id, get_default_metric_result(metric_id)
-
-        # Otherwise, compute as normal
-        return _compute_one(op, metric, ctx)
-
-    if not parallel:
+    if backend == "process":
+        from .process_pool import context_snapshot, get_process_pool, picklable
+
+        pool = get_process_pool(max_workers)
+        snapshot = context_snapshot(ctx)
+        futures = {}
+        local = []
         for op in ops:
             metric = reg.get(op.metric_id)
-            mid, res = compute_metric(op, metric, ctx)
+            if hasattr(metric, "llm_target") or not picklable(metric):
+                local.append((op, metric))
+            else:
+                futures[pool.submit(_compute_metric, op, metric, snapshot)] = op.metric_id
+        for op, metric in local:
+            mid, res = _compute_metric(op, metric, ctx)
             results[mid] = res
-    else:
+        for fut in as_completed(futures):
+            mid, res = fut.result()
+            results[mid] = res
+    elif backend == "thread":
         if max_workers is None:
             max_workers = min(32, (os.cpu_count() or 4) * 5)
         with ThreadPoolExecutor(max_workers=max_workers) as ex:
             futures = {
-                ex.submit(compute_metric, op, reg.get(op.metric_id), ctx): op.metric_id
+                ex.submit(_compute_metric, op, reg.get(op.metric_id), ctx): op.metric_id
                 for op in ops
             }
             for fut in as_completed(futures):
                 mid, res = fut.result()
                 results[mid] = res
+    else:
+        for op in ops:
+            metric = reg.get(op.metric_id)
+            mid, res = _compute_metric(op, metric, ctx)
+            results[mid] = res
 
     # latencies are last 4 values of context
     latencies = {k: v for k, v in ctx.items() if k.endswith("_latency")}
@@ -0,0 +1,218 @@
+"""Local SQLite store of scored NDJSON records.
+
+Two tables:
+
+- ``scores``: for incremental re-scoring, each row (identified by its
+  code/dataset/model URLs) keeps its latest record together with the
+  upstream fingerprints it was scored against (see
+  `src.metrics.data_fetcher.fingerprint`). A later run serves the stored
+  record instead of re-scoring when every fingerprint still matches and the
+  record is younger than the TTL (env SCORE_TTL seconds, default 7 days).
+- ``results``: the history of every record emitted, indexed by model name,
+  URL, run timestamp and net_score, for point lookups (`latest`), top-k
+  by net_score (`top_k`) and per-model history (`history`) without
+  re-running the evaluation.
+
+The database defaults to ``<cache root>/scores.sqlite`` (env
+SCORE_STORE_PATH overrides it).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.logger import get_logger
+from src.metrics.data_fetcher.disk_cache import cache_root
+from src.metrics.data_fetcher.memo import normalize_url
+
+logger = get_logger("score_store")
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    row_id       TEXT PRIMARY KEY,
+    fingerprints TEXT NOT NULL,
+    record       TEXT NOT NULL,
+    scored_at    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at    REAL NOT NULL,
+    name      TEXT,
+    url       TEXT,
+    row_id    TEXT NOT NULL,
+    category  TEXT,
+    net_score REAL,
+    record    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_name ON results (name, run_at);
+CREATE INDEX IF NOT EXISTS results_url ON results (url, run_at);
+CREATE INDEX IF NOT EXISTS results_run_at ON results (run_at);
+CREATE INDEX IF NOT EXISTS results_net_score ON results (net_score);
+"""
+
+
+def default_store_path() -> str:
+    return os.getenv("SCORE_STORE_PATH") or os.path.join(
+        cache_root(), "scores.sqlite")
+
+
+def row_id(links: List[Optional[str]]) -> str:
+    """Stable identity of an input row: its normalized code|dataset|model URLs."""
+    padded = list(links or []) + [None] * 3
+    return "|".join(normalize_url(u) if u else "" for u in padded[:3])
+
+
+def primary_url(links: List[Optional[str]]) -> Optional[str]:
+    """URL a record is named after: the model, else the dataset, else the code."""
+    padded = list(links or []) + [None] * 3
+    for url in (padded[2], padded[1], padded[0]):
+        if url:
+            return normalize_url(url)
+    return None
+
+
+class ScoreStore:
+    """
+    Thread-safe wrapper around one SQLite connection. With `reuse` off the
+    store only records results; it never serves stored records.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 ttl: Optional[float] = None, reuse: bool = True) -> None:
+        self.path = path or default_store_path()
+        self.reuse = reuse
+        self.run_at = time.time()
+        if ttl is None:
+            try:
+                ttl = float(os.getenv("SCORE_TTL", str(DEFAULT_TTL)))
+            except ValueError:
+                ttl = DEFAULT_TTL
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                        exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self) -> "ScoreStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, rid: str, fingerprints: Dict[str, Optional[str]],
+               count: bool = True) -> Optional[Dict[str, Any]]:
+        """Stored record if it is fresh and scored against `fingerprints`.
+
+        `count=False` leaves the hit/miss stats alone (a look-ahead check).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprints, record, scored_at FROM scores WHERE row_id = ?",
+                (rid,)).fetchone()
+        reusable = (
+            row is not None
+            and time.time() - row[2] < self.ttl
+            and bool(fingerprints)
+            and all(v is not None for v in fingerprints.values())
+            and json.loads(row[0]) == fingerprints
+        )
+        if count:
+            with self._lock:
+                if reusable:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return json.loads(row[1]) if reusable else None
+
+    def save(self, rid: str, fingerprints: Dict[str, Optional[str]],
+             record: Dict[str, Any]) -> None:
+        if not fingerprints:
+            return  # nothing to compare against later
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scores (row_id, fingerprints, record, scored_at) "
+                "VALUES (?, ?, ?, ?)",
+                (rid, json.dumps(fingerprints, sort_keys=True),
+                 json.dumps(record), time.time()))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def add_result(self, links: List[Optional[str]],
+                   record: Dict[str, Any]) -> None:
+        """Append `record` to the results history under this run's timestamp."""
+        net_score = record.get("net_score")
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO results (run_at, name, url, row_id, category, "
+                "net_score, record) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.run_at, record.get("name"), primary_url(links),
+                 row_id(links), record.get("category"),
+                 float(net_score) if isinstance(net_score, (int, float)) else None,
+                 json.dumps(record)))
+            self._conn.commit()
+
+    def _where(self, name: Optional[str],
+               url: Optional[str]) -> Tuple[str, Tuple[Any, ...]]:
+        if url:
+            return "url = ?", (normalize_url(url),)
+        if name:
+            return "name = ?", (name,)
+        raise ValueError("a model name or URL is required")
+
+    def _results(self, sql: str, params: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [{"run_at": run_at, "record": json.loads(record)}
+                for run_at, record in rows]
+
+    def latest(self, name: Optional[str] = None,
+               url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent result for a model name or URL, or None."""
+        where, params = self._where(name, url)
+        found = self._results(
+            f"SELECT run_at, record FROM results WHERE {where} "
+            "ORDER BY run_at DESC, id DESC LIMIT 1", params)
+        return found[0] if found else None
+
+    def history(self, name: Optional[str] = None, url: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """All results for a model name or URL, oldest first."""
+        where, params = self._where(name, url)
+        sql = (f"SELECT run_at, record FROM (SELECT id, run_at, record "
+               f"FROM results WHERE {where} ORDER BY run_at DESC, id DESC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (int(limit),)
+        return self._results(sql + ") ORDER BY run_at, id", params)
+
+    def top_k(self, k: int = 10,
+              category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Latest result of each model, best net_score first."""
+        sql = ("SELECT run_at, record FROM results WHERE id IN "
+               "(SELECT MAX(id) FROM results GROUP BY COALESCE(url, row_id)) "
+               "AND net_score IS NOT NULL")
+        params: Tuple[Any, ...] = ()
+        if category:
+            sql += " AND category = ?"
+            params += (category,)
+        return self._results(sql + " ORDER BY net_score DESC LIMIT ?",
+                             params + (int(k),))
@@ -1,5 +1,6 @@
 from typing import Dict
-from .url_type_handler import get_url_category, handle_url
+from .url_type_handler import get_url_category, handle_url, iter_handle_url
+from .classifier import classify_url
 
 
 def detect(url: str) -> str:
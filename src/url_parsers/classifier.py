@@ -0,0 +1,148 @@
+"""Offline URL classification.
+
+`classify_url` decides what a URL points at (MODEL, DATASET, CODE, or a
+known non-artifact kind such as PAPER) from the canonical URL patterns
+first and then a local index of known hosts / path prefixes. Only URLs
+that neither recognises come back with kind None, and only those are
+worth an LLM call.
+
+The index can be extended without code changes: env URL_HOST_INDEX may
+point to a JSON file mapping ``"host[/path-prefix]"`` to a kind, e.g.
+``{"data.example.org": "DATASET", "example.org/models/": "MODEL"}``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.logger import get_logger
+
+logger = get_logger("url_parsers.classifier")
+
+# URL patterns
+HF_MODEL_PATTERN = re.compile(
+    r"^https://huggingface\.co/[^/]+/[^/]+($|/tree/|/blob/|/main|/resolve/)")
+HF_DATASET_PATTERN = re.compile(
+    r"^https://huggingface\.co/datasets/[^/]+/[^/]+($|/tree/|/blob/|/main|/resolve/)")
+GITHUB_CODE_PATTERN = re.compile(
+    r"^https://github\.com/[^/]+/[^/]+($|/tree/|/blob/|/main|/commit/|/releases/)")
+GITLAB_CODE_PATTERN = re.compile(
+    r"^https://gitlab\.com/[^/]+/[^/]+($|/tree/|/blob/|/main|/commit/|/releases/)")
+HF_SPACES_PATTERN = re.compile(
+    r"^https://huggingface\.co/spaces/[^/]+/[^/]+($|/tree/|/blob/|/main|/commit/|/releases/)")
+
+# HF_MODEL_PATTERN also matches /datasets/<name> and /spaces/<name>
+_HF_MODEL_RULE = re.compile(
+    r"^https://huggingface\.co/(?!datasets/|spaces/)[^/]+/[^/]+($|/tree/|/blob/|/main|/resolve/)")
+
+# Checked in order; the first match wins
+PATTERN_RULES: List[Tuple[re.Pattern, str]] = [
+    (HF_DATASET_PATTERN, "DATASET"),
+    (HF_SPACES_PATTERN, "CODE"),
+    (GITHUB_CODE_PATTERN, "CODE"),
+    (GITLAB_CODE_PATTERN, "CODE"),
+    (_HF_MODEL_RULE, "MODEL"),
+]
+
+# "host[/path-prefix]" -> kind; the longest matching entry wins
+KNOWN_HOSTS: Dict[str, str] = {
+    "huggingface.co": "MODEL",
+    "huggingface.co/datasets/": "DATASET",
+    "huggingface.co/spaces/": "CODE",
+    "github.com": "CODE",
+    "gitlab.com": "CODE",
+    "bitbucket.org": "CODE",
+    "kaggle.com/datasets/": "DATASET",
+    "kaggle.com/models/": "MODEL",
+    "kaggle.com/code/": "CODE",
+    "zenodo.org": "DATASET",
+    "figshare.com": "DATASET",
+    "data.world": "DATASET",
+    "dataverse.harvard.edu": "DATASET",
+    "archive.ics.uci.edu": "DATASET",
+    "registry.opendata.aws": "DATASET",
+    "image-net.org": "DATASET",
+    "paperswithcode.com/dataset/": "DATASET",
+    "tensorflow.org/datasets/": "DATASET",
+    "arxiv.org": "PAPER",
+    "openreview.net": "PAPER",
+    "aclanthology.org": "PAPER",
+}
+
+
+@dataclass(frozen=True)
+class UrlClass:
+    kind: Optional[str]   # MODEL / DATASET / CODE / PAPER, None if unknown
+    source: str           # "pattern", "host_index" or "unknown"
+
+
+def _load_index() -> Dict[str, str]:
+    index = {k.lower(): v for k, v in KNOWN_HOSTS.items()}
+    path = os.getenv("URL_HOST_INDEX")
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                extra = json.load(f)
+            index.update({str(k).lower(): str(v).upper()
+                          for k, v in extra.items()})
+        except Exception as e:
+            logger.warning(f"Could not load URL_HOST_INDEX {path}: {e}")
+    return index
+
+
+_index: Optional[Dict[str, str]] = None
+
+
+def host_index() -> Dict[str, str]:
+    global _index
+    if _index is None:
+        _index = _load_index()
+    return _index
+
+
+def reload_index() -> None:
+    """Re-read KNOWN_HOSTS and URL_HOST_INDEX (clears cached results)."""
+    global _index
+    _index = None
+    classify_url.cache_clear()
+
+
+def _host_lookup(url: str) -> Optional[str]:
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = (parsed.netloc or "").lower().split("@")[-1].split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    target = host + (parsed.path or "/")
+    best, best_len = None, -1
+    for entry, kind in host_index().items():
+        entry_host = entry.split("/", 1)[0]
+        if host != entry_host and not host.endswith("." + entry_host):
+            continue
+        prefix = entry if "/" in entry else entry + "/"
+        candidate = host + "/" + prefix.split("/", 1)[1]
+        if target.startswith(candidate) or target + "/" == candidate:
+            if len(entry) > best_len:
+                best, best_len = kind, len(entry)
+    return best
+
+
+@lru_cache(maxsize=4096)
+def classify_url(url: Optional[str]) -> UrlClass:
+    """Kind of `url` from patterns, then the known-host index; no network."""
+    url = (url or "").strip()
+    if not url:
+        return UrlClass(None, "unknown")
+    for pattern, kind in PATTERN_RULES:
+        if pattern.match(url):
+            return UrlClass(kind, "pattern")
+    kind = _host_lookup(url)
+    if kind:
+        return UrlClass(kind, "host_index")
+    return UrlClass(None, "unknown")
@@ -10,36 +10,43 @@ Phase-1 constraints:
 """
 from __future__ import annotations
 
-from typing import Dict, List, Literal, Optional
+from collections import Counter, deque
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ThreadPoolExecutor, wait)
+from itertools import islice
+import functools
+from typing import (Any, Callable, Deque, Dict, FrozenSet, Iterable, Iterator,
+                    List, Literal, Optional, Tuple, Union)
 import logging
 import os
+import queue
 import re
-
-import requests
+import threading
 
 from src.cli.schema import default_ndjson
+from src.metrics.operationalization import Operationalization
 from src.metrics.ops_plan import default_ops
-from src.metrics.runner import run_metrics
+from src.metrics.runner import build_registry_from_plan, run_metrics
 from src.metrics.data_fetcher import fetch_comprehensive_metrics_data
+from src.metrics.data_fetcher.aggregator import plan_sources
+from src.metrics.data_fetcher.env import env_int
+from src.metrics.data_fetcher.github_graphql import (
+    graphql_batch_size, graphql_enabled, prime_memo)
+from src.metrics.data_fetcher.fingerprint import row_fingerprints
+from src.metrics.data_fetcher.memo import FetchMemo, batch_scope
+from src.metrics.data_fetcher import llm as _llm, llm_batch
+from src.metrics.data_fetcher.llm_cache import cached_post_json, llm_cache
+from src.metrics.process_pool import default_processes, get_process_pool
+from src.score_store import ScoreStore, row_id
+from src.url_parsers.classifier import (
+    GITHUB_CODE_PATTERN, GITLAB_CODE_PATTERN, HF_DATASET_PATTERN,
+    HF_MODEL_PATTERN, HF_SPACES_PATTERN, classify_url)
 
 logger = logging.getLogger(__name__)
 
 UrlCategory = Literal["MODEL", "DATASET", "CODE"]
 
 
-# URL patterns
-HF_MODEL_PATTERN = re.compile(
-    r"^https://huggingface\.co/[^/]+/[^/]+($|/tree/|/blob/|/main|/resolve/)")
-HF_DATASET_PATTERN = re.compile(
-    r"^https://huggingface\.co/datasets/[^/]+/[^/]+($|/tree/|/blob/|/main|/resolve/)")
-GITHUB_CODE_PATTERN = re.compile(
-    r"^https://github\.com/[^/]+/[^/]+($|/tree/|/blob/|/main|/commit/|/releases/)")
-GITLAB_CODE_PATTERN = re.compile(
-    r"^https://gitlab\.com/[^/]+/[^/]+($|/tree/|/blob/|/main|/commit/|/releases/)")
-HF_SPACES_PATTERN = re.compile(
-    r"^https://huggingface\.co/spaces/[^/]+/[^/]+($|/tree/|/blob/|/main|/commit/|/releases/)")
-
-
 # Purdue GenAI Studio
 PURDUE_GENAI_API_KEY = os.getenv("GEN_AI_STUDIO_API_KEY")
 PURDUE_GENAI_URL = "https://genai.rcac.purdue.edu/api/chat/completions"
@@ -58,13 +65,19 @@ def _valid_code_url(url: Optional[str]) -> bool:
     return False
 
 
-def _valid_dataset_url(url: Optional[str]) -> bool:
+def _valid_dataset_url(url: Optional[str], allow_inference: bool = True) -> bool:
+    """
+    True if `url` points at a dataset. Pattern rules and the known-host
+    index decide offline; GenAI is only asked about unrecognised hosts,
+    and only when `allow_inference` is set.
+    """
     if url:
-        if HF_DATASET_PATTERN.match(url):
-            return True
+        kind = classify_url(url).kind
+        if kind is not None:
+            return kind == "DATASET"
         # Fallback: ask GenAI if this is a valid dataset URL (for other
         # sources)
-        if PURDUE_GENAI_API_KEY:
+        if allow_inference and PURDUE_GENAI_API_KEY:
             prompt = f"Is the following URL a valid dataset? Reply 'yes' or 'no' only. URL: {url}"
             result = _genai_single_url(prompt)
             return bool(result and result.lower().startswith("yes"))
@@ -98,10 +111,7 @@ def _genai_single_url(prompt: str) -> Optional[str]:
             ],
             "temperature": 0,
         }
-        resp = requests.post(
-            PURDUE_GENAI_URL, headers=headers, json=body, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        data = cached_post_json(PURDUE_GENAI_URL, headers, body, timeout=15)
         text: str = data["choices"][0]["message"]["content"].strip()
         m = re.search(r"https?://\S+", text)
         return m.group(0) if m else None
@@ -121,17 +131,22 @@ def get_dataset_url_from_genai(model_url: str) -> Optional[str]:
     url = _genai_single_url(
         f"Given the model URL {model_url}, what is the corresponding dataset URL? Only provide the URL."
     )
-    return url if _valid_dataset_url(url) else None
+    # the answer is checked offline only; no second LLM call to validate it
+    return url if _valid_dataset_url(url, allow_inference=False) else None
 
 
-def get_url_category(models: Dict[str,
-                                  List[Optional[str]]]) -> Dict[str,
-                                                                Optional[UrlCategory]]:
+def get_url_category(models: Dict[str, List[Optional[str]]],
+                     inference: Optional[Dict[str, List[str]]] = None
+                     ) -> Dict[str, Optional[UrlCategory]]:
     """
     Classify each entry and opportunistically fill missing links via GenAI.
 
     `models` maps an arbitrary key -> [code_url, dataset_url, model_url].
     Returns a dict with the same keys mapping to the inferred UrlCategory.
+    Links are checked offline first (see `classifier.classify_url`); GenAI
+    is only used to fill links that are missing or unusable and to judge
+    dataset URLs on unrecognised hosts. If `inference` is given, it
+    receives key -> list of the GenAI steps each row needed.
     """
     categories: Dict[str, Optional[UrlCategory]] = {}
     for key, links in models.items():
@@ -143,107 +158,605 @@ def get_url_category(models: Dict[str,
             links += [None] * (3 - len(links))
 
         code_url, dataset_url, model_url = links[0], links[1], links[2]
+        steps: List[str] = []
 
         # Category: for Phase 1 we primarily tag MODEL rows
         categories[key] = "MODEL" if _valid_model_url(
             model_url) or (model_url and model_url.strip()) else None
 
-        # Fill missing links using Purdue GenAI Studio (LLM usage)
+        # Fill missing links using Purdue GenAI Studio (LLM usage); steps
+        # are recorded only when a GenAI call can actually be made
         if not _valid_code_url(code_url) and model_url:
+            if PURDUE_GENAI_API_KEY:
+                steps.append("code_url")
             filled = get_code_url_from_genai(model_url)
             if filled:
                 links[0] = filled
-        if not _valid_dataset_url(dataset_url) and model_url:
+
+        dataset_ok = False
+        if dataset_url:
+            if classify_url(dataset_url).kind is None and PURDUE_GENAI_API_KEY:
+                steps.append("dataset_validity")
+            dataset_ok = _valid_dataset_url(dataset_url)
+        if not dataset_ok and model_url:
+            if PURDUE_GENAI_API_KEY:
+                steps.append("dataset_url")
             filled = get_dataset_url_from_genai(model_url)
             if filled:
                 links[1] = filled
+
+        if steps:
+            logger.debug("Row %s needed GenAI inference: %s", key, steps)
+        if inference is not None:
+            inference[key] = steps
     return categories
 
 
 # ---------- main entry ----------
 
-def handle_url(models: Dict[str, List[Optional[str]]]) -> Dict[str, dict]:
+# Which fetch latency is reported for each metric in the NDJSON record
+METRIC_LATENCY_MAP: Dict[str, str] = {
+    "ramp_up_time": "hf_model_latency",
+    # "bus_factor": "github_latency",
+    "performance_claims": "hf_model_latency",
+    # "license_compliance": "github_latency",
+    "size": "hf_model_latency",
+    "availability": "availability_latency",
+    "dataset_quality": "hf_dataset_latency",
+    "code_quality": "github_latency",
+}
+
+
+def _classify_row(key: str, links: Optional[List[Optional[str]]],
+                  inference: Optional[Dict[Any, List[str]]] = None
+                  ) -> Tuple[Optional[UrlCategory], List[Optional[str]]]:
+    """Category of one row plus its (possibly GenAI-filled) links."""
+    row = {key: links}
+    category = get_url_category(row, inference=inference).get(key)
+    return category, row[key]
+
+
+# Record key carrying a row's GenAI steps from `_evaluate_row` (possibly on
+# a worker process) back to the run; removed before the record is emitted
+INFERENCE_FIELD = "_genai_inference"
+
+
+class _InferenceLog:
+    """Which rows of a run needed GenAI inference, and for which steps."""
+
+    def __init__(self, rows: Optional[Dict[Any, List[str]]] = None) -> None:
+        self.rows = rows
+        self.steps: Counter = Counter()
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self, key: Any, steps: Optional[List[str]]) -> None:
+        if not steps:
+            return
+        with self._lock:
+            self.count += 1
+            self.steps.update(steps)
+            if self.rows is not None:
+                self.rows[key] = list(steps)
+
+    def collect(self, key: Any, links: Any,
+                evaluate: Callable[[Any, Any], dict]) -> dict:
+        """Run `evaluate` and move the record's inference steps into the log."""
+        record = evaluate(key, links)
+        if isinstance(record, dict):
+            self.add(key, record.pop(INFERENCE_FIELD, None))
+        return record
+
+    def report(self) -> None:
+        if self.count:
+            logger.info("GenAI inference: %d rows (%s)", self.count,
+                        ", ".join(f"{step} {n}" for step, n in sorted(self.steps.items())))
+
+
+@functools.lru_cache(maxsize=32)
+def _requires_for(metric_ids: Tuple[str, ...]) -> Optional[FrozenSet[str]]:
+    keys = build_registry_from_plan().required_keys(metric_ids)
+    return None if keys is None else frozenset(keys)
+
+
+def _fetch_kwargs(ops: Optional[List[Operationalization]]) -> Dict[str, Any]:
+    """Extra fetch arguments limiting the context to what `ops` need."""
+    if ops is None:
+        return {}
+    return {"requires": _requires_for(tuple(op.metric_id for op in ops))}
+
+
+def _needs_source(ops: Optional[List[Operationalization]], source: str) -> bool:
+    """True if scoring `ops` (None: the default plan) fetches `source`."""
+    if ops is None:
+        return True
+    return source in plan_sources(_fetch_kwargs(ops)["requires"])
+
+
+def _evaluate_row(key: str, links: Optional[List[Optional[str]]],
+                  ops: Optional[List[Operationalization]] = None) -> dict:
+    """Classify, fetch context, run metrics and build the NDJSON for one row.
+
+    GenAI steps the row needed are returned under INFERENCE_FIELD.
     """
-    Compute metrics and map to NDJSON for each input row.
+    inference: Dict[Any, List[str]] = {}
+    category, links = _classify_row(key, links, inference)
+    code_url, dataset_url, model_url = links[0], links[1], links[2]
+
+    # Fetch comprehensive context (HF API + GitHub + heuristics), limited
+    # to the sources the selected metrics depend on
+    comprehensive = fetch_comprehensive_metrics_data(
+        code_url=code_url or "",
+        dataset_url=dataset_url or "",
+        model_url=model_url or "",
+        **_fetch_kwargs(ops),
+    )
+    record = _score_row(links, category, comprehensive, ops)
+    if inference.get(key):
+        record[INFERENCE_FIELD] = inference[key]
+    return record
+
+
+def _evaluate_in_pool(pool: Executor, key: str,
+                      links: Optional[List[Optional[str]]],
+                      ops: Optional[List[Operationalization]] = None) -> dict:
+    """Run `_evaluate_row` on a worker process and wait for its record."""
+    return pool.submit(_evaluate_row, key, links, ops).result()
+
 
-    Returns a dict keyed by the same ids as `models`.
+def _ops_scope(ops: Optional[List[Operationalization]]) -> str:
+    """Suffix keeping stored records of a metric subset apart from full ones."""
+    return "" if ops is None else "#" + ",".join(op.metric_id for op in ops)
+
+
+def _stored_record(links: Optional[List[Optional[str]]], store: ScoreStore,
+                   scope: str = "", count: bool = True
+                   ) -> Tuple[str, Dict[str, Optional[str]], Optional[dict]]:
+    """(row id, current fingerprints, stored record if still valid)."""
+    padded = list(links or []) + [None] * 3
+    rid = row_id(padded) + scope
+    if not store.reuse:
+        return rid, {}, None
+    fp = row_fingerprints(padded[0] or "", padded[1] or "", padded[2] or "")
+    return rid, fp, store.lookup(rid, fp, count=count)
+
+
+def _evaluate_row_stored(key: str, links: Optional[List[Optional[str]]],
+                         store: ScoreStore,
+                         evaluate: Callable[[Any, Any], dict] = _evaluate_row,
+                         scope: str = "") -> dict:
+    """
+    `evaluate` that records the result in the score store, and is skipped
+    in incremental mode when the row's sources are unchanged.
     """
-    categories = get_url_category(models)
-    ndjsons: Dict[str, dict] = {}
+    rid, fp, record = _stored_record(links, store, scope)
+    if record is None:
+        record = evaluate(key, list(links) if links else links)
+        store.save(rid, fp, record)
+    store.add_result(links, record)
+    return record
+
+
+def _score_row(links: List[Optional[str]], category: Optional[UrlCategory],
+               comprehensive: Dict[str, Any],
+               ops: Optional[List[Operationalization]] = None) -> dict:
+    """Run metrics over a fetched context and map them to an NDJSON record."""
+    code_url, dataset_url, model_url = links[0], links[1], links[2]
+    context = {
+        "code_url": code_url,
+        "dataset_url": dataset_url,
+        "model_url": model_url,
+        **comprehensive,
+    }
+
+    results, summary, latencies = run_metrics(
+        default_ops if ops is None else ops, context=context)
+
+    # helpers for mapping
+    def get_metric(metric_id: str, default=None):
+        m = results.get(metric_id)
+        return m.value if m is not None else default
+
+    def get_latency(metric_id: str) -> Optional[int]:
+        latency_key = METRIC_LATENCY_MAP.get(metric_id)
+        m = latencies.get(latency_key) if latency_key else None
+        return int(m * 1000) if m is not None else None
+
+    size_metric = results.get("size")
+    size_score = size_metric.details.get(
+        "size_score") if size_metric and hasattr(size_metric, "details") else None
+    license_metric = results.get("license_compliance")
+    license_seconds = license_metric.seconds * 1000 if license_metric else None
+    bus_factor_metric = results.get("bus_factor")
+    bus_factor_seconds = bus_factor_metric.seconds * 1000 if bus_factor_metric else None
+    ndjson_args = {
+        # summary
+        "net_score": float(summary.get("net_score", 0.0)),
+        "net_score_latency": int(summary.get("net_score_latency", 0) or 0),
+        # individual metrics
+        "ramp_up_time": get_metric("ramp_up_time"),
+        "ramp_up_time_latency": get_latency("ramp_up_time"),
+        "bus_factor": get_metric("bus_factor"),
+        "bus_factor_latency": bus_factor_seconds,
+        "performance_claims": get_metric("performance_claims"),
+        "performance_claims_latency": get_latency("performance_claims"),
+        "license": get_metric("license_compliance"),
+        "license_latency": license_seconds,
+        "raspberry_pi": size_score.get("raspberry_pi") if isinstance(size_score, dict) else None,
+        "jetson_nano": size_score.get("jetson_nano") if isinstance(size_score, dict) else None,
+        "desktop_pc": size_score.get("desktop_pc") if isinstance(size_score, dict) else None,
+        "aws_server": size_score.get("aws_server") if isinstance(size_score, dict) else None,
+        "size_score_latency": get_latency("size"),
+        "dataset_and_code_score": get_metric("availability"),
+        "dataset_and_code_score_latency": get_latency("availability"),
+        "dataset_quality": get_metric("dataset_quality"),
+        "dataset_quality_latency": get_latency("dataset_quality"),
+        "code_quality": get_metric("code_quality"),
+        "code_quality_latency": get_latency("code_quality"),
+    }
+
+    return default_ndjson(model=model_url, category=category, **ndjson_args)
+
+
+Row = Tuple[Any, Optional[List[Optional[str]]]]
+
+
+def handle_url(models: Dict[str, List[Optional[str]]],
+               *,
+               max_workers: Optional[int] = None,
+               max_in_flight: Optional[int] = None,
+               engine: Optional[str] = None,
+               store: Optional[ScoreStore] = None,
+               ops: Optional[List[Operationalization]] = None,
+               inference: Optional[Dict[Any, List[str]]] = None) -> Dict[str, dict]:
+    """
+    Compute metrics and map to NDJSON for each input row.
 
-    for key, links in models.items():
-        code_url, dataset_url, model_url = links[0], links[1], links[2]
+    Rows are evaluated on a pool of `max_workers` threads (env EVAL_WORKERS,
+    default 1 = sequential). At most `max_in_flight` rows (env
+    EVAL_MAX_IN_FLIGHT, default 2x workers) are submitted at any time so
+    memory stays bounded on large inputs. With `engine="async"` (env
+    EVAL_ENGINE) rows are fetched on an asyncio event loop instead, with
+    `max_in_flight` rows in flight; with `engine="process"` each row is
+    fetched and scored on a worker process (`max_workers` processes,
+    default all cores). Results are recorded in `store` when
+    one is given (see `iter_handle_url`). `ops` restricts scoring to a
+    subset of the default plan; only the sources those metrics declare in
+    `requires` are fetched. If `inference` is given, it receives key ->
+    GenAI steps for every row that needed inference.
+
+    Returns a dict keyed by the same ids as `models`, in input order.
+    """
+    return dict(iter_handle_url(models, max_workers=max_workers,
+                                max_in_flight=max_in_flight, engine=engine,
+                                store=store, ops=ops, inference=inference))
+
+
+def iter_handle_url(rows: Union[Dict[Any, Optional[List[Optional[str]]]], Iterable[Row]],
+                    *,
+                    max_workers: Optional[int] = None,
+                    max_in_flight: Optional[int] = None,
+                    engine: Optional[str] = None,
+                    ordered: bool = True,
+                    store: Optional[ScoreStore] = None,
+                    ops: Optional[List[Operationalization]] = None,
+                    inference: Optional[Dict[Any, List[str]]] = None
+                    ) -> Iterator[Tuple[Any, dict]]:
+    """
+    Streaming counterpart of `handle_url`: yield (key, record) per row.
+
+    `rows` is a dict or any iterable of (key, links) pairs and is consumed
+    lazily, at most `max_in_flight` rows ahead of the output, so memory
+    stays flat however long the input is. With `ordered=True` records come
+    out in input order; otherwise each is yielded as soon as it finishes.
+    With a `store`, every record is added to its results history; if the
+    store has `reuse` on (incremental mode), rows whose upstream
+    fingerprints are unchanged are served from it instead of being re-scored.
+    Rows that needed GenAI inference are summarised in the log at the end
+    of the run and, per row, in `inference` when it is given.
+
+    With `engine="process"` each worker process keeps its own fetch memo,
+    so a repo or dataset shared by rows is fetched at most once per worker
+    rather than once per run, and GraphQL prefetch and LLM pre-submission
+    (which fill the parent's memo and batcher) are skipped.
+    """
+    rows = iter(rows.items() if isinstance(rows, dict) else rows)
+    engine = engine or os.getenv("EVAL_ENGINE", "thread")
+    log = _InferenceLog(inference)
+    if engine == "async":
+        yield from _iter_async(rows, max_in_flight, ordered, store, ops, log)
+        log.report()
+        return
+
+    if max_workers is None:
+        max_workers = env_int("EVAL_WORKERS",
+                               default_processes() if engine == "process" else 1)
+    if max_in_flight is None:
+        max_in_flight = env_int("EVAL_MAX_IN_FLIGHT", max_workers * 2)
+    max_in_flight = max(1, max_workers, max_in_flight)
+
+    evaluate: Callable[[Any, Any], dict] = functools.partial(
+        _evaluate_row, ops=ops)
+    if engine == "process":
+        # Threads here only dispatch rows and wait; fetching and scoring
+        # run on the worker processes
+        evaluate = functools.partial(_evaluate_in_pool,
+                                     get_process_pool(max_workers), ops=ops)
+    evaluate = functools.partial(log.collect, evaluate=evaluate)
+    if store is not None:
+        evaluate = functools.partial(_evaluate_row_stored, store=store,
+                                     evaluate=evaluate, scope=_ops_scope(ops))
+
+    # Rows that share a GitHub repo / HF dataset reuse one fetch per run
+    with batch_scope() as memo:
+        try:
+            # GraphQL prefetch and LLM pre-submission fill this process's
+            # memo and batcher, which worker processes cannot see
+            prepared = (rows if engine == "process"
+                        else _prepared_rows(rows, max_in_flight, memo, ops, store))
+            if max_workers <= 1:
+                for key, links in prepared:
+                    yield key, evaluate(key, links)
+            else:
+                yield from _iter_threaded(prepared, evaluate, max_workers,
+                                          max_in_flight, ordered)
+        finally:
+            llm_batch.reset()
+    log.report()
+    logger.info("LLM cache: %(hits)d hits, %(misses)d misses", llm_cache.stats())
+    if store is not None and store.reuse:
+        logger.info("Score store: %(hits)d reused, %(misses)d re-scored",
+                    store.stats())
+
+
+def _prepared_rows(rows: Iterator[Row], chunk_size: int,
+                   memo: Optional[FetchMemo] = None,
+                   ops: Optional[List[Operationalization]] = None,
+                   store: Optional[ScoreStore] = None) -> Iterator[Row]:
+    """
+    Pass rows through, pulling them a chunk at a time so that each chunk's
+    GitHub repos can be prefetched (GraphQL) and its LLM URLs queued
+    (LLM_BATCH) before the rows are evaluated. A chunk holds at least one
+    full batch of rows, whatever the in-flight bound, so that GraphQL
+    queries carry GITHUB_GRAPHQL_BATCH repos and pre-submission can fill
+    LLM_BATCH_SIZE batches.
+    """
+    if _llm.PURDUE_GENAI_API_KEY and llm_batch.batching_enabled():
+        chunk_size = max(chunk_size, llm_batch.batch_size())
+    prime_github = (memo is not None and graphql_enabled()
+                    and _needs_source(ops, "github"))
+    if prime_github:
+        chunk_size = max(chunk_size, graphql_batch_size())
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        if prime_github:
+            primed = prime_memo(memo, [links[0] for _, links in chunk
+                                       if links and links[0]])
+            logger.info("Prefetched %d GitHub repos via GraphQL", primed)
+        _presubmit_llm(dict(chunk), ops, store)
+        yield from chunk
+
+
+def _presubmit_llm(models: Dict[str, List[Optional[str]]],
+                   ops: Optional[List[Operationalization]] = None,
+                   store: Optional[ScoreStore] = None) -> None:
+    """
+    Queue every row's LLM-scored URLs up front so batches fill (LLM_BATCH=on).
 
-        # Fetch comprehensive context (HF API + GitHub + heuristics)
-        comprehensive = fetch_comprehensive_metrics_data(
-            code_url=code_url or "",
-            dataset_url=dataset_url or "",
-            model_url=model_url or "",
-        )
-        context = {
-            "code_url": code_url,
-            "dataset_url": dataset_url,
-            "model_url": model_url,
-            **comprehensive,
-        }
+    Rows that an incremental `store` will serve unchanged are skipped.
+    """
+    if not (_llm.PURDUE_GENAI_API_KEY and llm_batch.batching_enabled()):
+        return
+    if store is not None and store.reuse:
+        scope = _ops_scope(ops)
+        models = {key: links for key, links in models.items()
+                  if _stored_record(links, store, scope, count=False)[2] is None}
+    registry = build_registry_from_plan()
+    metrics = [m for m in (registry.get(op.metric_id)
+                                  for op in (default_ops if ops is None else ops))
+               if hasattr(m, "llm_target")]
+    for links in models.values():
+        padded = list(links or []) + [None] * 3
+        context = {"code_url": padded[0] or "", "dataset_url": padded[1] or "",
+                   "model_url": padded[2] or ""}
+        for metric in metrics:
+            url = metric.llm_target(context)
+            if url:
+                llm_batch.submit(url, metric.llm_prompt)
+
+
+def _iter_threaded(rows: Iterator[Row], evaluate: Callable[[Any, Any], dict],
+                   max_workers: int, max_in_flight: int,
+                   ordered: bool) -> Iterator[Tuple[Any, dict]]:
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        if ordered:
+            # Futures are drained oldest-first, which keeps the output in
+            # input order and caps the rows submitted but not yet yielded.
+            pending: Deque[Tuple[Any, Future]] = deque()
+            for key, links in rows:
+                pending.append((key, ex.submit(evaluate, key, links)))
+                if len(pending) >= max_in_flight:
+                    done_key, fut = pending.popleft()
+                    yield done_key, fut.result()
+            while pending:
+                done_key, fut = pending.popleft()
+                yield done_key, fut.result()
+            return
+
+        running: Dict[Future, Any] = {}
+        exhausted = False
+        while running or not exhausted:
+            while not exhausted and len(running) < max_in_flight:
+                row = next(rows, None)
+                if row is None:
+                    exhausted = True
+                    break
+                key, links = row
+                running[ex.submit(evaluate, key, links)] = key
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield running.pop(fut), fut.result()
+
+
+def _iter_async(rows: Iterator[Row], max_in_flight: Optional[int],
+                ordered: bool,
+                store: Optional[ScoreStore] = None,
+                ops: Optional[List[Operationalization]] = None,
+                log: Optional[_InferenceLog] = None
+                ) -> Iterator[Tuple[Any, dict]]:
+    """
+    Run the async engine on a helper thread and yield its records.
 
-        metric_latency_map = {
-            "ramp_up_time": "hf_model_latency",
-            # "bus_factor": "github_latency",
-            "performance_claims": "hf_model_latency",
-            # "license_compliance": "github_latency",
-            "size": "hf_model_latency",
-            "availability": "availability_latency",
-            "dataset_quality": "hf_dataset_latency",
-            "code_quality": "github_latency",
-        }
+    A row takes one of `max_in_flight` slots when a worker pulls it and
+    gives it back once its record is yielded, so rows evaluated ahead of a
+    slow one (queued, or held for ordering) never exceed the bound.
+    """
+    import asyncio
+
+    max_in_flight = _async_in_flight(max_in_flight)
+    results: "queue.Queue[Any]" = queue.Queue(maxsize=max_in_flight)
+    finished = object()
+    started = threading.Event()
+    loop: Optional["asyncio.AbstractEventLoop"] = None
+    slots: Optional["asyncio.Semaphore"] = None
+
+    async def main() -> None:
+        nonlocal loop, slots
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(max_in_flight)
+        started.set()
+        await _run_async_rows(
+            rows, max_in_flight,
+            lambda index, key, record: results.put((index, key, record)),
+            store, ops, log, slots)
+
+    def run() -> None:
+        try:
+            asyncio.run(main())
+        except BaseException as e:  # re-raised in the consuming thread
+            results.put(e)
+        finally:
+            started.set()
+            results.put(finished)
+
+    def release() -> None:
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(slots.release)
+
+    threading.Thread(target=run, name="eval-async", daemon=True).start()
+    started.wait()
+
+    held: Dict[int, Tuple[Any, dict]] = {}
+    next_index = 0
+    while True:
+        item = results.get()
+        if item is finished:
+            break
+        if isinstance(item, BaseException):
+            raise item
+        index, key, record = item
+        if not ordered:
+            yield key, record
+            release()
+            continue
+        held[index] = (key, record)
+        while next_index in held:
+            yield held.pop(next_index)
+            next_index += 1
+            release()
+
+
+def _async_in_flight(max_in_flight: Optional[int]) -> int:
+    if max_in_flight is None:
+        max_in_flight = env_int("EVAL_MAX_IN_FLIGHT", 256)
+    return max(1, max_in_flight)
+
+
+async def _run_async_rows(rows: Iterator[Row], max_in_flight: Optional[int],
+                          emit: Callable[[int, Any, dict], None],
+                          store: Optional[ScoreStore] = None,
+                          ops: Optional[List[Operationalization]] = None,
+                          log: Optional[_InferenceLog] = None,
+                          slots: Optional["asyncio.Semaphore"] = None) -> None:
+    """
+    Evaluate rows with `max_in_flight` worker coroutines; emit(index, key, record).
 
-        results, summary, latencies = run_metrics(default_ops, context=context)
-
-        # helpers for mapping
-        def get_metric(metric_id: str, default=None):
-            m = results.get(metric_id)
-            return m.value if m is not None else default
-
-        def get_latency(metric_id: str) -> Optional[int]:
-            latency_key = metric_latency_map.get(metric_id)
-            m = latencies.get(latency_key) if latency_key else None
-            return int(m * 1000) if m is not None else None
-
-        size_metric = results.get("size")
-        size_score = size_metric.details.get(
-            "size_score") if size_metric and hasattr(size_metric, "details") else None
-        license_metric = results.get("license_compliance")
-        license_seconds = license_metric.seconds * 1000 if license_metric else None
-        bus_factor_metric = results.get("bus_factor")
-        bus_factor_seconds = bus_factor_metric.seconds * 1000 if bus_factor_metric else None
-        ndjson_args = {
-            # summary
-            "net_score": float(summary.get("net_score", 0.0)),
-            "net_score_latency": int(summary.get("net_score_latency", 0) or 0),
-            # individual metrics
-            "ramp_up_time": get_metric("ramp_up_time"),
-            "ramp_up_time_latency": get_latency("ramp_up_time"),
-            "bus_factor": get_metric("bus_factor"),
-            "bus_factor_latency": bus_factor_seconds,
-            "performance_claims": get_metric("performance_claims"),
-            "performance_claims_latency": get_latency("performance_claims"),
-            "license": get_metric("license_compliance"),
-            "license_latency": license_seconds,
-            "raspberry_pi": size_score.get("raspberry_pi") if isinstance(size_score, dict) else None,
-            "jetson_nano": size_score.get("jetson_nano") if isinstance(size_score, dict) else None,
-            "desktop_pc": size_score.get("desktop_pc") if isinstance(size_score, dict) else None,
-            "aws_server": size_score.get("aws_server") if isinstance(size_score, dict) else None,
-            "size_score_latency": get_latency("size"),
-            "dataset_and_code_score": get_metric("availability"),
-            "dataset_and_code_score_latency": get_latency("availability"),
-            "dataset_quality": get_metric("dataset_quality"),
-            "dataset_quality_latency": get_latency("dataset_quality"),
-            "code_quality": get_metric("code_quality"),
-            "code_quality_latency": get_latency("code_quality"),
-        }
+    With `slots`, a worker acquires one before pulling each row; the
+    consumer releases it once the row's record has been handed on.
+    """
+    import asyncio
+    from src.metrics.data_fetcher.async_engine import AsyncFetchEngine
+
+    max_in_flight = _async_in_flight(max_in_flight)
+    loop = asyncio.get_running_loop()
+    numbered = enumerate(_prepared_rows(rows, max_in_flight, ops=ops, store=store))
+    pull_lock = threading.Lock()
+    fetch_kwargs = _fetch_kwargs(ops)
+    scope = _ops_scope(ops)
+
+    def pull() -> Optional[Tuple[int, Row]]:
+        # runs in the executor: pulling a chunk may look rows up in the
+        # store (fingerprint requests) before pre-submitting their LLM URLs
+        with pull_lock:
+            return next(numbered, None)
+
+    async def worker(engine: AsyncFetchEngine) -> None:
+        while True:
+            if slots is not None:
+                await slots.acquire()
+            row = await loop.run_in_executor(None, pull)
+            if row is None:
+                if slots is not None:
+                    slots.release()
+                return
+            index, (key, links) = row
+            source, record = (list(links) if links else links), None
+            if store is not None:
+                rid, fp, record = await loop.run_in_executor(
+                    None, _stored_record, source, store, scope)
+            if record is None:
+                inference: Dict[Any, List[str]] = {}
+                category, links = await loop.run_in_executor(
+                    None, _classify_row, key, links, inference)
+                if log is not None:
+                    log.add(key, inference.get(key))
+                comprehensive = await engine.fetch_comprehensive_metrics_data(
+                    links[0] or "", links[1] or "", links[2] or "",
+                    **fetch_kwargs)
+                record = await loop.run_in_executor(
+                    None, _score_row, links, category, comprehensive, ops)
+                if store is not None:
+                    store.save(rid, fp, record)
+            if store is not None:
+                store.add_result(source, record)
+            emit(index, key, record)
 
-        ndjsons[key] = default_ndjson(
-            model=model_url, category=categories.get(key), **ndjson_args)
+    try:
+        # fingerprints looked up ahead of pre-submission are reused per row
+        with batch_scope():
+            async with AsyncFetchEngine() as engine:
+                await asyncio.gather(*(worker(engine)
+                                       for _ in range(max_in_flight)))
+    finally:
+        llm_batch.reset()
+
+
+async def handle_url_async(models: Dict[str, List[Optional[str]]],
+                           *,
+                           max_in_flight: Optional[int] = None) -> Dict[str, dict]:
+    """
+    Event-loop driven counterpart of `handle_url`.
 
-    return ndjsons
+    `max_in_flight` (env EVAL_MAX_IN_FLIGHT, default 256) worker coroutines
+    pull rows from the input, so only that many rows are held at once.
+    Classification and metric scoring (which may call GenAI) run in the
+    default executor; all source fetches stay on the event loop.
+    """
+    done: Dict[str, dict] = {}
+    await _run_async_rows(iter(models.items()), max_in_flight,
+                          lambda index, key, record: done.__setitem__(key, record))
+    return {key: done[key] for key in models}
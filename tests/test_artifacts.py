@@ -0,0 +1,107 @@
+"""
+Tests for the content-addressed Hugging Face artifact cache.
+"""
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+from src.metrics.data_fetcher.artifacts import (
+    ArtifactCache, artifact_cache, fetch_artifact)
+from src.metrics.data_fetcher.huggingface import get_huggingface_file, get_model_card
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+def make_response(status=200, content=b"", commit=None, etag=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.content = content
+    resp.raise_for_status.return_value = None
+    resp.headers = {}
+    if commit:
+        resp.headers["X-Repo-Commit"] = commit
+    if etag:
+        resp.headers["ETag"] = etag
+    return resp
+
+
+class TestArtifactCache:
+    """Test download reuse and revision checks."""
+
+    @patch('requests.Session.head')
+    @patch('requests.Session.get')
+    def test_fresh_ref_is_served_without_requests(self, mock_get, mock_head):
+        mock_get.return_value = make_response(content=b"# card\nlicense: mit",
+                                              commit="c1")
+
+        first = get_huggingface_file("https://huggingface.co/o/m")
+        second = fetch_artifact("o/m", "README.md")
+
+        assert first == second
+        with open(first, "rb") as f:
+            assert f.read() == b"# card\nlicense: mit"
+        assert mock_get.call_count == 1
+        mock_head.assert_not_called()
+        assert mock_get.call_args[0][0] == (
+            "https://huggingface.co/o/m/resolve/main/README.md")
+
+    @patch.dict(os.environ, {"ARTIFACT_REVISION_TTL": "0"})
+    @patch('requests.Session.head')
+    @patch('requests.Session.get')
+    def test_stale_ref_downloads_only_when_commit_changes(self, mock_get, mock_head):
+        mock_get.return_value = make_response(content=b"v1", commit="c1")
+        path = fetch_artifact("o/m", "README.md")
+
+        mock_head.return_value = make_response(commit="c1")
+        assert fetch_artifact("o/m", "README.md") == path
+        assert mock_get.call_count == 1
+
+        mock_head.return_value = make_response(commit="c2")
+        mock_get.return_value = make_response(content=b"v2", commit="c2")
+        updated = fetch_artifact("o/m", "README.md")
+        assert updated != path
+        with open(updated, "rb") as f:
+            assert f.read() == b"v2"
+
+        # offline: the cached copy is still served
+        mock_head.side_effect = ConnectionError("offline")
+        assert fetch_artifact("o/m", "README.md") == updated
+
+    @patch('requests.Session.get')
+    def test_identical_content_is_stored_once(self, mock_get):
+        mock_get.return_value = make_response(content=b"same", commit="c1")
+        assert fetch_artifact("o/a", "README.md") == fetch_artifact(
+            "o/b", "README.md")
+        blobs = os.path.join(artifact_cache.directory, "blobs")
+        assert len(os.listdir(blobs)) == 1
+
+    def test_directory_override_and_lru_quota(self, tmp_path):
+        cache = ArtifactCache(directory=str(tmp_path / "art"), max_bytes=250)
+        digests = []
+        for i in range(3):
+            digests.append(cache.put_blob(bytes([i]) * 100))
+            path = cache.blob_path(digests[-1])
+            os.utime(path, (time.time() + i, time.time() + i))
+
+        assert cache.blob_path(digests[0]).startswith(str(tmp_path / "art"))
+        assert not os.path.exists(cache.blob_path(digests[0]))
+        assert os.path.exists(cache.blob_path(digests[2]))
+
+    @patch('tempfile.mkstemp')
+    @patch('requests.Session.get')
+    def test_disabled_cache_reads_model_card_without_temp_files(self, mock_get,
+                                                                mock_mkstemp):
+        mock_get.return_value = make_response(content=b"license: mit", commit="c1")
+        artifact_cache.enabled = False
+        try:
+            assert get_model_card("https://huggingface.co/o/m") == "license: mit"
+        finally:
+            artifact_cache.enabled = True
+        mock_mkstemp.assert_not_called()
+        assert not os.path.exists(os.path.join(artifact_cache.directory, "blobs"))
+
+    def test_unknown_model_url(self):
+        assert get_huggingface_file("https://example.com/not-hf") is None
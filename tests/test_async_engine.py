@@ -0,0 +1,267 @@
+"""
+Tests for the asyncio fetch engine and the async batch runner.
+
+The engine's `_request` is replaced with a coroutine that serves canned
+responses, so no network access is needed.
+"""
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.metrics.data_fetcher.async_engine import (  # noqa: E402
+    AsyncFetchEngine, model_data_from_api)
+from src.score_store import ScoreStore  # noqa: E402
+from src.url_parsers.url_type_handler import (  # noqa: E402
+    handle_url, iter_handle_url)
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def fake_transport(routes, calls):
+    """Build a `_request` replacement that answers from `routes`."""
+    async def _request(method, url, **kwargs):
+        calls.append((method, url))
+        await asyncio.sleep(0)
+        for prefix, (status, body) in routes.items():
+            if url.startswith(prefix):
+                return status, body, {}
+        return 404, None, {}
+    return _request
+
+
+GITHUB_ROUTES = {
+    "https://api.github.com/repos/owner/repo/contributors": (
+        200, [{"contributions": 30}, {"contributions": 10}]),
+    "https://api.github.com/repos/owner/repo/git/trees/main": (
+        200, {"tree": [{"path": "setup.py", "type": "blob"},
+                       {"path": "tests/test_x.py", "type": "blob"},
+                       {"path": "tests", "type": "tree"}]}),
+    "https://api.github.com/repos/owner/repo": (
+        200, {"stargazers_count": 42, "forks_count": 3,
+              "license": {"spdx_id": "MIT"},
+              "updated_at": "2024-01-01T00:00:00Z"}),
+    "https://huggingface.co/api/models/owner/model": (
+        200, {"id": "owner/model", "sha": "abc", "downloads": 1000,
+              "cardData": {"license": "apache-2.0"},
+              "siblings": [{"rfilename": "a", "size": 100},
+                           {"rfilename": "b", "size": 200}]}),
+    "https://": (200, None),
+}
+
+
+class TestAsyncFetchEngine:
+    """Async counterparts return the same shapes as the blocking helpers."""
+
+    def test_model_data_from_api(self):
+        data = model_data_from_api(
+            {"modelId": "m", "cardData": {"license": "mit"},
+             "siblings": [{"size": 5}, {"size": None}]}, "m")
+        assert data["license"] == "mit"
+        assert data["total_size_bytes"] == 5
+        assert data["model_id"] == "m"
+
+    def test_github_repo_data(self):
+        calls = []
+
+        async def go():
+            async with AsyncFetchEngine() as engine:
+                engine._request = fake_transport(GITHUB_ROUTES, calls)
+                return await engine.get_github_repo_data(
+                    "https://github.com/owner/repo")
+
+        data = run(go())
+        assert data["stars"] == 42
+        assert data["license"] == "MIT"
+        assert data["files"] == ["setup.py", "tests/test_x.py"]
+        assert data["contributors"]["contributors_count"] == 2
+        assert data["contributors"]["top_contributor_pct"] == 0.75
+
+    def test_check_availability(self):
+        calls = []
+        routes = {"https://github.com/": (200, None),
+                  "https://huggingface.co/datasets/": (404, None)}
+
+        async def go():
+            async with AsyncFetchEngine() as engine:
+                engine._request = fake_transport(routes, calls)
+                return await engine.check_availability(
+                    "https://github.com/owner/repo",
+                    "https://huggingface.co/datasets/x/y", "")
+
+        result = run(go())
+        assert result == {"has_code": True, "has_dataset": False,
+                          "has_model": False, "links_ok": False}
+
+    def test_fetch_comprehensive_is_single_flight(self):
+        calls = []
+
+        async def go():
+            async with AsyncFetchEngine() as engine:
+                engine._request = fake_transport(GITHUB_ROUTES, calls)
+                return await asyncio.gather(*(
+                    engine.fetch_comprehensive_metrics_data(
+                        "https://github.com/owner/repo", "",
+                        "https://huggingface.co/owner/model")
+                    for _ in range(5)))
+
+        results = run(go())
+        assert all(r["license"] == "apache-2.0" for r in results)
+        assert results[0]["repo_meta"]["contributors_count"] == 2
+        assert results[0]["hf_model_latency"] is not None
+        assert results[0]["github_latency"] is not None
+        repo_gets = [c for c in calls
+                     if c == ("GET", "https://api.github.com/repos/owner/repo")]
+        assert len(repo_gets) == 1
+
+    def test_single_flight_drops_failures(self):
+        """An error or empty result is retried by the next row, not reused."""
+        outcomes = [RuntimeError("reset"), {}, None, {"stars": 1}]
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            outcome = outcomes[len(calls) - 1]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        async def go():
+            async with AsyncFetchEngine() as engine:
+                results = []
+                for _ in range(5):
+                    try:
+                        results.append(await engine._single_flight(
+                            "github", "https://github.com/o/r", fetch))
+                    except RuntimeError:
+                        results.append("error")
+                return results
+
+        assert run(go()) == ["error", {}, None, {"stars": 1}, {"stars": 1}]
+        assert len(calls) == 4
+
+    @patch('requests.Session.get', side_effect=AssertionError("blocking GET"))
+    def test_model_card_fetched_on_the_loop_and_cached(self, mock_get):
+        calls = []
+        routes = {"https://huggingface.co/o/m/resolve/main/README.md": (
+            200, b"# Card")}
+
+        async def go():
+            async with AsyncFetchEngine() as engine:
+                engine._request = fake_transport(routes, calls)
+                return await engine.get_model_card("https://huggingface.co/o/m")
+
+        assert run(go()) == "# Card"
+        assert run(go()) == "# Card"  # second engine: served from the cache
+        assert calls == [("GET", "https://huggingface.co/o/m/resolve/main/README.md")]
+        mock_get.assert_not_called()
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    def test_genai_metric_data(self):
+        calls = []
+        routes = {"https://genai.rcac.purdue.edu/": (
+            200, {"choices": [{"message": {"content": " 0.9 "}}]})}
+
+        async def go():
+            async with AsyncFetchEngine() as engine:
+                engine._request = fake_transport(routes, calls)
+                return await engine.get_genai_metric_data(
+                    "https://huggingface.co/m", "rate")
+
+        assert run(go()) == {"metric": "0.9"}
+
+
+class TestHandleURLAsync:
+    """The async batch runner keeps input order."""
+
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_async_engine_preserves_order(self, mock_category, mock_run_metrics):
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+
+        async def fake_fetch(self, code_url, dataset_url, model_url):
+            await asyncio.sleep(0.001 * (hash(model_url) % 5))
+            return {}
+
+        models = {i: [None, None, f"https://huggingface.co/o/m{i}"]
+                  for i in range(10)}
+        with patch.object(AsyncFetchEngine, "fetch_comprehensive_metrics_data",
+                          fake_fetch):
+            result = handle_url(models, engine="async", max_in_flight=4)
+
+        assert list(result) == list(range(10))
+        assert [r["name"] for r in result.values()] == [
+            f"m{i}" for i in range(10)]
+
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_rows_ahead_of_a_slow_row_are_bounded(self, mock_category,
+                                                 mock_run_metrics):
+        """Ordered output does not buffer the whole input behind row 0."""
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        started = []
+
+        async def fake_fetch(self, code_url, dataset_url, model_url, **kwargs):
+            started.append(model_url)
+            if model_url.endswith("/m0"):
+                await asyncio.sleep(0.2)
+            return {}
+
+        models = ((i, [None, None, f"https://huggingface.co/o/m{i}"])
+                  for i in range(200))
+        with patch.object(AsyncFetchEngine, "fetch_comprehensive_metrics_data",
+                          fake_fetch):
+            results = iter_handle_url(models, engine="async", max_in_flight=4)
+            first_key, _ = next(results)
+            seen_at_first = len(started)
+            rest = [key for key, _ in results]
+
+        assert first_key == 0
+        assert seen_at_first <= 4
+        assert rest == list(range(1, 200))
+
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_engines_store_the_input_links(self, mock_category,
+                                           mock_run_metrics, tmp_path):
+        def classify(row, inference=None):
+            for links in row.values():
+                links[1] = "https://huggingface.co/datasets/o/inferred"
+            return {k: "MODEL" for k in row}
+
+        mock_category.side_effect = classify
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+
+        async def fake_fetch(self, code_url, dataset_url, model_url, **kwargs):
+            return {}
+
+        recorded = {}
+        for engine in ("thread", "async"):
+            models = {"m": [None, None, "https://huggingface.co/o/m"]}
+            with ScoreStore(str(tmp_path / f"{engine}.sqlite")) as store, \
+                    patch.object(ScoreStore, "add_result") as add_result, \
+                    patch.object(AsyncFetchEngine,
+                                 "fetch_comprehensive_metrics_data", fake_fetch), \
+                    patch('src.url_parsers.url_type_handler.'
+                          'fetch_comprehensive_metrics_data', return_value={}):
+                handle_url(models, engine=engine, store=store)
+            recorded[engine] = add_result.call_args[0][0]
+
+        assert recorded["async"] == recorded["thread"] == [
+            None, None, "https://huggingface.co/o/m"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
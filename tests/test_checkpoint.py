@@ -0,0 +1,169 @@
+"""
+Tests for the checkpoint journal and CLI resume.
+"""
+import json
+import os
+import sys
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from src.cli.checkpoint import CheckpointJournal, CheckpointMismatch, input_identity
+from src.cli.main import main
+from src.cli.schema import default_ndjson
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+def replayed(path):
+    """Every record a resumed journal at `path` would replay, by key."""
+    with CheckpointJournal(path, resume=True) as journal:
+        return {key: journal.replay(key) for key in journal.done}
+
+
+class TestCheckpointJournal:
+    """Test journal writes and reloads."""
+
+    def test_roundtrip(self, tmp_path):
+        path = str(tmp_path / "run.ckpt")
+        with CheckpointJournal(path) as journal:
+            journal.record(0, {"name": "a"})
+            journal.record(2, {"name": "c"})
+            # rows of this run are not held in memory
+            assert journal.done == {}
+
+        assert replayed(path) == {0: {"name": "a"}, 2: {"name": "c"}}
+        resumed = CheckpointJournal(path, resume=True)
+        assert resumed.is_done(2) and not resumed.is_done(1)
+
+    def test_torn_last_line_ignored_and_appending_continues(self, tmp_path):
+        path = tmp_path / "run.ckpt"
+        path.write_text('{"key": 0, "record": {"name": "a"}}\n{"key": 1, "rec')
+
+        with CheckpointJournal(str(path), resume=True) as journal:
+            assert list(journal.done) == [0]
+            journal.record(1, {"name": "b"})
+
+        assert replayed(str(path)) == {0: {"name": "a"}, 1: {"name": "b"}}
+
+    def test_fresh_run_truncates(self, tmp_path):
+        path = str(tmp_path / "run.ckpt")
+        with CheckpointJournal(path) as journal:
+            journal.record(0, {"name": "a"})
+        with CheckpointJournal(path):
+            pass
+        assert replayed(path) == {}
+
+    def test_header_and_links_guard_resume(self, tmp_path):
+        urls = tmp_path / "urls.txt"
+        urls.write_text(",,https://huggingface.co/o/a\n")
+        identity = input_identity(str(urls))
+        path = str(tmp_path / "run.ckpt")
+        with CheckpointJournal(path, source=identity) as journal:
+            journal.record(0, {"name": "a"}, ["", "", "https://huggingface.co/o/a"])
+
+        resumed = CheckpointJournal(path, resume=True, source=identity)
+        assert resumed.input == identity
+        assert resumed.is_done(0, ["", "", "https://huggingface.co/o/a"])
+        assert not resumed.is_done(0, ["", "", "https://huggingface.co/o/b"])
+
+        urls.write_text(",,https://huggingface.co/o/b\n")
+        with pytest.raises(CheckpointMismatch):
+            CheckpointJournal(path, resume=True, source=input_identity(str(urls)))
+
+
+class TestCLIResume:
+    """A resumed run only evaluates rows missing from the journal."""
+
+    @patch('src.cli.main._check_env_variables')
+    @patch('src.cli.main.iter_handle_url')
+    def test_resume_skips_finished_rows(self, mock_stream, mock_check_env, tmp_path):
+        urls = tmp_path / "urls.txt"
+        urls.write_text("".join(f",,https://huggingface.co/o/m{i}\n" for i in range(4)))
+        ckpt = str(tmp_path / "run.ckpt")
+        evaluated = []
+
+        def fake_stream(rows, **kwargs):
+            for key, links in rows:
+                evaluated.append(key)
+                if key == 2 and len(evaluated) == 3:
+                    raise RuntimeError("worker died")
+                yield key, default_ndjson(model=links[2], category="MODEL")
+
+        mock_stream.side_effect = fake_stream
+        argv = ['main.py', str(urls), '--checkpoint', ckpt]
+
+        with patch('sys.argv', argv), patch('sys.stdout', StringIO()):
+            assert main() == 1  # first run dies at row 2
+
+        out = StringIO()
+        with patch('sys.argv', argv + ['--resume']), patch('sys.stdout', out):
+            assert main() == 0
+
+        assert evaluated == [0, 1, 2, 2, 3]
+        names = [json.loads(line)["name"] for line in out.getvalue().splitlines()]
+        assert names == ["m0", "m1", "m2", "m3"]
+
+    @patch('src.cli.main._check_env_variables')
+    @patch('src.cli.main.iter_handle_url')
+    def test_replayed_records_keep_input_order(self, mock_stream, mock_check_env,
+                                               tmp_path):
+        urls = tmp_path / "urls.txt"
+        urls.write_text("".join(f",,https://huggingface.co/o/m{i}\n" for i in range(4)))
+        ckpt = str(tmp_path / "run.ckpt")
+        with CheckpointJournal(ckpt, source=input_identity(str(urls))) as journal:
+            for i in (0, 2):
+                journal.record(i, default_ndjson(model=f"https://huggingface.co/o/m{i}",
+                                                 category="MODEL"),
+                               ["", "", f"https://huggingface.co/o/m{i}"])
+        evaluated = []
+
+        def fake_stream(rows, **kwargs):
+            for key, links in rows:
+                evaluated.append(key)
+                yield key, default_ndjson(model=links[2], category="MODEL")
+
+        mock_stream.side_effect = fake_stream
+        out = StringIO()
+        argv = ['main.py', str(urls), '--checkpoint', ckpt, '--resume']
+        with patch('sys.argv', argv), patch('sys.stdout', out):
+            assert main() == 0
+
+        assert evaluated == [1, 3]
+        names = [json.loads(line)["name"] for line in out.getvalue().splitlines()]
+        assert names == ["m0", "m1", "m2", "m3"]
+
+    @patch('src.cli.main._check_env_variables')
+    @patch('src.cli.main.iter_handle_url')
+    def test_resume_refuses_journal_of_other_input(self, mock_stream, mock_check_env,
+                                                   tmp_path):
+        urls = tmp_path / "urls.txt"
+        urls.write_text(",,https://huggingface.co/o/m0\n")
+        ckpt = str(tmp_path / "run.ckpt")
+        mock_stream.side_effect = lambda rows, **kw: (
+            (key, default_ndjson(model=links[2], category="MODEL")) for key, links in rows)
+        with patch('sys.argv', ['main.py', str(urls), '--checkpoint', ckpt]), \
+                patch('sys.stdout', StringIO()):
+            assert main() == 0
+
+        urls.write_text(",,https://huggingface.co/o/other\n")
+        out = StringIO()
+        with patch('sys.argv', ['main.py', str(urls), '--checkpoint', ckpt, '--resume']), \
+                patch('sys.stdout', out), patch('sys.stderr', StringIO()) as err:
+            assert main() == 1
+        assert out.getvalue() == ""
+        assert "checkpoint" in err.getvalue()
+
+    @patch('src.cli.main._check_env_variables')
+    def test_resume_requires_checkpoint(self, mock_check_env, tmp_path):
+        urls = tmp_path / "urls.txt"
+        urls.write_text(",,https://huggingface.co/o/m\n")
+        with patch('sys.argv', ['main.py', str(urls), '--resume']):
+            assert main() == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+"""
+Tests for offline URL classification and GenAI call avoidance.
+"""
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.url_parsers.classifier import classify_url, reload_index
+from src.url_parsers.url_type_handler import get_url_category
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestClassifyURL:
+    """Test pattern rules and the known-host index."""
+
+    @pytest.mark.parametrize("url,kind,source", [
+        ("https://huggingface.co/datasets/owner/data", "DATASET", "pattern"),
+        ("https://huggingface.co/spaces/owner/app", "CODE", "pattern"),
+        ("https://github.com/owner/repo", "CODE", "pattern"),
+        ("https://huggingface.co/owner/model", "MODEL", "pattern"),
+        ("https://www.kaggle.com/datasets/owner/data", "DATASET", "host_index"),
+        ("https://www.kaggle.com/models/owner/m", "MODEL", "host_index"),
+        ("https://zenodo.org/records/123", "DATASET", "host_index"),
+        ("https://arxiv.org/abs/1810.04805", "PAPER", "host_index"),
+        ("https://huggingface.co/datasets/squad", "DATASET", "host_index"),
+        ("https://example.com/data", None, "unknown"),
+        ("", None, "unknown"),
+    ])
+    def test_classify(self, url, kind, source):
+        result = classify_url(url)
+        assert (result.kind, result.source) == (kind, source)
+
+    def test_user_index_extends_known_hosts(self, tmp_path, monkeypatch):
+        index = tmp_path / "hosts.json"
+        index.write_text(json.dumps({"data.example.org": "dataset"}))
+        monkeypatch.setenv("URL_HOST_INDEX", str(index))
+        reload_index()
+        try:
+            assert classify_url("https://data.example.org/x").kind == "DATASET"
+        finally:
+            monkeypatch.delenv("URL_HOST_INDEX")
+            reload_index()
+
+
+class TestInferenceAvoidance:
+    """GenAI is only consulted for links the offline rules cannot settle."""
+
+    @patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', 'test_key')
+    @patch('src.url_parsers.url_type_handler._genai_single_url')
+    def test_known_links_need_no_llm(self, mock_genai):
+        models = {"r": ["https://github.com/o/r",
+                        "https://www.kaggle.com/datasets/o/d",
+                        "https://huggingface.co/o/m"]}
+        inference = {}
+
+        get_url_category(models, inference=inference)
+
+        mock_genai.assert_not_called()
+        assert inference == {"r": []}
+
+    @patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', 'test_key')
+    @patch('src.url_parsers.url_type_handler._genai_single_url')
+    def test_filled_dataset_url_not_revalidated_by_llm(self, mock_genai):
+        """An unknown dataset URL costs at most two calls, not three."""
+        mock_genai.side_effect = ["no", "https://example.net/dataset"]
+        models = {"r": ["https://github.com/o/r", "https://example.com/d",
+                        "https://huggingface.co/o/m"]}
+        inference = {}
+
+        get_url_category(models, inference=inference)
+
+        assert mock_genai.call_count == 2
+        assert models["r"][1] == "https://example.com/d"
+        assert inference == {"r": ["dataset_validity", "dataset_url"]}
+
+    @patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', 'test_key')
+    @patch('src.url_parsers.url_type_handler._genai_single_url')
+    def test_known_non_dataset_rejected_offline(self, mock_genai):
+        mock_genai.return_value = "https://huggingface.co/datasets/o/d"
+        models = {"r": ["https://github.com/o/r", "https://arxiv.org/abs/1",
+                        "https://huggingface.co/o/m"]}
+
+        get_url_category(models)
+
+        mock_genai.assert_called_once()
+        assert models["r"][1] == "https://huggingface.co/datasets/o/d"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -8,6 +8,7 @@ import pytest
 import sys
 import os
 import tempfile
+import json
 from unittest.mock import Mock, patch, mock_open, MagicMock
 from io import StringIO
 
@@ -84,7 +85,7 @@ class TestMainFunction:
     """Test the main function integration."""
 
     @patch('src.cli.main._check_env_variables')
-    @patch('src.cli.main.handle_url')
+    @patch('src.cli.main.iter_handle_url')
     @patch('src.cli.main.get_url_category')
     @patch('sys.stdout', new_callable=StringIO)
     def test_main_function_basic(self, mock_stdout, mock_category, mock_handle, mock_check_env):
@@ -94,12 +95,12 @@ class TestMainFunction:
 
         # Mock URL processing
         mock_category.return_value = {"test": "MODEL"}
-        mock_handle.return_value = {
-            "test": {
+        mock_handle.return_value = iter([
+            ("test", {
                 "name": "test",
                 "net_score": 0.75
-            }
-        }
+            })
+        ])
 
         # Create a temporary input file
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
@@ -212,14 +213,14 @@ class TestCLICompatibility:
         assert callable(_check_env_variables)
 
     @patch('src.cli.main._check_env_variables')
-    @patch('src.cli.main.handle_url')
+    @patch('src.cli.main.iter_handle_url')
     @patch('src.cli.main.get_url_category')
     def test_main_function_signature(self, mock_category, mock_handle, mock_check_env):
         """Test that main function has expected signature."""
         # Should be callable without arguments
         mock_check_env.return_value = None
         mock_category.return_value = {}
-        mock_handle.return_value = {}
+        mock_handle.return_value = iter([])
 
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
             f.write("https://example.com")
@@ -241,5 +242,62 @@ class TestCLICompatibility:
             os.unlink(temp_filename)
 
 
+class TestMetricSelection:
+    """--metrics picks a subset of the default plan."""
+
+    @patch('src.cli.main._check_env_variables')
+    @patch('src.cli.main.iter_handle_url')
+    def test_metrics_flag_passes_ops(self, mock_stream, mock_check_env, tmp_path):
+        urls = tmp_path / "urls.txt"
+        urls.write_text(",,https://huggingface.co/o/m\n")
+        mock_stream.return_value = iter([])
+
+        with patch('sys.argv', ['main.py', str(urls), '--metrics', 'license_compliance,size']):
+            assert main() == 0
+        ops = mock_stream.call_args.kwargs["ops"]
+        assert [op.metric_id for op in ops] == ["license_compliance", "size"]
+
+        with patch('sys.argv', ['main.py', str(urls), '--metrics', 'nope']):
+            assert main() == 1
+
+
+class TestStreamingOutput:
+    """Records are written and flushed one by one as rows finish."""
+
+    @patch('src.cli.main._check_env_variables')
+    @patch('src.cli.main.iter_handle_url')
+    def test_records_streamed_as_produced(self, mock_stream, mock_check_env):
+        from src.cli.schema import default_ndjson
+
+        out = StringIO()
+        seen = []
+
+        def fake_stream(rows, **kwargs):
+            for key, links in rows:
+                # earlier records are already on stdout when the next row is read
+                seen.append(out.getvalue().count("\n"))
+                yield key, default_ndjson(model=links[2], category="MODEL")
+            yield "bad", {"name": "bad"}
+
+        mock_stream.side_effect = fake_stream
+
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(",,https://huggingface.co/o/a\n,,https://huggingface.co/o/b\n")
+            temp_filename = f.name
+
+        try:
+            with patch('sys.argv', ['main.py', temp_filename, '--order', 'completed']), \
+                    patch('sys.stdout', out):
+                assert main() == 0
+        finally:
+            os.unlink(temp_filename)
+
+        lines = out.getvalue().splitlines()
+        assert seen == [0, 1]
+        assert [json.loads(line)["name"] for line in lines] == ["a", "b", "bad"]
+        assert json.loads(lines[2])["error"] == "Invalid record"
+        assert mock_stream.call_args.kwargs["ordered"] is False
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,103 @@
+"""
+Tests for the incremental CLI input reader.
+"""
+import gzip
+import io
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.cli.reader import iter_rows, parse_line, prefetch
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+CONTENT = (
+    "# catalog export\n"
+    "https://github.com/o/r,,https://huggingface.co/o/m\n"
+    "\n"
+    "   \n"
+    ",https://huggingface.co/datasets/o/d,https://huggingface.co/o/n\n"
+)
+EXPECTED = [
+    (1, ["https://github.com/o/r", "", "https://huggingface.co/o/m"]),
+    (4, ["", "https://huggingface.co/datasets/o/d", "https://huggingface.co/o/n"]),
+]
+
+
+class TestParseLine:
+    """Test single-line parsing."""
+
+    def test_blank_and_comment_lines_skipped(self):
+        assert parse_line("") is None
+        assert parse_line("   \n") is None
+        assert parse_line("# note") is None
+
+    def test_short_rows_padded(self):
+        assert parse_line("https://huggingface.co/o/m") == [
+            "https://huggingface.co/o/m", "", ""]
+
+
+class TestIterRows:
+    """Test plain, gzip and stdin input."""
+
+    def test_plain_file(self, tmp_path):
+        path = tmp_path / "urls.txt"
+        path.write_text(CONTENT)
+        assert list(iter_rows(str(path))) == EXPECTED
+
+    def test_gzip_file(self, tmp_path):
+        path = tmp_path / "urls.txt.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(CONTENT)
+        assert list(iter_rows(str(path))) == EXPECTED
+
+    def test_stdin(self):
+        with patch('sys.stdin', io.StringIO(CONTENT)):
+            assert list(iter_rows("-")) == EXPECTED
+
+    def test_rows_are_read_lazily(self, tmp_path):
+        path = tmp_path / "urls.txt"
+        path.write_text("".join(f",,https://huggingface.co/o/m{i}\n"
+                                for i in range(1000)))
+        rows = iter_rows(str(path))
+        assert next(rows) == (0, ["", "", "https://huggingface.co/o/m0"])
+        rows.close()
+
+
+class TestPrefetch:
+    """Test the bounded read-ahead queue."""
+
+    def test_preserves_order(self):
+        assert list(prefetch(iter(range(50)), maxsize=4)) == list(range(50))
+
+    def test_read_ahead_is_bounded(self):
+        produced = []
+        def source():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        stream = prefetch(source(), maxsize=3)
+        assert next(stream) == 0
+        time.sleep(0.1)
+        # one item consumed, at most `maxsize` queued, one blocked in put()
+        assert len(produced) <= 5
+
+    def test_reader_errors_propagate(self):
+        def source():
+            yield 1
+            raise OSError("truncated gzip")
+
+        stream = prefetch(source(), maxsize=2)
+        assert next(stream) == 1
+        with pytest.raises(OSError):
+            next(stream)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
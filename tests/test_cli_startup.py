@@ -0,0 +1,56 @@
+"""
+Tests for the CLI import budget: fast paths never load the evaluation stack.
+"""
+import os
+import subprocess
+import sys
+
+# Add src to path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+from import_profile import HEAVY_MODULES, profile  # noqa: E402
+
+
+def loaded_heavy_modules(code):
+    """Heavy modules present in sys.modules after running `code` in a fresh interpreter."""
+    probe = (f"import sys\n{code}\n"
+             f"print(' '.join(h for h in {HEAVY_MODULES!r} if any("
+             f"m == h or m.startswith(h + '.') for m in sys.modules)))")
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=ROOT,
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.split()
+
+
+class TestCliStartup:
+    """Test that importing and rejecting arguments stays lightweight."""
+
+    def test_import_main_loads_no_heavy_modules(self):
+        assert loaded_heavy_modules("import src.cli.main") == []
+
+    def test_invalid_arguments_load_no_heavy_modules(self):
+        code = ("import sys\n"
+                "from src.cli.main import main\n"
+                "sys.argv = ['run', '--engine', 'bogus']\n"
+                "try:\n"
+                "    main()\n"
+                "except SystemExit as e:\n"
+                "    assert e.code == 2\n")
+        assert loaded_heavy_modules(code) == []
+
+    def test_evaluation_stack_loads_on_first_use(self):
+        heavy = loaded_heavy_modules(
+            "from src.cli import main\nmain.get_url_category")
+        assert heavy == []
+        heavy = loaded_heavy_modules(
+            "from src.cli import main\nmain.get_url_category({})")
+        assert "src.url_parsers" in heavy
+
+    def test_import_profile_report(self):
+        timings, heavy = profile("src.cli.main")
+        names = [name for _, name in timings]
+        assert "src.cli.main" in names
+        assert "site" not in names
+        assert heavy == []
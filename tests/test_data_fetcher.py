@@ -24,6 +24,22 @@ sys.path.insert(0, os.path.join(
 class TestUtilityFunctions:
     """Test utility functions in data_fetcher."""
 
+    @patch.dict(os.environ, {"HF_TOKEN": "hf_x", "GITHUB_TOKEN": "gh_x"})
+    def test_auth_headers(self):
+        from src.metrics.data_fetcher.utils import github_headers, hf_headers
+        assert hf_headers() == {"Authorization": "Bearer hf_x"}
+        assert github_headers() == {"Authorization": "token gh_x"}
+        with patch.dict(os.environ, {}, clear=True):
+            assert hf_headers() == {} and github_headers() == {}
+
+    @patch.dict(os.environ, {"SOME_INT": "7", "SOME_FLOAT": "0.5", "BAD": "x"})
+    def test_env_settings_fall_back_on_bad_values(self):
+        from src.metrics.data_fetcher.env import env_float, env_int
+        assert env_int("SOME_INT", 1) == 7
+        assert env_float("SOME_FLOAT", 1.0) == 0.5
+        assert env_int("BAD", 3) == 3 and env_float("BAD", 2.5) == 2.5
+        assert env_int("UNSET_SETTING", 4) == 4
+
     def test_extract_repo_info_valid_github_url(self):
         """Test extracting owner and repo from valid GitHub URLs."""
         assert extract_repo_info(
@@ -55,7 +71,7 @@ class TestUtilityFunctions:
         assert extract_hf_model_id("https://github.com/owner/repo") is None
         assert extract_hf_model_id("not-a-url") is None
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_safe_request_success(self, mock_get):
         """Test successful HTTP request."""
         mock_response = Mock()
@@ -66,7 +82,7 @@ class TestUtilityFunctions:
         assert result == mock_response
         mock_get.assert_called_once_with("https://example.com", timeout=10)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_safe_request_failure(self, mock_get):
         """Test failed HTTP request."""
         mock_get.side_effect = Exception("Network error")
@@ -74,7 +90,21 @@ class TestUtilityFunctions:
         result = safe_request("https://example.com")
         assert result is None
 
-    @patch('requests.head')
+    def test_get_session_is_shared_and_pooled(self):
+        """All helpers share one keep-alive session with a sized pool."""
+        from src.metrics.data_fetcher import utils
+
+        utils.reset_session()
+        try:
+            with patch.dict(os.environ, {"HTTP_POOL_MAXSIZE": "7"}):
+                session = utils.get_session()
+            assert utils.get_session() is session
+            adapter = session.get_adapter("https://api.github.com")
+            assert adapter._pool_maxsize == 7
+        finally:
+            utils.reset_session()
+
+    @patch('requests.Session.head')
     def test_check_availability_all_available(self, mock_head):
         """Test URL availability check when all URLs are available."""
         mock_response = Mock()
@@ -92,7 +122,7 @@ class TestUtilityFunctions:
         assert result["has_model"] is True
         assert result["links_ok"] is True
 
-    @patch('requests.head')
+    @patch('requests.Session.head')
     def test_check_availability_some_unavailable(self, mock_head):
         """Test URL availability check when some URLs are unavailable."""
         def side_effect(url, **kwargs):
@@ -328,10 +358,11 @@ class TestAPIIntegration:
         mock_api.list_repo_files.return_value = [
             "config.json", "pytorch_model.bin"]
 
-        # Mock file info - return list with RepoFile-like objects
+        # Mock file info - one batched call returns a RepoFile per path
         mock_file_info = Mock()
         mock_file_info.size = 500000000  # 500MB
-        mock_api.get_paths_info.return_value = [mock_file_info]
+        mock_api.get_paths_info.return_value = [
+            mock_file_info, mock_file_info]
 
         mock_hf_api.return_value = mock_api
 
@@ -342,6 +373,54 @@ class TestAPIIntegration:
         assert result["pipeline_tag"] == "fill-mask"
         assert result["total_size_bytes"] == 1000000000  # 2 files * 500MB each
         assert result["license"] == "apache-2.0"
+        # sizes come from a single batched lookup, not one call per file
+        mock_api.get_paths_info.assert_called_once_with(
+            "bert-base-uncased", ["config.json", "pytorch_model.bin"],
+            repo_type="model")
+
+    @patch('huggingface_hub.model_info')
+    @patch('huggingface_hub.HfApi')
+    def test_get_huggingface_model_data_size_from_siblings(self, mock_hf_api, mock_model_info):
+        """Sizes from the files metadata listing avoid any per-path lookups."""
+        mock_info = Mock()
+        mock_info.cardData = {}
+        mock_info.siblings = [Mock(size=300), Mock(size=700)]
+        mock_model_info.return_value = mock_info
+        mock_api = Mock()
+        mock_hf_api.return_value = mock_api
+
+        result = get_huggingface_model_data(
+            "https://huggingface.co/owner/model")
+
+        assert result["total_size_bytes"] == 1000
+        mock_model_info.assert_called_once_with(
+            "owner/model", files_metadata=True)
+        mock_api.list_repo_files.assert_not_called()
+        mock_api.get_paths_info.assert_not_called()
+
+    @patch('huggingface_hub.model_info')
+    @patch('huggingface_hub.HfApi')
+    def test_get_huggingface_model_data_size_chunked(self, mock_hf_api, mock_model_info):
+        """Huge repos are looked up in chunks of PATHS_INFO_CHUNK_SIZE paths."""
+        from src.metrics.data_fetcher import huggingface
+
+        mock_info = Mock()
+        mock_info.cardData = {}
+        mock_info.siblings = None
+        mock_model_info.return_value = mock_info
+        mock_api = Mock()
+        mock_api.list_repo_files.return_value = [
+            f"shard-{i}.bin" for i in range(5)]
+        mock_api.get_paths_info.side_effect = lambda repo, paths, repo_type: [
+            Mock(size=10) for _ in paths]
+        mock_hf_api.return_value = mock_api
+
+        with patch.object(huggingface, "PATHS_INFO_CHUNK_SIZE", 2):
+            result = get_huggingface_model_data(
+                "https://huggingface.co/owner/model")
+
+        assert result["total_size_bytes"] == 50
+        assert mock_api.get_paths_info.call_count == 3
 
     @patch('huggingface_hub.model_info')
     def test_get_huggingface_model_data_failure(self, mock_model_info):
@@ -352,7 +431,68 @@ class TestAPIIntegration:
             "https://huggingface.co/invalid-model")
         assert result == {}
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
+    def test_get_huggingface_dataset_data_from_card_metadata(self, mock_get):
+        """Features and splits come from the card's dataset_info, no builder."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {
+            "id": "org/ds",
+            "sha": "abc",
+            "downloads": 42,
+            "tags": ["task_categories:text-classification"],
+            "description": "Short summary",
+            "cardData": {
+                "license": "mit",
+                "dataset_info": [
+                    {"config_name": "a",
+                     "features": [{"name": "text", "dtype": "string"},
+                                  {"name": "label", "dtype": {"class_label": {}}}],
+                     "splits": [{"name": "train"}, {"name": "test"}]},
+                    {"config_name": "b",
+                     "features": [{"name": "text", "dtype": "string"}],
+                     "splits": [{"name": "train"}, {"name": "validation"}]},
+                ],
+            },
+        }
+        mock_get.return_value = mock_response
+
+        result = get_huggingface_dataset_data(
+            "https://huggingface.co/datasets/org/ds")
+
+        assert mock_get.call_count == 1
+        assert mock_get.call_args[0][0] == "https://huggingface.co/api/datasets/org/ds"
+        assert result["license"] == "mit"
+        assert result["downloads"] == 42
+        assert result["features"] == "text: string, label: class_label; text: string"
+        assert result["splits"] == ["train", "test", "validation"]
+        assert result["description"] == "Short summary"
+
+    @patch('src.metrics.data_fetcher.artifacts.read_artifact')
+    @patch('requests.Session.get')
+    def test_get_huggingface_dataset_data_dataset_infos_fallback(
+            self, mock_get, mock_read_artifact):
+        """Without card metadata, dataset_infos.json fills the gaps."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"id": "glue", "sha": "def",
+                                           "cardData": {}}
+        mock_get.return_value = mock_response
+        mock_read_artifact.return_value = (
+            b'{"cola": {"description": "CoLA", '
+            b'"features": {"sentence": {"dtype": "string", "_type": "Value"}}, '
+            b'"splits": {"train": {}, "validation": {}}}}')
+
+        result = get_huggingface_dataset_data(
+            "https://huggingface.co/datasets/glue")
+
+        mock_read_artifact.assert_called_once_with(
+            "glue", "dataset_infos.json", revision="def", repo_type="dataset")
+        assert result["features"] == "sentence: string"
+        assert result["splits"] == ["train", "validation"]
+        assert result["description"] == "CoLA"
+
+    @patch('requests.Session.get')
     def test_get_github_repo_data_success(self, mock_get):
         """Test successful GitHub repository data retrieval."""
         # Mock repository response
@@ -413,7 +553,69 @@ class TestAPIIntegration:
         assert contributors["top_contributor_pct"] == 100 / \
             175  # Top contributor percentage
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
+    def test_get_github_repo_data_uses_default_branch(self, mock_get):
+        """The tree is fetched once, for the metadata's default branch."""
+        def mock_response(url, **kwargs):
+            response = Mock()
+            response.raise_for_status.return_value = None
+            if url.endswith("/repo"):
+                response.json.return_value = {"default_branch": "master"}
+            elif "/git/trees/" in url:
+                response.json.return_value = {
+                    "tree": [{"path": "setup.py", "type": "blob"}]}
+            else:
+                response.json.return_value = []
+            return response
+
+        mock_get.side_effect = mock_response
+
+        result = get_github_repo_data("https://github.com/owner/repo")
+
+        tree_urls = [c.args[0] for c in mock_get.call_args_list
+                     if "/git/trees/" in c.args[0]]
+        assert tree_urls == [
+            "https://api.github.com/repos/owner/repo/git/trees/master?recursive=1"]
+        assert result["files"] == ["setup.py"]
+
+    @patch.dict(os.environ, {"GITHUB_TREE_PAGED_KB": "1000"})
+    @patch('requests.Session.get')
+    def test_get_github_repo_data_pages_huge_tree(self, mock_get):
+        """Huge repos are walked level by level until the signals are found."""
+        trees = {
+            "main": [{"path": "README.md", "type": "blob"},
+                     {"path": "setup.py", "type": "blob"},
+                     {"path": "requirements.txt", "type": "blob"},
+                     {"path": "tests", "type": "tree", "sha": "t1"},
+                     {"path": "vendor", "type": "tree", "sha": "v1"}],
+            "t1": [{"path": "test_eval.py", "type": "blob"}],
+            "v1": [{"path": "huge", "type": "tree", "sha": "h1"}],
+        }
+
+        def mock_response(url, **kwargs):
+            response = Mock()
+            response.raise_for_status.return_value = None
+            if url.endswith("/repo"):
+                response.json.return_value = {
+                    "default_branch": "main", "size": 5_000_000}
+            elif "/git/trees/" in url:
+                ref = url.rsplit("/", 1)[1]
+                response.json.return_value = {"tree": trees[ref]}
+            else:
+                response.json.return_value = []
+            return response
+
+        mock_get.side_effect = mock_response
+
+        result = get_github_repo_data("https://github.com/owner/repo")
+
+        tree_urls = [c.args[0] for c in mock_get.call_args_list
+                     if "/git/trees/" in c.args[0]]
+        assert all("recursive" not in u for u in tree_urls)
+        assert len(tree_urls) == 2  # root + tests/, vendor/ never opened
+        assert "tests/test_eval.py" in result["files"]
+
+    @patch('requests.Session.get')
     def test_get_github_repo_data_failure(self, mock_get):
         """Test GitHub repository data retrieval failure."""
         mock_get.side_effect = Exception("API error")
@@ -497,6 +699,112 @@ class TestComprehensiveFetching:
         assert result["size_components"] == {
             "raspberry_pi": 0.01, "jetson_nano": 0.01, "desktop_pc": 0.01, "aws_server": 0.01}
 
+    @patch('src.metrics.data_fetcher.get_huggingface_dataset_data')
+    @patch('src.metrics.data_fetcher.get_huggingface_model_data')
+    @patch('src.metrics.data_fetcher.get_github_repo_data')
+    @patch('src.metrics.data_fetcher.check_availability')
+    def test_fetch_comprehensive_metrics_data_sources_run_concurrently(
+            self, mock_availability, mock_github, mock_hf, mock_hf_dataset):
+        """Source fetches overlap, and each latency reports its own source."""
+        import threading
+        import time
+
+        # every source waits until all four are in flight, so a sequential
+        # aggregator breaks the barrier instead of passing on timing
+        barrier = threading.Barrier(4, timeout=5)
+        overlapped = []
+
+        def slow(value, delay):
+            def _fn(*args):
+                barrier.wait()
+                overlapped.append(value)
+                time.sleep(delay)
+                return value
+            return _fn
+
+        mock_availability.side_effect = slow({"links_ok": True}, 0)
+        mock_hf.side_effect = slow({"license": "mit"}, 0.2)
+        mock_hf_dataset.side_effect = slow({"description": "d"}, 0.1)
+        mock_github.side_effect = slow({"license": "apache-2.0"}, 0.15)
+
+        result = fetch_comprehensive_metrics_data(
+            code_url="https://github.com/owner/repo",
+            dataset_url="https://huggingface.co/datasets/squad",
+            model_url="https://huggingface.co/gpt2"
+        )
+
+        assert len(overlapped) == 4
+        assert not barrier.broken
+        assert result["hf_model_latency"] >= 0.2
+        assert result["hf_dataset_latency"] >= 0.1
+        assert result["github_latency"] >= 0.15
+        assert result["availability_latency"] < result["hf_model_latency"]
+        # merge still applies HF license precedence
+        assert result["license"] == "mit"
+
+    @patch('src.metrics.data_fetcher.get_model_card')
+    @patch('src.metrics.data_fetcher.get_huggingface_model_data')
+    @patch('src.metrics.data_fetcher.check_availability')
+    def test_model_card_fetched_once_only_when_required(
+            self, mock_availability, mock_hf, mock_card):
+        """The model card is a context key fetched only for metrics that need it."""
+        from src.metrics.data_fetcher.aggregator import default_requires
+        from src.metrics.data_fetcher.memo import batch_scope
+
+        mock_availability.return_value = {"links_ok": True}
+        mock_hf.return_value = {}
+        mock_card.return_value = "license: mit"
+        model_url = "https://huggingface.co/owner/model"
+
+        assert "model_card" in default_requires()
+        with batch_scope():
+            for _ in range(2):
+                result = fetch_comprehensive_metrics_data("", "", model_url)
+        assert result["model_card"] == "license: mit"
+        assert "model_card_latency" in result
+        mock_card.assert_called_once_with(model_url)
+
+        result = fetch_comprehensive_metrics_data("", "", model_url, requires=())
+        assert "model_card" not in result
+        assert mock_card.call_count == 1
+
+    @patch('src.metrics.data_fetcher.get_model_card')
+    @patch('src.metrics.data_fetcher.get_huggingface_dataset_data')
+    @patch('src.metrics.data_fetcher.get_huggingface_model_data')
+    @patch('src.metrics.data_fetcher.get_github_repo_data')
+    @patch('src.metrics.data_fetcher.check_availability')
+    def test_only_sources_behind_required_keys_are_fetched(
+            self, mock_availability, mock_github, mock_hf, mock_hf_dataset, mock_card):
+        """A size-only audit fetches the HF model data and nothing else."""
+        from src.metrics.data_fetcher.aggregator import plan_sources
+        from src.metrics.runner import build_registry_from_plan
+
+        mock_hf.return_value = {"total_size_bytes": 1000}
+        registry = build_registry_from_plan()
+        requires = registry.required_keys(["size"])
+        assert plan_sources(requires) == {"hf_model"}
+        assert plan_sources(registry.required_keys(["license_compliance"])) == {
+            "hf_model", "github", "model_card"}
+
+        result = fetch_comprehensive_metrics_data(
+            "https://github.com/owner/repo", "https://huggingface.co/datasets/squad",
+            "https://huggingface.co/owner/model", requires=requires)
+
+        mock_hf.assert_called_once()
+        for mock in (mock_availability, mock_github, mock_hf_dataset, mock_card):
+            mock.assert_not_called()
+        assert "size_components" in result and "availability_latency" not in result
+
+    def test_undeclared_metric_needs_everything(self):
+        """A metric without `requires` makes the registry ask for all sources."""
+        from src.metrics.data_fetcher.aggregator import ALL_SOURCES, plan_sources
+        from src.metrics.registry import MetricRegistry
+
+        reg = MetricRegistry()
+        reg.register(Mock(id="custom", spec=["id", "compute"]))
+        assert reg.required_keys() is None
+        assert plan_sources(None) == ALL_SOURCES
+
     def test_fetch_comprehensive_metrics_data_exception_handling(self):
         """Test comprehensive data fetching with exception handling."""
         # Force an exception by passing invalid data
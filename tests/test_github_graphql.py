@@ -0,0 +1,177 @@
+"""
+Tests for the GitHub GraphQL batch fetcher.
+"""
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.metrics.data_fetcher.github_graphql import (
+    TREE_DEPTH, build_query, get_github_repos_data, prime_memo,
+    repo_data_from_graphql)
+from src.metrics.data_fetcher.memo import batch_scope, memoized
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+NODE = {
+    "stargazerCount": 120,
+    "forkCount": 7,
+    "createdAt": "2020-01-01T00:00:00Z",
+    "updatedAt": "2024-01-01T00:00:00Z",
+    "licenseInfo": {"spdxId": "Apache-2.0"},
+    "diskUsage": 100,
+    "defaultBranchRef": {"name": "master"},
+    "object": {"entries": [
+        {"path": "README.md", "type": "blob"},
+        {"path": "src", "type": "tree", "object": {"entries": [
+            {"path": "src/model.py", "type": "blob"},
+        ]}},
+    ]},
+}
+
+
+CONTRIBUTORS = [{"login": "alice", "contributions": 30},
+                {"login": "bob", "contributions": 10}]
+TREE = {"tree": [{"path": "d/d/d/f.py", "type": "blob"},
+                 {"path": "README.md", "type": "blob"}]}
+
+
+def graphql_response(batch_size, node=NODE):
+    resp = Mock()
+    resp.raise_for_status.return_value = None
+    resp.json.return_value = {
+        "data": {f"r{i}": node for i in range(batch_size)}}
+    return resp
+
+
+def rest_response(url, **kwargs):
+    resp = Mock()
+    resp.status_code = 200
+    resp.headers = {}
+    if url.endswith("/contributors"):
+        resp.json.return_value = CONTRIBUTORS
+    elif "/git/trees/" in url:
+        resp.json.return_value = TREE
+    else:
+        resp.json.return_value = None
+    return resp
+
+
+def deep_node(depth):
+    """NODE with a file `depth` levels deep, as the query returns it."""
+    entry = {"path": "/".join(["d"] * (depth - 1) + ["f.py"]), "type": "blob"}
+    for level in range(depth - 1, 0, -1):
+        entry = {"path": "/".join(["d"] * level), "type": "tree",
+                 "object": {"entries": [entry]}}
+    return {**NODE, "object": {"entries": [_cut(entry, TREE_DEPTH)]}}
+
+
+def _cut(entry, depth):
+    """Drop what lies below `depth` levels, which the query does not select."""
+    if depth == 1:
+        return {"path": entry["path"], "type": entry["type"]}
+    sub = (entry.get("object") or {}).get("entries", [])
+    return {**entry, "object": {"entries": [_cut(e, depth - 1) for e in sub]}}
+
+
+class TestGraphQLQuery:
+    """Test query construction and result mapping."""
+
+    def test_build_query_aliases_each_repo(self):
+        query, variables = build_query([("a", "b"), ("c", "d")])
+        assert "r0: repository(owner: $o0, name: $n0)" in query
+        assert "r1: repository(owner: $o1, name: $n1)" in query
+        assert "fragment RepoFields on Repository" in query
+        assert variables == {"o0": "a", "n0": "b", "o1": "c", "n1": "d"}
+
+    def test_repo_data_has_rest_shape(self):
+        data = repo_data_from_graphql(NODE)
+        assert set(data) == {"contributors", "files", "license", "stars",
+                             "forks", "created_at", "updated_at"}
+        assert data["stars"] == 120
+        assert data["license"] == "Apache-2.0"
+        assert data["files"] == ["README.md", "src/model.py"]
+        assert data["contributors"] == {}
+
+
+class TestGraphQLBatching:
+    """Test batched fetching and memo priming."""
+
+    URLS = [f"https://github.com/owner/repo{i}" for i in range(5)]
+
+    @patch.dict(os.environ, {"GITHUB_TOKEN": "ghp_test"})
+    @patch('requests.Session.get', side_effect=rest_response)
+    @patch('requests.Session.post')
+    def test_repos_fetched_in_batches(self, mock_post, mock_get):
+        mock_post.side_effect = lambda url, json, headers, timeout: graphql_response(
+            len(json["variables"]) // 2)
+
+        results = get_github_repos_data(self.URLS, batch_size=2)
+
+        assert mock_post.call_count == 3
+        assert set(results) == set(self.URLS)
+        assert results[self.URLS[0]]["stars"] == 120
+
+    @patch.dict(os.environ, {"GITHUB_TOKEN": "ghp_test"})
+    @patch('requests.Session.get', side_effect=rest_response)
+    @patch('requests.Session.post')
+    def test_contributors_match_rest(self, mock_post, mock_get):
+        """Bus-factor inputs come from REST /contributors on both paths."""
+        mock_post.return_value = graphql_response(1)
+
+        data = get_github_repos_data([self.URLS[0]])[self.URLS[0]]
+
+        assert data["contributors"] == {
+            "contributors_count": 2,
+            "top_contributor_pct": 0.75,
+            "total_contributions": 40,
+        }
+        assert [c[0][0] for c in mock_get.call_args_list] == [
+            "https://api.github.com/repos/owner/repo0/contributors"]
+
+    @patch.dict(os.environ, {"GITHUB_TOKEN": "ghp_test"})
+    @patch('requests.Session.get', side_effect=rest_response)
+    @patch('requests.Session.post')
+    def test_trees_deeper_than_query_fetched_via_rest(self, mock_post, mock_get):
+        """Only the tree is refetched; GraphQL metadata is kept."""
+        mock_post.return_value = graphql_response(1, deep_node(TREE_DEPTH))
+        data = get_github_repos_data([self.URLS[0]])[self.URLS[0]]
+        assert data["files"] == ["d/d/f.py"]
+        assert not any("/git/trees/" in c[0][0] for c in mock_get.call_args_list)
+
+        mock_post.return_value = graphql_response(1, deep_node(TREE_DEPTH + 1))
+        data = get_github_repos_data([self.URLS[1]])[self.URLS[1]]
+        assert data["files"] == ["d/d/d/f.py", "README.md"]
+        assert data["stars"] == 120
+        assert [c[0][0] for c in mock_get.call_args_list] == [
+            "https://api.github.com/repos/owner/repo0/contributors",
+            "https://api.github.com/repos/owner/repo1/contributors",
+            "https://api.github.com/repos/owner/repo1/git/trees/master?recursive=1"]
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('requests.Session.post')
+    def test_no_token_skips_graphql(self, mock_post):
+        assert get_github_repos_data(self.URLS) == {}
+        mock_post.assert_not_called()
+
+    @patch.dict(os.environ, {"GITHUB_TOKEN": "ghp_test"})
+    @patch('requests.Session.get', side_effect=rest_response)
+    @patch('requests.Session.post')
+    def test_prime_memo_short_circuits_rest(self, mock_post, mock_get):
+        mock_post.return_value = graphql_response(1)
+        rest = Mock(return_value={"stars": 0})
+
+        with batch_scope() as memo:
+            assert prime_memo(memo, [self.URLS[0]]) == 1
+            data = memoized("github", self.URLS[0] + "/", rest, self.URLS[0])
+
+        assert data["stars"] == 120
+        rest.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
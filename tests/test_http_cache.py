@@ -0,0 +1,134 @@
+"""
+Tests for the on-disk cache and the GitHub response cache built on it.
+"""
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.metrics.data_fetcher import http_cache
+from src.metrics.data_fetcher.disk_cache import DiskCache, is_fresh
+from src.metrics.data_fetcher.http_cache import (
+    cached_get_json, endpoint_class, github_cache)
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+def make_response(status=200, body=None, etag=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.raise_for_status.return_value = None
+    resp.json.return_value = body
+    resp.headers = {"ETag": etag} if etag else {}
+    return resp
+
+
+class TestDiskCache:
+    """Test the generic JSON entry cache."""
+
+    def test_set_get_roundtrip_and_stats(self):
+        cache = DiskCache("unit")
+        assert cache.get("k") is None
+        cache.set("k", {"body": [1, 2, 3]})
+        entry = cache.get("k")
+        assert entry["body"] == [1, 2, 3]
+        assert is_fresh(entry, 60)
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_expired_entry_counts_as_miss(self):
+        cache = DiskCache("unit")
+        cache.set("k", {"body": 1, "stored_at": time.time() - 120})
+        entry = cache.get("k", ttl=60)
+        assert entry["body"] == 1  # still handed out for revalidation
+        assert cache.get("k", ttl=3600)["body"] == 1
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_clear_removes_entries(self):
+        cache = DiskCache("unit")
+        cache.set("a", {"body": 1})
+        cache.clear()
+        assert cache.get("a") is None
+
+    def test_lru_eviction_keeps_recent_entries(self):
+        cache = DiskCache("unit", max_bytes=400)
+        for i in range(5):
+            cache.set(f"k{i}", {"body": "x" * 100})
+            path = cache._path(f"k{i}")
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        cache.evict()
+
+        remaining = [i for i in range(5) if cache.get(f"k{i}") is not None]
+        assert remaining and remaining[-1] == 4
+        assert 0 not in remaining
+
+    def test_disabled_cache_is_a_no_op(self):
+        cache = DiskCache("unit")
+        cache.enabled = False
+        cache.set("k", {"body": 1})
+        assert cache.get("k") is None
+
+
+class TestGitHubResponseCache:
+    """Test ETag revalidation and TTL handling for GitHub calls."""
+
+    URL = "https://api.github.com/repos/owner/repo"
+
+    def test_endpoint_classes(self):
+        assert endpoint_class(self.URL) == "repo"
+        assert endpoint_class(self.URL + "/contributors") == "contributors"
+        assert endpoint_class(
+            self.URL + "/git/trees/main?recursive=1") == "tree"
+
+    @patch('requests.Session.get')
+    def test_fresh_entry_served_without_request(self, mock_get):
+        mock_get.return_value = make_response(body={"stars": 1}, etag='"v1"')
+
+        assert cached_get_json(self.URL) == {"stars": 1}
+        assert cached_get_json(self.URL) == {"stars": 1}
+        assert mock_get.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_stale_entry_revalidated_with_etag(self, mock_get):
+        mock_get.return_value = make_response(body={"stars": 1}, etag='"v1"')
+        cached_get_json(self.URL)
+
+        mock_get.reset_mock()
+        mock_get.return_value = make_response(status=304)
+        with patch.dict(http_cache.GITHUB_TTLS, {"repo": 0}):
+            assert cached_get_json(self.URL) == {"stars": 1}
+
+        sent = mock_get.call_args[1]["headers"]
+        assert sent["If-None-Match"] == '"v1"'
+
+    @patch('requests.Session.get')
+    def test_cache_keyed_by_auth_identity(self, mock_get):
+        mock_get.side_effect = [
+            make_response(body={"who": "a"}),
+            make_response(body={"who": "b"}),
+        ]
+
+        a = cached_get_json(self.URL, headers={"Authorization": "token a"})
+        b = cached_get_json(self.URL, headers={"Authorization": "token b"})
+
+        assert a == {"who": "a"}
+        assert b == {"who": "b"}
+        assert mock_get.call_count == 2
+
+    @patch('requests.Session.get')
+    def test_bypass_when_disabled(self, mock_get):
+        mock_get.return_value = make_response(body={"stars": 1})
+        github_cache.enabled = False
+        try:
+            cached_get_json(self.URL)
+            cached_get_json(self.URL)
+        finally:
+            github_cache.enabled = True
+        assert mock_get.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
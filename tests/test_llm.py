@@ -4,6 +4,7 @@ Tests for LLM data fetcher module.
 import pytest
 import sys
 import os
+import threading
 from unittest.mock import patch, Mock, MagicMock
 import requests
 
@@ -16,7 +17,7 @@ class TestGetGenAIMetricData:
     """Test the get_genai_metric_data function."""
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_successful_genai_call(self, mock_post):
         """Test successful GenAI API call."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -67,7 +68,7 @@ class TestGetGenAIMetricData:
         assert result == {}
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_http_error(self, mock_post):
         """Test handling of HTTP errors."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -81,7 +82,7 @@ class TestGetGenAIMetricData:
         mock_post.assert_called_once()
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_timeout_error(self, mock_post):
         """Test handling of timeout errors."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -95,7 +96,7 @@ class TestGetGenAIMetricData:
         mock_post.assert_called_once()
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_connection_error(self, mock_post):
         """Test handling of connection errors."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -110,7 +111,7 @@ class TestGetGenAIMetricData:
         mock_post.assert_called_once()
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_invalid_json_response(self, mock_post):
         """Test handling of invalid JSON response."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -127,7 +128,7 @@ class TestGetGenAIMetricData:
         mock_post.assert_called_once()
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_empty_response_structure(self, mock_post):
         """Test handling of empty or malformed response structure."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -167,7 +168,7 @@ class TestGetGenAIMetricData:
             assert result == {}
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_whitespace_stripping(self, mock_post):
         """Test that response content is stripped of whitespace."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -192,7 +193,7 @@ class TestGetGenAIMetricData:
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_URL', 'https://custom.endpoint.com/api')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_custom_endpoint_url(self, mock_post):
         """Test using custom endpoint URL from environment variable."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -214,7 +215,7 @@ class TestGetGenAIMetricData:
         assert call_args[0][0] == "https://custom.endpoint.com/api"
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_complex_response_content(self, mock_post):
         """Test with complex response content."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -249,7 +250,7 @@ class TestGetGenAIMetricData:
         assert result == {}
 
     @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
-    @patch('src.metrics.data_fetcher.llm.requests.post')
+    @patch('requests.Session.post')
     def test_general_exception_handling(self, mock_post):
         """Test handling of general exceptions."""
         from src.metrics.data_fetcher.llm import get_genai_metric_data
@@ -261,3 +262,203 @@ class TestGetGenAIMetricData:
 
         assert result == {}
         mock_post.assert_called_once()
+
+
+class TestLLMResponseCache:
+    """Test the on-disk GenAI response cache."""
+
+    @staticmethod
+    def _response(content):
+        resp = Mock()
+        resp.json.return_value = {"choices": [{"message": {"content": content}}]}
+        resp.raise_for_status.return_value = None
+        return resp
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_repeat_prompt_served_from_cache(self, mock_post):
+        """The same prompt + URL is only sent once."""
+        from src.metrics.data_fetcher.llm import get_genai_metric_data
+        from src.metrics.data_fetcher.llm_cache import llm_cache
+
+        mock_post.return_value = self._response("0.7")
+        before = llm_cache.stats()
+
+        first = get_genai_metric_data("https://github.com/test/repo", "P")
+        second = get_genai_metric_data("https://github.com/test/repo", "P")
+        other = get_genai_metric_data("https://github.com/test/repo", "Q")
+
+        assert first == second == other == {"metric": "0.7"}
+        assert mock_post.call_count == 2
+        assert llm_cache.stats()["hits"] == before["hits"] + 1
+
+    def test_expired_entry_is_a_miss(self):
+        """Entries past LLM_CACHE_TTL are neither served nor counted as hits."""
+        from src.metrics.data_fetcher import llm_cache as cache_module
+
+        url, body = "https://genai.example/api", {"messages": [{"content": "x"}]}
+        cache_module.remember(url, body, {"choices": [{"message": {"content": "0.5"}}]})
+        before = cache_module.llm_cache.stats()
+
+        with patch.dict(os.environ, {"LLM_CACHE_TTL": "0"}):
+            assert cache_module.lookup(url, body) is None
+        assert cache_module.lookup(url, body) is not None
+
+        after = cache_module.llm_cache.stats()
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+
+    def test_key_includes_model_and_temperature(self):
+        """Changing the model or temperature changes the cache key."""
+        from src.metrics.data_fetcher.llm_cache import cache_key
+
+        body = {"model": "a", "messages": [{"role": "user", "content": "x"}]}
+        assert cache_key("u", body) != cache_key("u", {**body, "model": "b"})
+        assert cache_key("u", body) != cache_key("u", {**body, "temperature": 0})
+        assert cache_key("u", body) == cache_key("u", dict(body))
+
+    @patch.dict(os.environ, {"LLM_CACHE_TTL": "0"})
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_expired_entries_are_refetched(self, mock_post):
+        """Entries older than LLM_CACHE_TTL are not reused."""
+        from src.metrics.data_fetcher.llm import get_genai_metric_data
+
+        mock_post.return_value = self._response("0.7")
+
+        get_genai_metric_data("https://github.com/test/repo", "P")
+        get_genai_metric_data("https://github.com/test/repo", "P")
+
+        assert mock_post.call_count == 2
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_failures_are_not_cached(self, mock_post):
+        """A failed call is retried on the next run."""
+        from src.metrics.data_fetcher.llm import get_genai_metric_data
+
+        mock_post.side_effect = [requests.RequestException("down"),
+                                 self._response("0.4")]
+
+        assert get_genai_metric_data("https://x.org/m", "P") == {}
+        assert get_genai_metric_data("https://x.org/m", "P") == {"metric": "0.4"}
+
+
+class TestLLMBatching:
+    """Test batched multi-URL scoring."""
+
+    URLS = [f"https://huggingface.co/o/m{i}" for i in range(3)]
+
+    @staticmethod
+    def _response(content):
+        resp = Mock()
+        resp.json.return_value = {"choices": [{"message": {"content": content}}]}
+        resp.raise_for_status.return_value = None
+        return resp
+
+    def test_parse_batch_scores_by_url_and_position(self):
+        from src.metrics.data_fetcher.llm_batch import parse_batch_scores
+
+        text = 'Sure:\n[{"url": "%s", "score": 0.8}, {"url": "x", "score": 0.1}]' % self.URLS[0]
+        assert parse_batch_scores(text, self.URLS) == {self.URLS[0]: "0.8"}
+        assert parse_batch_scores("[0.1, 0.2, 0.3]", self.URLS) == {
+            self.URLS[0]: "0.1", self.URLS[1]: "0.2", self.URLS[2]: "0.3"}
+        assert parse_batch_scores("no json here", self.URLS) == {}
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_size_flush_sends_one_request(self, mock_post):
+        from src.metrics.data_fetcher.llm_batch import LLMBatcher
+
+        reply = "[" + ", ".join(
+            '{"url": "%s", "score": 0.%d}' % (u, i + 1)
+            for i, u in enumerate(self.URLS)) + "]"
+        mock_post.return_value = self._response(reply)
+        batcher = LLMBatcher("Rate:", max_batch=3, window=60)
+
+        futures = [batcher.submit(u) for u in self.URLS]
+
+        assert [f.result(timeout=1) for f in futures] == [
+            {"metric": "0.1"}, {"metric": "0.2"}, {"metric": "0.3"}]
+        assert mock_post.call_count == 1
+        prompt = mock_post.call_args[1]["json"]["messages"][0]["content"]
+        assert all(u in prompt for u in self.URLS)
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_time_window_flush(self, mock_post):
+        from src.metrics.data_fetcher.llm_batch import LLMBatcher
+
+        mock_post.return_value = self._response(
+            '[{"url": "%s", "score": 0.5}]' % self.URLS[0])
+        batcher = LLMBatcher("Rate:", max_batch=10, window=0.01)
+
+        assert batcher.submit(self.URLS[0]).result(timeout=2) == {"metric": "0.5"}
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_unparsed_urls_fall_back_to_single_calls(self, mock_post):
+        from src.metrics.data_fetcher.llm_batch import LLMBatcher
+
+        mock_post.side_effect = [
+            self._response('[{"url": "%s", "score": 0.9}]' % self.URLS[0]),
+            self._response("0.3"),
+        ]
+        batcher = LLMBatcher("Rate:", max_batch=2, window=60)
+
+        first, second = (batcher.submit(u) for u in self.URLS[:2])
+
+        assert first.result(timeout=1) == {"metric": "0.9"}
+        assert second.result(timeout=1) == {"metric": "0.3"}
+        assert mock_post.call_count == 2
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_full_batch_is_sent_off_the_submitting_thread(self, mock_post):
+        from src.metrics.data_fetcher.llm_batch import LLMBatcher
+
+        release = threading.Event()
+        senders = []
+
+        def slow_post(*args, **kwargs):
+            senders.append(threading.current_thread())
+            release.wait(timeout=5)
+            return self._response('[{"url": "%s", "score": 0.4}]' % self.URLS[0])
+
+        mock_post.side_effect = slow_post
+        batcher = LLMBatcher("Rate:", max_batch=1, window=60)
+
+        future = batcher.submit(self.URLS[0])  # returns while the call is held
+        assert not future.done()
+        release.set()
+        assert future.result(timeout=2) == {"metric": "0.4"}
+        assert senders and senders[0] is not threading.current_thread()
+
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('src.metrics.data_fetcher.llm.single_genai_metric_data')
+    def test_get_metric_timeout_falls_back_to_single_call(self, mock_single):
+        from concurrent.futures import Future
+
+        from src.metrics.data_fetcher import llm_batch
+
+        mock_single.return_value = {"metric": "0.7"}
+        with patch.object(llm_batch, "submit", return_value=Future()):
+            assert llm_batch.get_metric(self.URLS[0], "Rate:", timeout=0.01) == {
+                "metric": "0.7"}
+        mock_single.assert_called_once_with(self.URLS[0], "Rate:")
+
+    @patch.dict(os.environ, {"LLM_BATCH": "on"})
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('requests.Session.post')
+    def test_batched_scores_reused_by_single_path(self, mock_post):
+        """Scores from a batch are cached under the single-URL key."""
+        from src.metrics.data_fetcher import llm_batch
+        from src.metrics.data_fetcher.llm import single_genai_metric_data
+
+        mock_post.return_value = self._response(
+            '[{"url": "%s", "score": 0.6}]' % self.URLS[0])
+        batcher = llm_batch.LLMBatcher("Rate:", max_batch=1, window=60)
+        batcher.submit(self.URLS[0]).result(timeout=1)
+
+        assert single_genai_metric_data(self.URLS[0], "Rate:") == {"metric": "0.6"}
+        assert mock_post.call_count == 1
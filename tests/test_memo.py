@@ -0,0 +1,151 @@
+"""
+Tests for per-run fetch memoization shared across rows.
+"""
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.metrics.data_fetcher import fetch_comprehensive_metrics_data
+from src.metrics.data_fetcher.memo import (
+    FetchMemo, batch_scope, memoized, normalize_url, active_memo)
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestNormalizeURL:
+    """Test memo key normalization."""
+
+    def test_github_variants_share_a_key(self):
+        base = normalize_url("https://github.com/google-research/bert")
+        assert normalize_url("https://github.com/Google-Research/BERT/") == base
+        assert normalize_url(
+            "https://github.com/google-research/bert/tree/master") == base
+        assert normalize_url(
+            "https://www.github.com/google-research/bert.git") == base
+
+    def test_hf_dataset_and_model_keys_differ(self):
+        assert normalize_url("https://huggingface.co/datasets/bookcorpus/bookcorpus") \
+            != normalize_url("https://huggingface.co/bookcorpus/bookcorpus")
+        assert normalize_url("https://huggingface.co/datasets/squad/") \
+            == normalize_url("https://huggingface.co/datasets/squad")
+
+    def test_other_hosts_keep_path_and_query(self):
+        assert normalize_url("https://example.com/a?x=1") \
+            != normalize_url("https://example.com/a?x=2")
+        assert normalize_url(" https://example.com/Repo.git ") \
+            == "https://example.com/Repo.git"
+
+
+class TestFetchMemo:
+    """Test the single-flight memo layer."""
+
+    def test_no_memo_outside_batch_scope(self):
+        calls = []
+        assert active_memo() is None
+        memoized("github", "https://github.com/a/b", calls.append, 1)
+        memoized("github", "https://github.com/a/b", calls.append, 1)
+        assert calls == [1, 1]
+
+    def test_results_shared_within_scope(self):
+        calls = []
+
+        def fetch(url):
+            calls.append(url)
+            return {"url": url}
+
+        with batch_scope():
+            a = memoized("github", "https://github.com/a/b", fetch, "x")
+            b = memoized("github", "https://github.com/A/B/", fetch, "y")
+            c = memoized("hf_dataset", "https://github.com/a/b", fetch, "z")
+        assert a is b
+        assert c == {"url": "z"}
+        assert calls == ["x", "z"]
+        assert active_memo() is None
+
+    def test_concurrent_fetches_are_single_flight(self):
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return "done"
+
+        results = []
+        with batch_scope():
+            threads = [threading.Thread(target=lambda: results.append(
+                memoized("github", "https://github.com/a/b", slow_fetch)))
+                for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert results == ["done"] * 8
+        assert len(calls) == 1
+
+    def test_failures_are_not_cached(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        with batch_scope():
+            with pytest.raises(RuntimeError):
+                memoized("github", "https://github.com/a/b", flaky)
+            assert memoized("github", "https://github.com/a/b", flaky) == "ok"
+
+    def test_empty_results_are_not_kept(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {} if len(calls) == 1 else {"stars": 1}
+
+        with batch_scope():
+            assert memoized("github", "https://github.com/a/b", fetch) == {}
+            assert memoized("github", "https://github.com/a/b", fetch) == {"stars": 1}
+            assert memoized("github", "https://github.com/a/b", fetch) == {"stars": 1}
+        assert len(calls) == 2
+
+    def test_memo_is_bounded_lru(self):
+        memo = FetchMemo(max_size=2)
+        calls = []
+
+        def fetch(name):
+            calls.append(name)
+            return {"name": name}
+
+        memo.call(("s", "a"), fetch, "a")
+        memo.call(("s", "b"), fetch, "b")
+        memo.call(("s", "a"), fetch, "a")      # a is now most recently used
+        memo.call(("s", "c"), fetch, "c")      # evicts b
+        assert len(memo) == 2
+        memo.call(("s", "a"), fetch, "a")
+        memo.call(("s", "b"), fetch, "b")
+        assert calls == ["a", "b", "c", "b"]
+
+    @patch('src.metrics.data_fetcher.check_availability')
+    @patch('src.metrics.data_fetcher.get_github_repo_data')
+    def test_aggregator_reuses_github_fetch_across_rows(self, mock_github, mock_availability):
+        mock_availability.return_value = {"links_ok": True}
+        mock_github.return_value = {"stars": 10, "files": []}
+
+        with batch_scope():
+            for model in ("bert-base-uncased", "bert-large-uncased"):
+                fetch_comprehensive_metrics_data(
+                    "https://github.com/google-research/bert", "",
+                    f"https://example.com/{model}")
+
+        assert mock_github.call_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
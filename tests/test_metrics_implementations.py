@@ -231,6 +231,29 @@ class TestLicenseComplianceMetric:
         # Should match because "mit" is in the string
         assert result.value == 1.0
 
+    def test_find_licenses_single_pass(self):
+        """All hits come back in text order, most specific id first."""
+        from src.metrics.impl.license_compliance import find_licenses, license_matcher
+
+        text = "license: cc-by-4.0; code under mit. not a permit"
+        allow = ["cc", "cc-by-4.0", "mit"]
+        assert find_licenses(text, allow) == [("cc-by-4.0", 9), ("mit", 31)]
+        assert license_matcher(allow) is license_matcher(reversed(allow))
+        assert find_licenses(text, []) == []
+
+    def test_license_compliance_reads_model_card_from_context(self):
+        """The model card comes from the context; compute does no I/O."""
+        context = {"model_url": "https://huggingface.co/o/m",
+                   "model_card": "---\nlicense: Apache-2.0\n---\nSee also MIT."}
+
+        with patch('src.metrics.data_fetcher.utils.send_request') as mock_send:
+            result = LicenseComplianceMetric().compute(context)
+
+        mock_send.assert_not_called()
+        assert result.value == 1.0
+        assert result.details["license"] == "apache-2.0"
+        assert "model_card" in LicenseComplianceMetric.requires
+
 
 class TestRampUpTimeMetric:
     """Test the RampUpTimeMetric class."""
@@ -0,0 +1,167 @@
+"""
+Tests for the process-pool metric and row backends.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
+from unittest.mock import patch
+
+from src.metrics.impl.size import SizeMetric
+from src.metrics.operationalization import Operationalization
+from src.metrics.process_pool import (
+    _warm_up, context_snapshot, get_process_pool, picklable)
+from src.metrics.registry import MetricRegistry
+from src.metrics.runner import run_metrics
+from src.metrics.types import MetricResult
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class _LocalMetric:
+    """Holds a lock, so it cannot be sent to a worker process."""
+    id = "local"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def compute(self, context):
+        return MetricResult(self.id, 1.0, 1, {"pid": os.getpid()}, 0.0)
+
+
+def _worker_cache_flags(*args, **kwargs):
+    """Runs in a fresh spawned worker: which disk caches are enabled there."""
+    from src.metrics.data_fetcher.artifacts import artifact_cache
+    from src.metrics.data_fetcher.http_cache import github_cache
+    from src.metrics.data_fetcher.llm_cache import llm_cache
+    return {"pid": os.getpid(),
+            "enabled": [c.enabled for c in (github_cache, llm_cache, artifact_cache)]}
+
+
+def _worker_memo_calls(*args, **kwargs):
+    """Runs in a warmed-up worker: calls made for two rows sharing a repo."""
+    from src.metrics.data_fetcher.memo import memoized
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"stars": 1}
+
+    for _ in range(2):
+        memoized("github", "https://github.com/o/r", fetch)
+    return len(calls)
+
+
+def _ops():
+    return [Operationalization(metric_id=mid, params={}, weight=0.5,
+                               normalization="identity", norm_params={})
+            for mid in ("size", "local")]
+
+
+class TestProcessBackend:
+    """run_metrics(backend="process") matches the serial results."""
+
+    def test_context_snapshot_drops_unpicklable_entries(self):
+        snapshot = context_snapshot({"a": 1, "lock": threading.Lock()})
+        assert snapshot == {"a": 1}
+        assert picklable(SizeMetric()) and not picklable(_LocalMetric())
+
+    def test_process_backend_matches_serial(self):
+        reg = MetricRegistry()
+        reg.register(SizeMetric())
+        reg.register(_LocalMetric())
+        context = {"size_components": {"raspberry_pi": 0.2, "jetson_nano": 0.4,
+                                       "desktop_pc": 0.8, "aws_server": 1.0},
+                   "session": threading.Lock()}
+
+        serial, serial_summary, _ = run_metrics(_ops(), context, reg)
+        pooled, pooled_summary, _ = run_metrics(_ops(), context, reg,
+                                                backend="process", max_workers=1)
+
+        assert {k: v.value for k, v in pooled.items()} == {
+            k: v.value for k, v in serial.items()}
+        assert pooled_summary["NetScore_weighted"] == serial_summary["NetScore_weighted"]
+        assert pooled["local"].details["pid"] == os.getpid()
+        assert get_process_pool(1) is get_process_pool(1)
+
+
+class TestRowProcessEngine:
+    """engine="process" dispatches every row to the worker pool."""
+
+    @patch('src.url_parsers.url_type_handler.get_process_pool')
+    @patch('src.url_parsers.url_type_handler._evaluate_row')
+    def test_rows_go_through_the_pool(self, mock_evaluate, mock_pool):
+        from src.url_parsers.url_type_handler import handle_url
+
+        submitted = []
+
+        class RecordingPool(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(args[0])
+                return super().submit(fn, *args, **kwargs)
+
+        with RecordingPool(max_workers=2) as pool:
+            mock_pool.return_value = pool
+            mock_evaluate.side_effect = lambda key, links, ops=None: {"name": str(key)}
+            rows = {i: [None, None, f"https://huggingface.co/o/m{i}"]
+                    for i in range(5)}
+            result = handle_url(rows, engine="process", max_workers=2)
+
+        mock_pool.assert_called_once_with(2)
+        assert sorted(submitted) == list(range(5))
+        assert [r["name"] for r in result.values()] == [str(i) for i in range(5)]
+
+    def test_workers_share_fetches_across_rows(self):
+        pool = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up)
+        try:
+            assert pool.submit(_worker_memo_calls).result() == 1
+        finally:
+            pool.shutdown()
+
+    @patch.dict(os.environ, {})
+    @patch('src.cli.main._check_env_variables')
+    @patch('src.url_parsers.url_type_handler.get_process_pool')
+    def test_no_cache_reaches_worker_processes(self, mock_pool, mock_env, tmp_path):
+        """--engine process --no-cache disables the caches in the workers too."""
+        from src.cli.main import main
+        from src.metrics.data_fetcher.artifacts import artifact_cache
+        from src.metrics.data_fetcher.http_cache import github_cache
+        from src.metrics.data_fetcher.llm_cache import llm_cache
+
+        results = []
+
+        class ProbePool:
+            """Runs the cache probe on a spawned worker instead of the row."""
+
+            def __init__(self):
+                self.pool = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+            def submit(self, fn, *args, **kwargs):
+                future = self.pool.submit(_worker_cache_flags)
+                results.append(future.result())
+                return future
+
+        probe = ProbePool()
+        mock_pool.return_value = probe
+        url_file = tmp_path / "urls.txt"
+        url_file.write_text(",,https://huggingface.co/o/m\n")
+        caches = (github_cache, llm_cache, artifact_cache)
+        try:
+            with patch('sys.argv', ['run', str(url_file), '--engine', 'process',
+                                    '--no-cache', '--workers', '1']), \
+                    patch('sys.stdout', new_callable=StringIO):
+                assert main() == 0
+        finally:
+            probe.pool.shutdown()
+            for cache in caches:
+                cache.enabled = True
+
+        assert results and results[0]["pid"] != os.getpid()
+        assert results[0]["enabled"] == [False, False, False]
@@ -0,0 +1,135 @@
+"""
+Tests for per-host request pacing and rate-limit backoff.
+"""
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.metrics.data_fetcher.rate_limit import RateLimitScheduler, TokenBucket
+from src.metrics.data_fetcher.utils import safe_request
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+def response(status=200, headers=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.raise_for_status.return_value = None
+    return resp
+
+
+class TestTokenBucket:
+    """Test the per-host pacing bucket."""
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=10.0, burst=3)
+        delays = [bucket.reserve() for _ in range(5)]
+        assert delays[:3] == [0.0, 0.0, 0.0]
+        assert delays[3] == pytest.approx(0.1, abs=0.02)
+        assert delays[4] == pytest.approx(0.2, abs=0.02)
+
+    def test_pause_delays_next_slot(self):
+        bucket = TokenBucket(rate=10.0, burst=3)
+        bucket.pause(5)
+        assert bucket.reserve() == pytest.approx(5, abs=0.05)
+
+    def test_rate_never_exceeds_default(self):
+        bucket = TokenBucket(rate=10.0, burst=1)
+        bucket.set_rate(100.0)
+        assert bucket.rate == 10.0
+        bucket.set_rate(0.5)
+        assert bucket.rate == 0.5
+        bucket.set_rate(None)
+        assert bucket.rate == 10.0
+
+
+class TestRateLimitScheduler:
+    """Test how responses feed back into pacing."""
+
+    def test_buckets_are_per_host(self):
+        sched = RateLimitScheduler()
+        assert sched.bucket("https://api.github.com/a") is sched.bucket(
+            "https://API.github.com/b")
+        assert sched.bucket("https://api.github.com/a") is not sched.bucket(
+            "https://huggingface.co/a")
+
+    def test_ok_response_not_retried(self):
+        sched = RateLimitScheduler()
+        assert sched.observe("https://x.org/", response(200)) is None
+
+    def test_429_uses_retry_after(self):
+        sched = RateLimitScheduler()
+        wait = sched.observe("https://x.org/",
+                             response(429, {"Retry-After": "3"}))
+        assert 3 <= wait <= 3 + 0.25 * 3 + 0.1
+
+    def test_exhausted_github_quota_waits_for_reset(self):
+        sched = RateLimitScheduler()
+        reset = str(int(time.time()) + 10)
+        wait = sched.observe("https://api.github.com/repos/a/b", response(
+            403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}))
+        assert 8 <= wait <= 15
+
+    def test_plain_403_not_retried(self):
+        sched = RateLimitScheduler()
+        assert sched.observe("https://x.org/", response(403)) is None
+
+    def test_reset_beyond_max_wait_gives_up(self):
+        sched = RateLimitScheduler()
+        sched.max_wait = 60
+        reset = str(int(time.time()) + 3600)
+        assert sched.observe("https://api.github.com/", response(
+            403, {"X-RateLimit-Remaining": "0",
+                  "X-RateLimit-Reset": reset})) is None
+
+    def test_low_quota_slows_host(self):
+        sched = RateLimitScheduler()
+        sched.observe("https://huggingface.co/api/models/x", response(
+            200, {"RateLimit": '"api";r=10;t=100'}))
+        assert sched.bucket("https://huggingface.co/").rate == pytest.approx(0.1)
+
+    def test_small_quota_not_stretched_until_nearly_used(self):
+        sched = RateLimitScheduler()
+        reset = str(int(time.time()) + 3600)
+        sched.observe("https://api.github.com/repos/a/b", response(
+            200, {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "59",
+                  "X-RateLimit-Reset": reset}))
+        bucket = sched.bucket("https://api.github.com/")
+        assert bucket.rate == sched.rate
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+        sched.observe("https://api.github.com/repos/a/b", response(
+            200, {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "5",
+                  "X-RateLimit-Reset": reset}))
+        assert bucket.rate < sched.rate
+
+    def test_retries_are_bounded(self):
+        sched = RateLimitScheduler()
+        sched.max_retries = 2
+        assert sched.observe("https://x.org/", response(429), attempt=2) is None
+
+
+class TestSendRequest:
+    """Test the scheduler in the blocking request path."""
+
+    @patch('src.metrics.data_fetcher.utils.time.sleep')
+    @patch('requests.Session.get')
+    def test_rate_limited_request_is_retried(self, mock_get, mock_sleep):
+        mock_get.side_effect = [response(429, {"Retry-After": "1"}),
+                                response(200)]
+
+        resp = safe_request("https://retry.example.org/x")
+
+        assert resp.status_code == 200
+        assert mock_get.call_count == 2
+        assert any(c.args[0] >= 1 for c in mock_sleep.call_args_list)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,164 @@
+"""
+Tests for the score store and incremental re-scoring.
+"""
+import os
+import sys
+from unittest.mock import patch
+
+from src.score_store import ScoreStore, row_id
+
+# Add src to path
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestScoreStore:
+    """Test record reuse rules."""
+
+    def test_reuse_only_on_matching_fingerprints(self, tmp_path):
+        fp = {"hf_model": "abc", "github": "2024-01-01T00:00:00Z"}
+        with ScoreStore(str(tmp_path / "scores.sqlite")) as store:
+            store.save("r", fp, {"name": "m", "net_score": 0.5})
+            assert store.lookup("r", dict(fp)) == {"name": "m", "net_score": 0.5}
+            assert store.lookup("r", {**fp, "hf_model": "def"}) is None
+            assert store.lookup("r", {**fp, "github": None}) is None
+            assert store.lookup("other", fp) is None
+            assert store.stats() == {"hits": 1, "misses": 3}
+
+    def test_expired_records_are_not_reused(self, tmp_path):
+        path = str(tmp_path / "scores.sqlite")
+        with ScoreStore(path, ttl=0) as store:
+            store.save("r", {"hf_model": "abc"}, {"name": "m"})
+            assert store.lookup("r", {"hf_model": "abc"}) is None
+
+    def test_records_persist_across_opens(self, tmp_path):
+        path = str(tmp_path / "scores.sqlite")
+        with ScoreStore(path) as store:
+            store.save("r", {"hf_model": "abc"}, {"name": "m"})
+        with ScoreStore(path) as store:
+            assert store.lookup("r", {"hf_model": "abc"}) == {"name": "m"}
+
+    def test_row_id_normalizes_urls(self):
+        assert row_id([None, "", "https://huggingface.co/o/m/"]) == row_id(
+            ["", None, "https://huggingface.co/o/m"])
+
+
+class TestIncrementalHandleUrl:
+    """Unchanged rows are served from the store instead of re-scored."""
+
+    @patch('src.url_parsers.url_type_handler.row_fingerprints')
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_second_run_reuses_unchanged_rows(self, mock_category, mock_run_metrics,
+                                              mock_fetch_data, mock_fp, tmp_path):
+        from src.url_parsers.url_type_handler import handle_url
+
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        mock_fetch_data.return_value = {}
+        revisions = {"https://huggingface.co/o/a": "1",
+                     "https://huggingface.co/o/b": "1"}
+        mock_fp.side_effect = lambda code, dataset, model: {
+            "hf_model": revisions[model]}
+        models = {i: [None, None, url] for i, url in enumerate(revisions)}
+
+        with ScoreStore(str(tmp_path / "scores.sqlite")) as store:
+            first = handle_url(models, store=store)
+            assert mock_fetch_data.call_count == 2
+
+            revisions["https://huggingface.co/o/b"] = "2"
+            second = handle_url(models, store=store)
+
+        assert mock_fetch_data.call_count == 3  # only the changed row
+        assert second == first
+
+    @patch.dict(os.environ, {"LLM_BATCH": "on"})
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('src.url_parsers.url_type_handler.llm_batch.submit')
+    @patch('src.url_parsers.url_type_handler.row_fingerprints')
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_reused_rows_are_not_presubmitted_to_the_llm(
+            self, mock_category, mock_run_metrics, mock_fetch_data, mock_fp,
+            mock_submit, tmp_path):
+        from src.url_parsers.url_type_handler import handle_url
+
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        mock_fetch_data.return_value = {}
+        revisions = {"https://huggingface.co/o/a": "1",
+                     "https://huggingface.co/o/b": "1"}
+        mock_fp.side_effect = lambda code, dataset, model: {
+            "hf_model": revisions[model]}
+        models = {i: [None, None, url] for i, url in enumerate(revisions)}
+
+        with ScoreStore(str(tmp_path / "scores.sqlite")) as store:
+            handle_url(models, store=store)
+            mock_submit.reset_mock()
+
+            revisions["https://huggingface.co/o/b"] = "2"
+            handle_url(models, store=store)
+            assert store.stats() == {"hits": 1, "misses": 3}
+
+        assert [c.args[0] for c in mock_submit.call_args_list] == [
+            "https://huggingface.co/o/b"]
+
+
+class TestResultsHistory:
+    """Test indexed lookup of past results."""
+
+    def _record(self, name, score, category="MODEL"):
+        return {"name": name, "category": category, "net_score": score}
+
+    def test_latest_history_and_top_k(self, tmp_path):
+        path = str(tmp_path / "scores.sqlite")
+        a = [None, None, "https://huggingface.co/o/a"]
+        b = [None, None, "https://huggingface.co/o/b"]
+        d = [None, "https://huggingface.co/datasets/o/d", None]
+        with ScoreStore(path, reuse=False) as store:
+            store.add_result(a, self._record("a", 0.4))
+            store.add_result(b, self._record("b", 0.6))
+        with ScoreStore(path, reuse=False) as store:
+            store.run_at += 1
+            store.add_result(a, self._record("a", 0.9))
+            store.add_result(d, self._record("d", 0.7, "DATASET"))
+
+        with ScoreStore(path) as store:
+            assert store.latest(name="a")["record"]["net_score"] == 0.9
+            assert store.latest(url="https://huggingface.co/o/b/")[
+                "record"]["name"] == "b"
+            assert store.latest(name="missing") is None
+            assert [h["record"]["net_score"] for h in store.history(name="a")] == [
+                0.4, 0.9]
+            assert [h["record"]["net_score"]
+                    for h in store.history(name="a", limit=1)] == [0.9]
+            assert [r["record"]["name"] for r in store.top_k(2)] == ["a", "d"]
+            assert [r["record"]["name"]
+                    for r in store.top_k(5, category="MODEL")] == ["a", "b"]
+
+    @patch('src.cli.main._check_env_variables')
+    def test_cli_query(self, mock_check_env, tmp_path, capsys):
+        import json
+        from src.cli.main import main
+
+        path = str(tmp_path / "scores.sqlite")
+        with ScoreStore(path, reuse=False) as store:
+            store.add_result([None, None, "https://huggingface.co/o/a"],
+                             self._record("a", 0.4))
+            store.add_result([None, None, "https://huggingface.co/o/b"],
+                             self._record("b", 0.6))
+
+        with patch('sys.argv', ['main.py', 'query', '--top', '1', '--store', path]):
+            assert main() == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["b"]
+
+        with patch('sys.argv', ['main.py', 'query', 'https://huggingface.co/o/a',
+                                '--store', path]):
+            assert main() == 0
+        assert json.loads(capsys.readouterr().out)["net_score"] == 0.4
+
+        with patch('sys.argv', ['main.py', 'query', 'nope', '--store', path]):
+            assert main() == 1
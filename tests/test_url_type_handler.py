@@ -167,7 +167,7 @@ class TestGenAIIntegration:
                 os.environ["GEN_AI_STUDIO_API_KEY"] = original_key
 
     @patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', 'test_key')
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_genai_single_url_success(self, mock_post):
         """Test successful GenAI call."""
         mock_response = Mock()
@@ -181,7 +181,7 @@ class TestGenAIIntegration:
         assert result == "https://example.com/result"
 
     @patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', 'test_key')
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_genai_single_url_no_url_in_response(self, mock_post):
         """Test GenAI call with no URL in response."""
         mock_response = Mock()
@@ -195,7 +195,7 @@ class TestGenAIIntegration:
         assert result is None
 
     @patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', 'test_key')
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_genai_single_url_api_error(self, mock_post):
         """Test GenAI call with API error."""
         mock_post.side_effect = Exception("API error")
@@ -295,6 +295,23 @@ class TestURLCategoryClassification:
         mock_dataset_genai.assert_called_once_with(
             "https://huggingface.co/model")
 
+    @patch('src.url_parsers.url_type_handler.get_code_url_from_genai')
+    @patch('src.url_parsers.url_type_handler.get_dataset_url_from_genai')
+    def test_inference_steps_recorded_only_with_api_key(self, mock_dataset_genai,
+                                                        mock_code_genai):
+        mock_code_genai.return_value = None
+        mock_dataset_genai.return_value = None
+        row = [None, None, "https://huggingface.co/model"]
+
+        inference = {}
+        with patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', None):
+            get_url_category({"k": list(row)}, inference)
+        assert inference == {"k": []}
+
+        with patch('src.url_parsers.url_type_handler.PURDUE_GENAI_API_KEY', 'test_key'):
+            get_url_category({"k": list(row)}, inference)
+        assert inference == {"k": ["code_url", "dataset_url"]}
+
 
 class TestHandleURL:
     """Test the main handle_url function."""
@@ -444,6 +461,230 @@ class TestHandleURL:
         assert result["model2"]["category"] is None
 
 
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_handle_url_concurrent_preserves_input_order(self, mock_category, mock_run_metrics, mock_fetch_data):
+        """Rows evaluated on a worker pool still come back in input order."""
+        import random
+        import time
+
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+
+        def slow_fetch(code_url, dataset_url, model_url):
+            time.sleep(random.uniform(0, 0.02))
+            return {}
+
+        mock_fetch_data.side_effect = slow_fetch
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+
+        models = {
+            i: [None, None, f"https://huggingface.co/owner/model{i}"] for i in range(20)}
+        result = handle_url(models, max_workers=4, max_in_flight=6)
+
+        assert list(result.keys()) == list(range(20))
+        assert [r["name"] for r in result.values()] == [
+            f"model{i}" for i in range(20)]
+        assert mock_fetch_data.call_count == 20
+
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_handle_url_in_flight_limit(self, mock_category, mock_run_metrics, mock_fetch_data):
+        """No more than max_workers rows run at the same time."""
+        import threading
+        import time
+
+        mock_category.return_value = {}
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def tracked_fetch(code_url, dataset_url, model_url):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return {}
+
+        mock_fetch_data.side_effect = tracked_fetch
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+
+        models = {i: [None, None, "https://huggingface.co/o/m"]
+                  for i in range(12)}
+        handle_url(models, max_workers=3, max_in_flight=3)
+
+        assert 1 <= state["peak"] <= 3
+
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_iter_handle_url_as_completed_and_lazy(self, mock_category, mock_run_metrics, mock_fetch_data):
+        """As-completed mode yields finished rows first and reads input lazily."""
+        import time
+        from src.url_parsers.url_type_handler import iter_handle_url
+
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+
+        def fetch(code_url, dataset_url, model_url):
+            if model_url.endswith("slow"):
+                time.sleep(0.2)
+            return {}
+
+        mock_fetch_data.side_effect = fetch
+        pulled = []
+
+        def rows():
+            for i, name in enumerate(["slow"] + [f"fast{j}" for j in range(7)]):
+                pulled.append(i)
+                yield i, [None, None, f"https://huggingface.co/o/{name}"]
+
+        stream = iter_handle_url(rows(), max_workers=2, max_in_flight=2,
+                                 ordered=False)
+        first_key, first = next(stream)
+        assert first_key != 0
+        assert len(pulled) <= 4  # at most one chunk ahead of max_in_flight
+        keys = [first_key] + [k for k, _ in stream]
+        assert sorted(keys) == list(range(8))
+        assert keys.index(0) > 0
+
+    @patch.dict(os.environ, {"LLM_BATCH": "on"})
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('src.url_parsers.url_type_handler.llm_batch.submit')
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_handle_url_presubmits_llm_urls(self, mock_category, mock_run_metrics,
+                                            mock_fetch_data, mock_submit):
+        """With LLM batching on, every row's LLM URLs are queued up front."""
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_fetch_data.return_value = {}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+
+        models = {
+            0: [None, "https://huggingface.co/datasets/o/d", "https://huggingface.co/o/m0"],
+            1: [None, None, "https://huggingface.co/o/m1"],
+        }
+        handle_url(models)
+
+        submitted = sorted(call.args[0] for call in mock_submit.call_args_list)
+        assert submitted == ["https://huggingface.co/datasets/o/d",
+                             "https://huggingface.co/o/m0",
+                             "https://huggingface.co/o/m1"]
+
+    @patch.dict(os.environ, {"LLM_BATCH": "on", "LLM_BATCH_SIZE": "5"})
+    @patch('src.metrics.data_fetcher.llm.PURDUE_GENAI_API_KEY', 'test-key')
+    @patch('src.url_parsers.url_type_handler.llm_batch.submit')
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_presubmission_fills_a_batch_despite_small_in_flight_bound(
+            self, mock_category, mock_run_metrics, mock_fetch_data, mock_submit):
+        """Single-worker runs (max_in_flight=2) still queue LLM_BATCH_SIZE rows."""
+        events = []
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_fetch_data.side_effect = lambda *a, **kw: events.append("fetch") or {}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        mock_submit.side_effect = lambda url, prompt: events.append(url)
+
+        models = {i: [None, None, f"https://huggingface.co/o/m{i}"] for i in range(7)}
+        handle_url(models, max_workers=1)
+
+        first_fetch = events.index("fetch")
+        assert len(set(events[:first_fetch])) == 5
+
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_handle_url_reports_rows_that_needed_inference(
+            self, mock_category, mock_run_metrics, mock_fetch_data):
+        """Per-row GenAI steps reach the caller, not the emitted records."""
+        def categorize(row, inference=None):
+            for k in row:
+                if inference is not None:
+                    inference[k] = ["code_url"] if k == 1 else []
+            return {k: "MODEL" for k in row}
+
+        mock_category.side_effect = categorize
+        mock_fetch_data.return_value = {}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        models = {i: [None, None, f"https://huggingface.co/o/m{i}"] for i in range(3)}
+
+        async def fake_async_fetch(self, code_url, dataset_url, model_url):
+            return {}
+
+        from src.metrics.data_fetcher.async_engine import AsyncFetchEngine
+        for engine in ("thread", "async"):
+            inference = {}
+            with patch.object(AsyncFetchEngine, "fetch_comprehensive_metrics_data",
+                              fake_async_fetch):
+                result = handle_url(models, engine=engine, inference=inference)
+            assert inference == {1: ["code_url"]}
+            assert all("_genai_inference" not in r for r in result.values())
+
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_handle_url_ops_limit_fetch_and_scoring(self, mock_category, mock_run_metrics,
+                                                    mock_fetch_data):
+        """A metric subset is scored on a context planned from its `requires`."""
+        from src.metrics.ops_plan import default_ops
+
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_fetch_data.return_value = {}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        ops = [op for op in default_ops if op.metric_id == "size"]
+
+        handle_url({0: [None, None, "https://huggingface.co/o/m"]}, ops=ops)
+
+        assert mock_fetch_data.call_args.kwargs["requires"] == {"size_components"}
+        assert mock_run_metrics.call_args.args[0] == ops
+
+    @patch.dict(os.environ, {"GITHUB_FETCHER": "graphql"})
+    @patch('src.url_parsers.url_type_handler.prime_memo')
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_graphql_priming_only_when_ops_need_github(
+            self, mock_category, mock_run_metrics, mock_fetch_data, mock_prime):
+        """--metrics size --github-graphql does not touch GitHub."""
+        from src.metrics.ops_plan import default_ops
+
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_fetch_data.return_value = {}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        mock_prime.return_value = 0
+        row = {0: ["https://github.com/o/r", None, "https://huggingface.co/o/m"]}
+
+        handle_url(row, ops=[op for op in default_ops if op.metric_id == "size"])
+        mock_prime.assert_not_called()
+
+        handle_url(row, ops=[op for op in default_ops if op.metric_id == "bus_factor"])
+        mock_prime.assert_called_once()
+
+    @patch.dict(os.environ, {"GITHUB_FETCHER": "graphql",
+                             "GITHUB_GRAPHQL_BATCH": "25"})
+    @patch('src.url_parsers.url_type_handler.prime_memo')
+    @patch('src.url_parsers.url_type_handler.fetch_comprehensive_metrics_data')
+    @patch('src.url_parsers.url_type_handler.run_metrics')
+    @patch('src.url_parsers.url_type_handler.get_url_category')
+    def test_graphql_priming_fills_whole_batches(
+            self, mock_category, mock_run_metrics, mock_fetch_data, mock_prime):
+        """A small in-flight bound does not shrink the GraphQL query."""
+        mock_category.side_effect = lambda row, inference=None: {k: "MODEL" for k in row}
+        mock_fetch_data.return_value = {}
+        mock_run_metrics.return_value = ({}, {"net_score": 0.5}, {})
+        mock_prime.return_value = 0
+        rows = {i: [f"https://github.com/o/r{i}", None, f"https://huggingface.co/o/m{i}"]
+                for i in range(30)}
+
+        handle_url(rows, max_workers=1, max_in_flight=2)
+
+        assert [len(c.args[1]) for c in mock_prime.call_args_list] == [25, 5]
+
+
 class TestIntegration:
     """Integration tests for the URL type handler."""
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Import-time profile of the CLI entry point.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+and prints the slowest imports by cumulative time, plus any module from
+the heavy list that the import pulled in. With --budget-ms the exit code
+is 1 when the total import time exceeds the budget or a heavy module is
+loaded, so it can guard startup in CI.
+
+    python tools/import_profile.py                 # src.cli.main, top 15
+    python tools/import_profile.py --top 30 --budget-ms 100
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the fast CLI paths (install, test, argument errors) must not load
+HEAVY_MODULES = ("requests", "urllib3", "huggingface_hub", "datasets",
+                 "aiohttp", "src.url_parsers", "src.metrics")
+
+
+def _importtime(code: str) -> Tuple[List[Tuple[int, str]], str]:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip() or f"{code!r} failed")
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative), name.strip()))
+    return timings, proc.stdout
+
+
+def profile(module: str) -> Tuple[List[Tuple[int, str]], List[str]]:
+    """(cumulative microseconds, module) per import, and heavy modules loaded.
+
+    Imports the bare interpreter already does at startup (site, .pth hooks)
+    are left out.
+    """
+    baseline = {name for _, name in _importtime("pass")[0]}
+    timings, stdout = _importtime(
+        f"import sys, {module}; print(' '.join(sys.modules))")
+    loaded = set(stdout.split())
+    heavy = [h for h in HEAVY_MODULES
+             if any(m == h or m.startswith(h + ".") for m in loaded)]
+    return [(us, name) for us, name in timings if name not in baseline], heavy
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("module", nargs="?", default="src.cli.main")
+    p.add_argument("--top", type=int, default=15)
+    p.add_argument("--budget-ms", type=float, default=None)
+    args = p.parse_args()
+
+    timings, heavy = profile(args.module)
+    total_ms = next((us for us, name in timings if name == args.module), 0) / 1000
+    print(f"import {args.module}: {total_ms:.1f} ms")
+    for us, name in sorted(timings, reverse=True)[:args.top]:
+        print(f"{us / 1000:9.1f} ms  {name}")
+    if heavy:
+        print(f"heavy modules loaded: {', '.join(heavy)}")
+
+    if args.budget_ms is not None and (total_ms > args.budget_ms or heavy):
+        print(f"FAIL: over the {args.budget_ms:g} ms budget or heavy imports loaded",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())